@@ -0,0 +1,150 @@
+"""store ordered menus as line items with quantity
+
+Revision ID: 04878e1145dd
+Revises: d1d1b84846c4
+Create Date: 2026-10-17 10:12:31.482913
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = "04878e1145dd"
+down_revision = "d1d1b84846c4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "orderedmenus",
+        sa.Column("amount", sa.Integer(), server_default="1", nullable=False),
+    )
+    op.add_column(
+        "orderedmenus",
+        sa.Column("cooked_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "orderedmenus",
+        sa.Column("served_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "orderedmenus",
+        sa.Column("rejected_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    # 기존 개별 레코드의 상태를 수량으로 변환 (서빙 > 거절 > 조리 완료 순)
+    op.execute(
+        """
+        UPDATE orderedmenus SET
+            served_count = CASE WHEN served_at IS NOT NULL THEN 1 ELSE 0 END,
+            cooked_count = CASE
+                WHEN served_at IS NOT NULL THEN 1
+                WHEN reject_reason IS NULL AND cooked THEN 1
+                ELSE 0
+            END,
+            rejected_count = CASE
+                WHEN served_at IS NULL AND reject_reason IS NOT NULL THEN 1
+                ELSE 0
+            END
+        """
+    )
+
+    # 주문/메뉴별로 가장 먼저 생성된 레코드에 수량을 합산하고 나머지는 삭제
+    op.execute(
+        """
+        WITH grouped AS (
+            SELECT
+                order_id,
+                menu_id,
+                count(*) AS amount,
+                sum(cooked_count) AS cooked_count,
+                sum(served_count) AS served_count,
+                sum(rejected_count) AS rejected_count,
+                max(reject_reason) AS reject_reason,
+                max(served_at) AS served_at
+            FROM orderedmenus
+            GROUP BY order_id, menu_id
+        )
+        UPDATE orderedmenus AS om SET
+            amount = grouped.amount,
+            cooked_count = grouped.cooked_count,
+            served_count = grouped.served_count,
+            rejected_count = grouped.rejected_count,
+            reject_reason = grouped.reject_reason,
+            served_at = grouped.served_at
+        FROM grouped
+        WHERE om.order_id = grouped.order_id
+            AND om.menu_id = grouped.menu_id
+            AND NOT EXISTS (
+                SELECT 1 FROM orderedmenus AS earlier
+                WHERE earlier.order_id = om.order_id
+                    AND earlier.menu_id = om.menu_id
+                    AND (earlier.created_at, earlier.id) < (om.created_at, om.id)
+            )
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM orderedmenus AS om
+        WHERE EXISTS (
+            SELECT 1 FROM orderedmenus AS earlier
+            WHERE earlier.order_id = om.order_id
+                AND earlier.menu_id = om.menu_id
+                AND (earlier.created_at, earlier.id) < (om.created_at, om.id)
+        )
+        """
+    )
+
+    op.create_unique_constraint(
+        "uq_orderedmenus_order_id_menu_id", "orderedmenus", ["order_id", "menu_id"]
+    )
+    op.drop_column("orderedmenus", "cooked")
+
+
+def downgrade():
+    op.drop_constraint(
+        "uq_orderedmenus_order_id_menu_id", "orderedmenus", type_="unique"
+    )
+    op.add_column(
+        "orderedmenus",
+        sa.Column("cooked", sa.Boolean(), server_default="false", nullable=False),
+    )
+
+    # 수량만큼 개별 레코드로 다시 펼침 (추가 레코드는 amount = 0으로 구분)
+    op.execute(
+        """
+        INSERT INTO orderedmenus (
+            id, restaurant_id, order_id, menu_id, created_at,
+            amount, cooked_count, served_count, rejected_count,
+            cooked, reject_reason, served_at
+        )
+        SELECT
+            gen_random_uuid(), restaurant_id, order_id, menu_id, created_at,
+            0, 0, 0, 0,
+            n <= cooked_count,
+            CASE WHEN n > amount - rejected_count THEN reject_reason END,
+            CASE WHEN n <= served_count THEN served_at END
+        FROM orderedmenus, generate_series(2, amount) AS n
+        """
+    )
+    op.execute(
+        """
+        UPDATE orderedmenus SET
+            cooked = cooked_count >= 1,
+            reject_reason = CASE
+                WHEN amount - rejected_count < 1 THEN reject_reason
+            END,
+            served_at = CASE WHEN served_count >= 1 THEN served_at END
+        WHERE amount > 0
+        """
+    )
+    op.alter_column("orderedmenus", "cooked", server_default=None)
+
+    op.drop_column("orderedmenus", "rejected_count")
+    op.drop_column("orderedmenus", "served_count")
+    op.drop_column("orderedmenus", "cooked_count")
+    op.drop_column("orderedmenus", "amount")
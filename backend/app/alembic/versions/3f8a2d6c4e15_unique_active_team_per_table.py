@@ -0,0 +1,58 @@
+"""unique active team per table
+
+Revision ID: 3f8a2d6c4e15
+Revises: 9c3e5a7f1b24
+Create Date: 2026-10-17 14:02:45.117392
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = "3f8a2d6c4e15"
+down_revision = "9c3e5a7f1b24"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 테이블에 활성 팀이 여러 개면 가장 먼저 생성된 팀으로 주문을 옮기고 나머지는 종료
+    op.execute(
+        """
+        WITH ranked AS (
+            SELECT
+                id,
+                first_value(id) OVER (
+                    PARTITION BY table_id ORDER BY created_at, id
+                ) AS kept_id
+            FROM teams
+            WHERE ended_at IS NULL AND phone IS NULL
+        ),
+        moved AS (
+            UPDATE orders SET team_id = ranked.kept_id
+            FROM ranked
+            WHERE orders.team_id = ranked.id AND ranked.id <> ranked.kept_id
+        )
+        UPDATE teams SET ended_at = now()
+        FROM ranked
+        WHERE teams.id = ranked.id AND ranked.id <> ranked.kept_id
+        """
+    )
+    op.create_index(
+        "uq_teams_active_table_id",
+        "teams",
+        ["table_id"],
+        unique=True,
+        postgresql_where=sa.text("ended_at IS NULL AND phone IS NULL"),
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "uq_teams_active_table_id",
+        table_name="teams",
+        postgresql_where=sa.text("ended_at IS NULL AND phone IS NULL"),
+    )
@@ -0,0 +1,35 @@
+"""add idempotency request hash
+
+Revision ID: 7e2d4b9a1c86
+Revises: 4f1a8c3e6b27
+Create Date: 2026-10-17 23:04:51.218637
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = "7e2d4b9a1c86"
+down_revision = "4f1a8c3e6b27"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 기존 키는 요청 지문이 없고 곧 만료되므로 삭제
+    op.execute("DELETE FROM idempotencykeys")
+    op.add_column(
+        "idempotencykeys",
+        sa.Column(
+            "request_hash",
+            sqlmodel.sql.sqltypes.AutoString(length=64),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade():
+    op.drop_column("idempotencykeys", "request_hash")
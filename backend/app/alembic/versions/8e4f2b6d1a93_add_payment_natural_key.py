@@ -0,0 +1,67 @@
+"""add payment natural key
+
+Revision ID: 8e4f2b6d1a93
+Revises: 5d9e1c7a2b48
+Create Date: 2026-10-17 19:41:12.530917
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = "8e4f2b6d1a93"
+down_revision = "5d9e1c7a2b48"
+branch_labels = None
+depends_on = None
+
+
+# 같은 거래(시간, 금액, 거래자)로 중복 저장된 입금 내역 중 남길 입금 내역
+# (주문에 연결된 입금 내역을 우선)
+DUPLICATE_PAYMENTS = """
+    SELECT
+        p.id,
+        first_value(p.id) OVER (
+            PARTITION BY p.restaurant_id, p.created_at, p.amount, p.transaction_by
+            ORDER BY
+                EXISTS (SELECT 1 FROM orders o WHERE o.payment_id = p.id) DESC,
+                p.id
+        ) AS keep_id
+    FROM payments p
+"""
+
+
+def upgrade():
+    op.add_column("payments", sa.Column("balance", sa.Integer(), nullable=True))
+
+    # 중복 입금 내역에 연결된 주문은 남길 입금 내역으로 옮기고 중복은 삭제
+    op.execute(
+        f"""
+        UPDATE orders o
+        SET payment_id = d.keep_id
+        FROM ({DUPLICATE_PAYMENTS}) d
+        WHERE o.payment_id = d.id AND d.id <> d.keep_id
+        """
+    )
+    op.execute(
+        f"""
+        DELETE FROM payments p
+        USING ({DUPLICATE_PAYMENTS}) d
+        WHERE p.id = d.id AND d.id <> d.keep_id
+        """
+    )
+
+    op.create_index(
+        "uq_payments_natural_key",
+        "payments",
+        ["restaurant_id", "created_at", "amount", "balance", "transaction_by"],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+
+
+def downgrade():
+    op.drop_index("uq_payments_natural_key", table_name="payments")
+    op.drop_column("payments", "balance")
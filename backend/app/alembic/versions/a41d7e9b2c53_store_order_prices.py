@@ -0,0 +1,75 @@
+"""store order prices
+
+Revision ID: a41d7e9b2c53
+Revises: 3f8a2d6c4e15
+Create Date: 2026-10-17 14:48:19.530271
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = "a41d7e9b2c53"
+down_revision = "3f8a2d6c4e15"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("orderedmenus", sa.Column("price", sa.Integer(), nullable=True))
+    op.add_column(
+        "orders",
+        sa.Column("total_price", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    # 기존 주문 메뉴는 현재 메뉴 가격을 주문 시점 가격으로 사용
+    op.execute(
+        """
+        UPDATE orderedmenus SET price = menus.price
+        FROM menus
+        WHERE orderedmenus.menu_id = menus.id
+        """
+    )
+    op.alter_column("orderedmenus", "price", nullable=False)
+
+    # 결제된 주문만 거절된 수량을 총액에서 제외 (Orders.total_price 참고)
+    # 결제 전에 거절된 주문(메뉴)은 손님에게 안내한 금액인 전체 수량으로 유지
+    op.execute(
+        """
+        UPDATE orders SET total_price = totals.total_price
+        FROM (
+            SELECT
+                orderedmenus.order_id,
+                sum(
+                    orderedmenus.price * CASE
+                        WHEN orders.payment_id IS NOT NULL
+                        THEN orderedmenus.amount - orderedmenus.rejected_count
+                        ELSE orderedmenus.amount
+                    END
+                ) AS total_price
+            FROM orderedmenus
+            JOIN orders ON orders.id = orderedmenus.order_id
+            GROUP BY orderedmenus.order_id
+        ) AS totals
+        WHERE orders.id = totals.order_id
+        """
+    )
+
+    op.add_column(
+        "orders",
+        sa.Column(
+            "final_price",
+            sa.Integer(),
+            sa.Computed("total_price - no % 100", persisted=True),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade():
+    op.drop_column("orders", "final_price")
+    op.drop_column("orders", "total_price")
+    op.drop_column("orderedmenus", "price")
@@ -1,13 +1,14 @@
 from collections.abc import Generator
-from typing import Annotated
+from typing import Annotated, Optional
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
 from sqlmodel import Session, select
 
+from app.api.services.catalog import Catalog, get_catalog
 from app.core import security
 from app.core.config import settings
 from app.core.db import engine
@@ -61,3 +62,15 @@ def get_default_restaurant(session: SessionDep) -> Restaurants:
 
 
 DefaultRestaurant = Annotated[Restaurants, Depends(get_default_restaurant)]
+
+
+def get_restaurant_catalog(
+    session: SessionDep, restaurant: DefaultRestaurant
+) -> Catalog:
+    return get_catalog(session, restaurant)
+
+
+CatalogDep = Annotated[Catalog, Depends(get_restaurant_catalog)]
+
+# 재시도된 요청을 구분하기 위한 키 (같은 키로 다시 요청하면 처음 응답을 그대로 반환)
+IdempotencyKey = Annotated[Optional[str], Header(max_length=255)]
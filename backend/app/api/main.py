@@ -1,11 +1,20 @@
 from fastapi import APIRouter
 
-from app.api.routes import admin, menus, orders, restaurants, utils, waitings
+from app.api.routes import (
+    admin,
+    export,
+    menus,
+    orders,
+    restaurants,
+    utils,
+    waitings,
+)
 
 # from app.core.config import settings
 
 api_router = APIRouter()
 api_router.include_router(admin.router)
+api_router.include_router(export.router)
 api_router.include_router(menus.router)
 api_router.include_router(orders.router)
 api_router.include_router(restaurants.router)
@@ -1,12 +1,34 @@
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
 import uuid
-from typing import Union, Sequence
+from typing import Optional, Union, Sequence
 
 
-from fastapi import APIRouter, HTTPException, Query
-from sqlmodel import select, col, or_, and_, func
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
+from sqlmodel import select, col, or_, and_, func, update
 
-from app.api.deps import SessionDep, AdminLoginForm, CurrentAdmin, DefaultRestaurant
+from app.api.deps import (
+    SessionDep,
+    AdminLoginForm,
+    CurrentAdmin,
+    DefaultRestaurant,
+    CatalogDep,
+    IdempotencyKey,
+)
+from app.api.services import orders as order_service
+from app.api.services.catalog import bump_catalog_version
+from app.api.services.idempotency import (
+    claim_idempotency_key,
+    save_idempotency_response,
+)
+from app.api.services.loading import (
+    ORDER_PUBLIC,
+    ORDER_SUMMARY,
+    TEAM_WITH_ORDERS,
+    ORDERED_MENU_FOR_SERVING,
+    PAYMENT_WITH_ORDER,
+)
+from app.api.services.pagination import paginate_statement, paginate_result
 from app.api.services.alimtalk import (
     send_waiting_now_seated,
     send_waiting_one_left,
@@ -14,6 +36,7 @@ from app.api.services.alimtalk import (
 )
 from app.core import security
 from app.core.config import settings
+from app.scheduler import payment as payment_scheduler
 from app.models import (
     Token,
     Restaurants,
@@ -51,6 +74,7 @@ from app.models import (
     PaymentWithOrder,
     KioskOrderCreate,
     Teams,
+    SchedulerJobStats,
 )
 
 
@@ -109,6 +133,7 @@ def update_menu(
     menu_data_dict = menu_data.model_dump(exclude_unset=True)
     menu.sqlmodel_update(menu_data_dict)
     session.add(menu)
+    bump_catalog_version(session, restaurant)
     session.commit()
     session.refresh(menu)
 
@@ -133,17 +158,20 @@ def read_tables(
 
     tables = session.exec(statement.order_by(col(Tables.no).asc())).all()
 
-    # 각 테이블의 활성 팀 수 계산
+    # 테이블별 활성 팀 수 계산 (한 번의 쿼리로 집계)
+    teams_counts = dict(
+        session.exec(
+            select(Teams.table_id, func.count(col(Teams.id)))
+            .where(Teams.restaurant_id == restaurant.id, Teams.ended_at == None)
+            .group_by(Teams.table_id)
+        ).all()
+    )
+
     result = []
     for table in tables:
-        # 활성 팀 수 계산
-        teams_count = session.exec(
-            select(func.count(Teams.id)).where(
-                Teams.table_id == table.id, Teams.ended_at == None
-            )
-        ).one()
-
-        result.append(TableBasic(**table.model_dump(), teams_count=teams_count))
+        result.append(
+            TableBasic(**table.model_dump(), teams_count=teams_counts.get(table.id, 0))
+        )
 
     return result
 
@@ -153,6 +181,7 @@ def read_table(
     session: SessionDep,
     admin: CurrentAdmin,
     restaurant: DefaultRestaurant,
+    catalog: CatalogDep,
     table_id: uuid.UUID,
 ):
     """특정 테이블의 상세 정보 조회 (팀과 주문 정보 포함)"""
@@ -171,7 +200,13 @@ def read_table(
         select(Teams)
         .where(Teams.table_id == table_id, Teams.ended_at == None)
         .order_by(col(Teams.created_at).desc())
+        .options(*TEAM_WITH_ORDERS)
     ).all()
+    order_service.attach_grouped_ordered_menus(
+        session,
+        [order for team in teams_with_orders for order in team.orders],
+        catalog.menus,
+    )
 
     # 각 팀의 주문 정보 포함
     teams_data = []
@@ -212,6 +247,7 @@ def update_table(
             session.add(active_team)
 
     session.add(table)
+    bump_catalog_version(session, restaurant)
     session.commit()
     session.refresh(table)
 
@@ -223,7 +259,12 @@ def read_waitings(
     session: SessionDep,
     admin: CurrentAdmin,
     restaurant: DefaultRestaurant,
+    response: Response,
     status: Union[WaitingStatus, AllFilter] = AllFilter.all,
+    cursor: Optional[str] = Query(default=None, description="다음 페이지 커서"),
+    limit: Optional[int] = Query(
+        default=None, gt=0, le=500, description="조회할 개수 (미지정 시 전체)"
+    ),
 ):
     statement = select(Waitings).where(Waitings.restaurant_id == restaurant.id)
     if status == AllFilter.all:
@@ -245,7 +286,10 @@ def read_waitings(
     elif status == "entered":
         statement = statement.where(Waitings.entered_at != None)
 
-    waitings = session.exec(statement.order_by(col(Waitings.created_at).asc())).all()
+    waitings = session.exec(
+        paginate_statement(statement, Waitings, cursor, limit, descending=False)
+    ).all()
+    waitings = paginate_result(response, waitings, limit)
 
     return waitings
 
@@ -369,50 +413,30 @@ def create_kiosk_order(
     session: SessionDep,
     admin: CurrentAdmin,
     restaurant: DefaultRestaurant,
+    catalog: CatalogDep,
     kiosk_order_data: KioskOrderCreate,
+    idempotency_key: IdempotencyKey = None,
 ):
+    if idempotency_key is not None:
+        idempotency_key = f"kiosk-orders:{idempotency_key}"
+        replayed = claim_idempotency_key(
+            session, idempotency_key, restaurant, kiosk_order_data
+        )
+        if replayed is not None:
+            return JSONResponse(replayed.response)
+
     # 키오스크는 항상 새로운 독립적인 팀을 생성
-    kiosk_team = Teams(
-        restaurant_id=restaurant.id,
-        table_id=kiosk_order_data.table_id,
+    order = order_service.create_order(
+        session,
+        restaurant,
+        catalog,
+        kiosk_order_data.table_id,
+        kiosk_order_data.ordered_menus,
         phone=kiosk_order_data.phone,
     )
-    session.add(kiosk_team)
-    session.flush()  # team.id 생성을 위해 flush
-
-    # 주문 생성
-    order = Orders(team_id=kiosk_team.id, restaurant_id=restaurant.id)
-    session.add(order)
-    session.flush()  # order.id 생성을 위해 flush
-
-    menus = session.exec(
-        select(Menus).where(Menus.restaurant_id == restaurant.id)
-    ).all()
-    menu_dict = {menu.id: menu for menu in menus}
-
-    # 주문 메뉴들 생성 (amount 수량만큼 개별 레코드 생성)
-    ordered_menus = []
-    for ordered_menu_data in kiosk_order_data.ordered_menus:
-        for _ in range(ordered_menu_data.amount):
-            ordered_menu = OrderedMenus(
-                order_id=order.id,
-                restaurant_id=restaurant.id,
-                menu_id=ordered_menu_data.menu_id,
-                cooked=menu_dict[ordered_menu_data.menu_id].is_instant_cook,
-            )
-            ordered_menus.append(ordered_menu)
-    session.add_all(ordered_menus)
-
-    # 테이블 상태 업데이트 (idle -> in_use)
-    table = session.get(Tables, kiosk_order_data.table_id)
-    if table and table.status == TableStatus.idle:
-        table.status = TableStatus.in_use
-        session.add(table)
-
-    # 모든 변경사항 커밋
+    if idempotency_key is not None:
+        save_idempotency_response(session, idempotency_key, order)
     session.commit()
-    session.refresh(order)
-    session.refresh(kiosk_team)
 
     # 개발 환경에서 관리자 로그인 시 자동 결제 처리
     if settings.ENVIRONMENT == "local" and settings.AUTO_PAYMENT_IN_DEV:
@@ -426,19 +450,17 @@ def create_kiosk_order(
         session.flush()  # payment.id 생성을 위해 flush
 
         # 주문에 결제 정보 연결
-        order.payment_id = auto_payment.id
-        session.add(order)
+        paid_order = session.get_one(Orders, order.id)
+        paid_order.payment_id = auto_payment.id
+        session.add(paid_order)
         session.commit()
-        session.refresh(order)
+        session.refresh(paid_order)
 
-    return OrderWithPaymentInfo.model_validate(
-        order,
-        update={
-            "payment_info": PaymentInfo(
-                bank_name="KB국민은행", bank_account_no=settings.BANK_ACCOUNT_NO
-            )
-        },
-    )
+        return OrderWithPaymentInfo.model_validate(
+            paid_order, update={"payment_info": order_service.get_payment_info()}
+        )
+
+    return order
 
 
 @router.get("/orders", tags=["orders"], response_model=Sequence[OrderWithPaymentInfo])
@@ -446,7 +468,13 @@ def read_orders(
     session: SessionDep,
     admin: CurrentAdmin,
     restaurant: DefaultRestaurant,
+    catalog: CatalogDep,
+    response: Response,
     status: Union[OrderStatus, AllFilter] = AllFilter.all,
+    cursor: Optional[str] = Query(default=None, description="다음 페이지 커서"),
+    limit: Optional[int] = Query(
+        default=None, gt=0, le=500, description="조회할 개수 (미지정 시 전체)"
+    ),
 ):
     if status in [OrderStatus.ordered, OrderStatus.paid]:
         # 진행 중인 주문들은 활성 팀만 조회
@@ -481,7 +509,11 @@ def read_orders(
     elif status == OrderStatus.rejected:
         statement = statement.where(Orders.reject_reason != None)
 
-    orders = session.exec(statement.order_by(col(Orders.created_at).desc())).all()
+    orders = session.exec(
+        paginate_statement(statement, Orders, cursor, limit).options(*ORDER_SUMMARY)
+    ).all()
+    orders = paginate_result(response, orders, limit)
+    order_service.attach_grouped_ordered_menus(session, orders, catalog.menus)
 
     result = []
     for order in orders:
@@ -509,10 +541,12 @@ def read_order(
     order_id: uuid.UUID,
 ):
     order = session.exec(
-        select(Orders).where(
+        select(Orders)
+        .where(
             Orders.id == order_id,
             Orders.restaurant_id == restaurant.id,
         )
+        .options(*ORDER_PUBLIC)
     ).first()
 
     if not order:
@@ -572,6 +606,8 @@ def reject_order(
             Orders.restaurant_id == restaurant.id,
             Teams.ended_at == None,  # 활성 팀만
         )
+        # 메뉴별 수량 변경과 동시에 처리되지 않도록 주문을 잠금
+        .with_for_update(of=Orders)
     ).first()
     if not order:
         raise HTTPException(status_code=404, detail="주문을 찾을 수 없습니다.")
@@ -587,32 +623,76 @@ def reject_order(
         )
     order.reject_reason = reason
     session.add(order)
-    session.commit()
 
-    # ordered_menus들도 모두 거절 처리
+    # ordered_menus들도 서빙되지 않은 수량은 모두 거절 처리
+    # (주문 총액은 늦게 들어온 입금을 확인할 수 있도록 그대로 유지)
     for ordered_menu in order.ordered_menus:
-        if not ordered_menu.reject_reason:
-            ordered_menu.reject_reason = reason
+        rejectable_count = (
+            ordered_menu.amount
+            - ordered_menu.rejected_count
+            - ordered_menu.served_count
+        )
+        if rejectable_count > 0:
+            ordered_menu.cooked_count = ordered_menu.served_count
+            ordered_menu.rejected_count += rejectable_count
+            ordered_menu.reject_reason = ordered_menu.reject_reason or reason
             session.add(ordered_menu)
     session.commit()
 
     return {"detail": "주문이 거절되었습니다.", "reason": reason}
 
 
+def _lock_ordered_menu(session: SessionDep, ordered_menu: OrderedMenus) -> None:
+    """주문과 주문 메뉴를 잠그고 최신 수량을 다시 읽음
+
+    같은 주문의 수량 변경이 동시에 들어와도 검증과 변경이 한 요청씩 처리되도록 한다.
+    (교착 상태를 피하기 위해 항상 주문 → 주문 메뉴 순서로 잠금)
+    """
+    session.refresh(ordered_menu.order, with_for_update=True)
+    session.refresh(ordered_menu, with_for_update=True)
+
+
 def _update_ordered_menu(
     session: SessionDep,
     restaurant: Restaurants,
     ordered_menu: OrderedMenus,
     order_data: OrderedMenuUpdate,
 ):
+    # 잠근 뒤의 수량으로 검증하므로 동시에 요청이 들어오면 나중 요청은 400
+    _lock_ordered_menu(session, ordered_menu)
+
     if order_data.reject_reason:
-        if ordered_menu.served_at:
+        # 서빙되지 않은 수량만 거절 가능 (조리 대기 수량부터 거절)
+        rejectable_count = (
+            ordered_menu.amount
+            - ordered_menu.rejected_count
+            - ordered_menu.served_count
+        )
+        if rejectable_count == 0:
             raise HTTPException(
                 status_code=400, detail="이미 서빙된 메뉴는 거절이 불가능합니다."
             )
+        amount = order_data.amount or rejectable_count
+        if amount > rejectable_count:
+            raise HTTPException(
+                status_code=400,
+                detail=f"거절 가능한 수량({rejectable_count}개)을 초과했습니다.",
+            )
+        ordered_menu.cooked_count -= max(0, amount - ordered_menu.pending_count)
+        ordered_menu.rejected_count += amount
         ordered_menu.reject_reason = order_data.reject_reason
         session.add(ordered_menu)
-        session.commit()
+        # 결제된 주문만 거절된 수량만큼 주문 총액 차감
+        # (최종 금액은 총액으로 계산되므로, 입금 전에 바꾸면 안내받은 금액으로
+        # 입금한 손님의 입금이 주문과 연결되지 않음)
+        session.exec(
+            update(Orders)  # type: ignore
+            .where(
+                Orders.id == ordered_menu.order_id,  # type: ignore
+                Orders.payment_id != None,  # type: ignore
+            )
+            .values(total_price=Orders.total_price - ordered_menu.price * amount)
+        )
         result = {
             "detail": "메뉴 주문이 거절되었습니다.",
             "reason": order_data.reject_reason,
@@ -622,44 +702,64 @@ def _update_ordered_menu(
     if order_data.status:
         status = order_data.status
         if status == OrderedMenuStatus.cooked:
-            if ordered_menu.cooked:
+            pending_count = ordered_menu.pending_count
+            if pending_count == 0:
                 raise HTTPException(
                     status_code=400, detail="이미 조리 완료된 메뉴입니다."
                 )
-            ordered_menu.cooked = True
+            amount = order_data.amount or pending_count
+            if amount > pending_count:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"조리 대기 수량({pending_count}개)을 초과했습니다.",
+                )
+            ordered_menu.cooked_count += amount
 
         elif status == OrderedMenuStatus.served:
-            if ordered_menu.served_at:
+            serving_count = ordered_menu.serving_count
+            if serving_count == 0:
+                if ordered_menu.pending_count > 0:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="조리가 완료되지 않은 메뉴는 서빙할 수 없습니다.",
+                    )
                 raise HTTPException(
                     status_code=400, detail="이미 서빙 완료된 메뉴입니다."
                 )
-            if not ordered_menu.cooked:
+            amount = order_data.amount or serving_count
+            if amount > serving_count:
                 raise HTTPException(
                     status_code=400,
-                    detail="조리가 완료되지 않은 메뉴는 서빙할 수 없습니다.",
+                    detail=f"서빙 대기 수량({serving_count}개)을 초과했습니다.",
                 )
+            ordered_menu.served_count += amount
             ordered_menu.served_at = datetime.now(timezone.utc)
         session.add(ordered_menu)
-        session.commit()
         result = {"detail": "메뉴 상태가 업데이트되었습니다."}
 
-    # 모든 주문 메뉴가 완료되었는지 확인
+    # 모든 주문 메뉴가 조리 완료(또는 거절)되었는지 확인
+    # (주문을 잠근 동안 다시 읽으므로 동시에 마지막 메뉴를 조리해도 한 번만 완료 처리)
     order = ordered_menu.order
-    if all(
-        om.status == OrderedMenuStatus.cooked or om.status == OrderedMenuStatus.rejected
-        for om in order.ordered_menus
-    ):
+    ordered_menus = session.exec(
+        select(OrderedMenus)
+        .where(OrderedMenus.order_id == order.id)
+        .execution_options(populate_existing=True)
+    ).all()
+    finished = order.finished_at is None and all(
+        om.pending_count == 0 for om in ordered_menus
+    )
+    if finished:
         order.finished_at = datetime.now(timezone.utc)
-
-        # 키오스크 주문인 경우 조리 완료 알림톡 발송
-        team = order.team
-        if team.phone:  # 키오스크 주문 (전화번호가 있는 경우)
-            try:
-                send_kiosk_order_ready(restaurant, team.phone, order.no)  # type: ignore
-            except Exception as e:
-                print(f"알림톡 발송 실패: {e}")
         session.add(order)
-        session.commit()
+    session.commit()
+
+    # 키오스크 주문인 경우 조리 완료 알림톡 발송
+    team = order.team
+    if finished and team.phone:  # 키오스크 주문 (전화번호가 있는 경우)
+        try:
+            send_kiosk_order_ready(restaurant, team.phone, order.no)  # type: ignore
+        except Exception as e:
+            print(f"알림톡 발송 실패: {e}")
 
     return result
 
@@ -688,7 +788,7 @@ def update_menu_order(
         raise HTTPException(status_code=404, detail="주문 메뉴를 찾을 수 없습니다.")
 
     # 상태 검증
-    if ordered_menu.reject_reason:
+    if ordered_menu.status == OrderedMenuStatus.rejected:
         raise HTTPException(status_code=400, detail="거절된 메뉴는 수정할 수 없습니다.")
 
     return _update_ordered_menu(session, restaurant, ordered_menu, order_data)
@@ -701,6 +801,11 @@ def reject_menu_order(
     restaurant: DefaultRestaurant,
     ordered_menu_id: uuid.UUID,
     reason: str = "관리자에 의해 메뉴 주문이 거절되었습니다.",
+    amount: Optional[int] = Query(
+        default=None,
+        gt=0,
+        description="거절할 수량 (미지정 시 서빙되지 않은 전체 수량)",
+    ),
 ) -> dict:
     # 특정 OrderedMenus 레코드 조회
     ordered_menu = session.exec(
@@ -718,9 +823,9 @@ def reject_menu_order(
         raise HTTPException(status_code=404, detail="주문 메뉴를 찾을 수 없습니다.")
 
     # 상태 검증
-    if ordered_menu.reject_reason:
+    if ordered_menu.status == OrderedMenuStatus.rejected:
         raise HTTPException(status_code=400, detail="이미 거절된 메뉴입니다.")
-    if ordered_menu.served_at:
+    if ordered_menu.status == OrderedMenuStatus.served:
         raise HTTPException(
             status_code=400, detail="이미 서빙된 메뉴는 거절이 불가능합니다."
         )
@@ -729,7 +834,7 @@ def reject_menu_order(
         session,
         restaurant,
         ordered_menu,
-        order_data=OrderedMenuUpdate(reject_reason=reason),
+        order_data=OrderedMenuUpdate(reject_reason=reason, amount=amount),
     )
 
 
@@ -742,6 +847,7 @@ def get_cooked_ordered_menus(
     session: SessionDep,
     admin: CurrentAdmin,
     restaurant: DefaultRestaurant,
+    catalog: CatalogDep,
 ):
     """조리가 완료된 주문 메뉴 목록 조회 (서빙 대기중) - 키오스크 주문 제외"""
     # OrderedMenus와 관련 정보를 join하여 가져오기
@@ -759,15 +865,20 @@ def get_cooked_ordered_menus(
             Orders.reject_reason == None,  # 거절된 주문 제외
             Orders.payment_id != None,  # 입금된 주문만 처리
             OrderedMenus.restaurant_id == restaurant.id,
-            OrderedMenus.cooked == True,  # 조리 완료된 메뉴
-            OrderedMenus.served_at == None,  # 아직 서빙되지 않은 메뉴
-            OrderedMenus.reject_reason == None,  # 거절되지 않은 메뉴
+            # 조리 완료 후 아직 서빙되지 않은 수량이 있는 메뉴
+            col(OrderedMenus.cooked_count) > col(OrderedMenus.served_count),
             Teams.ended_at == None,  # 활성 팀만
         )
         .order_by(
             col(Orders.created_at).asc()
         )  # 주문 생성 시간 순으로 (오래된 주문 먼저)
+        .options(*ORDERED_MENU_FOR_SERVING)
     ).all()
+    order_service.attach_grouped_ordered_menus(
+        session,
+        list({order.id: order for _, order, _, _ in ordered_menus_data}.values()),
+        catalog.menus,
+    )
 
     # 데이터 변환
     result = []
@@ -775,11 +886,12 @@ def get_cooked_ordered_menus(
         result.append(
             OrderedMenuForServing(
                 **ordered_menu.model_dump(),
+                serving_count=ordered_menu.serving_count,
                 order=order,
                 order_no=order.no,
                 table=table,
                 table_no=table.no,
-                menu=ordered_menu.menu,
+                menu=catalog.menus[ordered_menu.menu_id],
             )
         )
 
@@ -797,6 +909,12 @@ def get_cooking_queue(
     restaurant: DefaultRestaurant,
 ):
     """메뉴별 조리 대기 현황 조회"""
+    pending_count = (
+        col(OrderedMenus.amount)
+        - col(OrderedMenus.cooked_count)
+        - col(OrderedMenus.rejected_count)
+    )
+
     # 조리 대기 중인 주문 메뉴들을 조회 (주문접수 상태)
     stmt = (
         select(
@@ -804,7 +922,7 @@ def get_cooking_queue(
             col(Menus.name).label("menu_name"),  # type: ignore
             col(Menus.category).label("menu_category"),
             Menus.is_instant_cook,
-            func.count(col(OrderedMenus.id)).label("total_pending_count"),
+            func.sum(pending_count).label("total_pending_count"),
             func.min(col(Orders.created_at)).label("oldest_order_time"),
         )
         .join(Orders, OrderedMenus.order_id == Orders.id)
@@ -812,8 +930,7 @@ def get_cooking_queue(
         .join(Teams, Orders.team_id == Teams.id)
         .where(
             OrderedMenus.restaurant_id == restaurant.id,
-            OrderedMenus.cooked == False,  # 아직 조리되지 않은 메뉴
-            OrderedMenus.reject_reason == None,  # 거절되지 않음
+            pending_count > 0,  # 아직 조리되지 않은 수량이 있는 메뉴
             Teams.ended_at == None,  # 활성 팀만
             Orders.reject_reason == None,  # 거절된 주문 제외
             Orders.payment_id != None,  # 입금된 주문만 처리
@@ -826,7 +943,7 @@ def get_cooking_queue(
             Menus.category,
             Menus.is_instant_cook,
         )
-        .having(func.count(col(OrderedMenus.id)) > 0)
+        .having(func.sum(pending_count) > 0)
         .order_by(
             col(OrderedMenus.menu_id).asc(),  # 메뉴 ID 순으로 일정한 순서 보장
             # func.min(col(Orders.created_at)).asc(),  # 가장 오래된 주문 순
@@ -851,15 +968,19 @@ def get_cooking_queue(
     return cooking_queue
 
 
-@router.patch("/kitchen/menus/{menu_id}/cook-one", tags=["kitchen"])
-def cook_one_menu(
+def _cook_menu(
     session: SessionDep,
-    admin: CurrentAdmin,
-    restaurant: DefaultRestaurant,
+    restaurant: Restaurants,
     menu_id: uuid.UUID,
-) -> dict:
-    """가장 오래된 주문 메뉴 1개 조리완료 처리"""
-    # 해당 메뉴의 가장 오래된 조리 대기 메뉴 찾기
+    amount: int,
+) -> tuple[Menus, list[OrderedMenus]]:
+    """가장 오래된 주문 메뉴부터 amount개 조리완료 처리"""
+    # 메뉴 정보 가져오기
+    menu = session.get(Menus, menu_id)
+    if not menu:
+        raise HTTPException(status_code=404, detail="메뉴를 찾을 수 없습니다.")
+
+    # 해당 메뉴의 조리 대기 수량이 있는 주문 메뉴를 오래된 순으로 찾기
     stmt = (
         select(OrderedMenus)
         .join(Orders, OrderedMenus.order_id == Orders.id)  # type: ignore
@@ -868,8 +989,11 @@ def cook_one_menu(
         .where(
             OrderedMenus.restaurant_id == restaurant.id,
             OrderedMenus.menu_id == menu_id,
-            OrderedMenus.cooked == False,  # 아직 조리되지 않은 메뉴
-            OrderedMenus.reject_reason == None,  # 거절되지 않음
+            # 아직 조리되지 않은 수량이 있는 메뉴
+            col(OrderedMenus.amount)
+            - col(OrderedMenus.cooked_count)
+            - col(OrderedMenus.rejected_count)
+            > 0,
             Teams.ended_at == None,  # 활성 팀만
             Orders.reject_reason == None,  # 거절된 주문 제외
             Orders.payment_id != None,  # 입금된 주문만 처리
@@ -879,29 +1003,71 @@ def cook_one_menu(
         .order_by(col(Orders.created_at).asc())  # 가장 오래된 주문 먼저
     )
 
-    ordered_menu = session.exec(stmt).first()
-    if not ordered_menu:
+    ordered_menus = session.exec(stmt).all()
+    if sum(om.pending_count for om in ordered_menus) < amount:
         raise HTTPException(
-            status_code=404, detail="조리 대기 중인 해당 메뉴가 없습니다."
+            status_code=404, detail="조리 대기 중인 해당 메뉴가 부족합니다."
         )
 
-    # 메뉴 정보 가져오기
-    menu = session.get(Menus, menu_id)
-    if not menu:
-        raise HTTPException(status_code=404, detail="메뉴를 찾을 수 없습니다.")
+    cooked_ordered_menus = []
+    remaining = amount
+    for ordered_menu in ordered_menus:
+        if remaining == 0:
+            break
+        # 다른 요청이 먼저 조리했을 수 있으므로 잠근 뒤의 수량으로 계산
+        _lock_ordered_menu(session, ordered_menu)
+        cook_count = min(remaining, ordered_menu.pending_count)
+        if cook_count == 0:
+            session.commit()
+            continue
+        _update_ordered_menu(
+            session,
+            restaurant,
+            ordered_menu,
+            order_data=OrderedMenuUpdate(
+                status=OrderedMenuStatus.cooked, amount=cook_count
+            ),
+        )
+        cooked_ordered_menus.append(ordered_menu)
+        remaining -= cook_count
+    if not cooked_ordered_menus:
+        raise HTTPException(
+            status_code=404, detail="조리 대기 중인 해당 메뉴가 부족합니다."
+        )
 
-    _update_ordered_menu(
-        session,
-        restaurant,
-        ordered_menu,
-        order_data=OrderedMenuUpdate(status=OrderedMenuStatus.cooked),
-    )
-    session.commit()
-    session.refresh(ordered_menu)
+    return menu, cooked_ordered_menus
+
+
+@router.patch("/kitchen/menus/{menu_id}/cook-one", tags=["kitchen"])
+def cook_one_menu(
+    session: SessionDep,
+    admin: CurrentAdmin,
+    restaurant: DefaultRestaurant,
+    menu_id: uuid.UUID,
+) -> dict:
+    """가장 오래된 주문 메뉴 1개 조리완료 처리"""
+    menu, cooked_ordered_menus = _cook_menu(session, restaurant, menu_id, amount=1)
 
     return {
         "message": f"{menu.name} 1개가 조리 완료되었습니다.",
-        "ordered_menu_id": str(ordered_menu.id),
+        "ordered_menu_id": str(cooked_ordered_menus[0].id),
+    }
+
+
+@router.patch("/kitchen/menus/{menu_id}/cook", tags=["kitchen"])
+def cook_menu(
+    session: SessionDep,
+    admin: CurrentAdmin,
+    restaurant: DefaultRestaurant,
+    menu_id: uuid.UUID,
+    amount: int = Query(default=1, gt=0, description="조리완료 처리할 수량"),
+) -> dict:
+    """가장 오래된 주문 메뉴부터 N개 조리완료 처리"""
+    menu, cooked_ordered_menus = _cook_menu(session, restaurant, menu_id, amount)
+
+    return {
+        "message": f"{menu.name} {amount}개가 조리 완료되었습니다.",
+        "ordered_menu_ids": [str(om.id) for om in cooked_ordered_menus],
     }
 
 
@@ -910,12 +1076,19 @@ def read_payments(
     session: SessionDep,
     admin: CurrentAdmin,
     restaurant: DefaultRestaurant,
+    response: Response,
+    cursor: Optional[str] = Query(default=None, description="다음 페이지 커서"),
+    limit: Optional[int] = Query(
+        default=None, gt=0, le=500, description="조회할 개수 (미지정 시 전체)"
+    ),
 ) -> Sequence[PaymentWithOrder]:
+    statement = select(Payments).where(Payments.restaurant_id == restaurant.id)
     payments = session.exec(
-        select(Payments)
-        .where(Payments.restaurant_id == restaurant.id)
-        .order_by(col(Payments.created_at).desc())
+        paginate_statement(statement, Payments, cursor, limit).options(
+            *PAYMENT_WITH_ORDER
+        )
     ).all()
+    payments = paginate_result(response, payments, limit)
 
     # 결제 정보와 주문 정보를 함께 반환
     payments_with_order = []
@@ -961,6 +1134,42 @@ def refund_payment(
     return payment_with_order
 
 
+@router.post("/payments/backfill", tags=["payments"], status_code=202)
+def backfill_payments(
+    session: SessionDep,
+    admin: CurrentAdmin,
+    start_date: date = Query(description="복구를 시작할 날짜"),
+) -> dict:
+    """start_date부터 오늘까지의 입금 내역 복구 (스케줄러 리더 프로세스에서 실행)"""
+    if start_date > date.today():
+        raise HTTPException(
+            status_code=400, detail="복구 시작일은 오늘 이후일 수 없습니다."
+        )
+
+    # 은행 조회 작업 프로세스와 동기화 상태는 리더 프로세스에서만 다루므로
+    # 요청을 받은 프로세스에서 실행하지 않고 리더에게 알림(NOTIFY)으로 넘김
+    session.exec(
+        select(
+            func.pg_notify(
+                payment_scheduler.BANK_BACKFILL_CHANNEL, start_date.isoformat()
+            )
+        )
+    )
+    session.commit()
+    return {"detail": "입금 내역 복구를 요청했습니다.", "start_date": start_date}
+
+
+@router.get(
+    "/scheduler/jobs", tags=["admin"], response_model=Sequence[SchedulerJobStats]
+)
+def get_scheduler_job_stats(session: SessionDep, admin: CurrentAdmin):
+    """스케줄러 작업별 실행 통계 (실행 시간, 결과, 건너뛴 횟수, 처리한 행 수)"""
+    # 작업은 리더 프로세스에서만 실행되지만 통계는 DB에 있으므로 어느 프로세스에서든 조회 가능
+    return session.exec(
+        select(SchedulerJobStats).order_by(SchedulerJobStats.job_id)
+    ).all()
+
+
 @router.get("/menu-sales-stats", tags=["analytics"])
 def get_menu_sales_stats(
     session: SessionDep,
@@ -997,12 +1206,10 @@ def get_menu_sales_stats(
         ordered_menus = session.exec(ordered_menus_query).all()
 
         # 통계 계산
-        total_ordered = len(ordered_menus)
-        total_served = sum(1 for om in ordered_menus if om.served_at is not None)
-        total_rejected = sum(1 for om in ordered_menus if om.reject_reason is not None)
-        total_revenue = sum(
-            menu.price for om in ordered_menus if om.served_at is not None
-        )
+        total_ordered = sum(om.amount for om in ordered_menus)
+        total_served = sum(om.served_count for om in ordered_menus)
+        total_rejected = sum(om.rejected_count for om in ordered_menus)
+        total_revenue = sum(om.price * om.served_count for om in ordered_menus)
         avg_daily_sales = total_served / days if days > 0 else 0
 
         # 마지막 주문 시간 찾기
@@ -0,0 +1,215 @@
+import csv
+import enum
+import io
+import json
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional
+import uuid
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session, col, select
+from sqlmodel.sql.expression import Select
+
+from app.api.deps import CurrentAdmin, DefaultRestaurant
+from app.core.db import engine
+from app.models import Menus, OrderedMenus, Orders, Payments, Tables, Teams, Waitings
+
+router = APIRouter(prefix="/admin/export", tags=["export"])
+
+# 서버 측 커서에서 한 번에 가져와 응답 청크 하나로 내보내는 행 수
+EXPORT_BATCH_SIZE = 1000
+
+
+class ExportFormat(str, enum.Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+def _to_text(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _stream_rows(statement: Select, format: ExportFormat) -> Iterator[str]:
+    """서버 측 커서로 읽은 행을 배치 단위로 직렬화
+
+    응답이 끝날 때까지 커서를 열어 두어야 하므로 요청 세션과 별개의 세션을 사용한다.
+    """
+    with Session(engine) as session:
+        result = session.exec(
+            statement.execution_options(yield_per=EXPORT_BATCH_SIZE)  # type: ignore
+        )
+        columns = list(result.keys())
+
+        if format == ExportFormat.csv:
+            buffer = io.StringIO()
+            # 엑셀에서 한글이 깨지지 않도록 BOM 추가
+            buffer.write("\ufeff")
+            csv.writer(buffer).writerow(columns)
+            yield buffer.getvalue()
+
+        for rows in result.partitions():
+            buffer = io.StringIO()
+            if format == ExportFormat.csv:
+                writer = csv.writer(buffer)
+                writer.writerows([_to_text(value) for value in row] for row in rows)
+            else:
+                for row in rows:
+                    buffer.write(
+                        json.dumps(
+                            {
+                                column: _to_text(value)
+                                for column, value in zip(columns, row, strict=True)
+                            },
+                            ensure_ascii=False,
+                        )
+                    )
+                    buffer.write("\n")
+            yield buffer.getvalue()
+
+
+def _export(
+    statement: Select,
+    created_at: Any,
+    name: str,
+    format: ExportFormat,
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> StreamingResponse:
+    # 시간대가 없으면 UTC로 간주
+    if start is not None:
+        start = start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+        statement = statement.where(created_at >= start)
+    if end is not None:
+        end = end if end.tzinfo else end.replace(tzinfo=timezone.utc)
+        statement = statement.where(created_at < end)
+    statement = statement.order_by(created_at.asc())
+
+    if format == ExportFormat.csv:
+        media_type = "text/csv; charset=utf-8"
+    else:
+        media_type = "application/x-ndjson"
+
+    return StreamingResponse(
+        _stream_rows(statement, format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{format.value}"'
+        },
+    )
+
+
+@router.get("/orders")
+def export_orders(
+    admin: CurrentAdmin,
+    restaurant: DefaultRestaurant,
+    format: ExportFormat = ExportFormat.ndjson,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """주문 내역 내보내기 (start 이상 end 미만, 생성 시간 기준)"""
+    statement = (
+        select(
+            Orders.id,
+            Orders.no,
+            Orders.team_id,
+            col(Tables.no).label("table_no"),
+            col(Teams.phone).label("phone"),
+            Orders.total_price,
+            Orders.final_price,
+            Orders.payment_id,
+            Orders.reject_reason,
+            Orders.finished_at,
+            Orders.created_at,
+        )
+        .join(Teams, col(Orders.team_id) == Teams.id)
+        .join(Tables, col(Teams.table_id) == Tables.id)
+        .where(Orders.restaurant_id == restaurant.id)
+    )
+    return _export(statement, col(Orders.created_at), "orders", format, start, end)
+
+
+@router.get("/ordered-menus")
+def export_ordered_menus(
+    admin: CurrentAdmin,
+    restaurant: DefaultRestaurant,
+    format: ExportFormat = ExportFormat.ndjson,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """주문 메뉴 내역 내보내기 (start 이상 end 미만, 생성 시간 기준)"""
+    statement = (
+        select(
+            OrderedMenus.id,
+            OrderedMenus.order_id,
+            col(Orders.no).label("order_no"),
+            OrderedMenus.menu_id,
+            col(Menus.name).label("menu_name"),
+            OrderedMenus.price,
+            OrderedMenus.amount,
+            OrderedMenus.cooked_count,
+            OrderedMenus.served_count,
+            OrderedMenus.rejected_count,
+            OrderedMenus.reject_reason,
+            OrderedMenus.served_at,
+            OrderedMenus.created_at,
+        )
+        .join(Orders, col(OrderedMenus.order_id) == Orders.id)
+        .join(Menus, col(OrderedMenus.menu_id) == Menus.id)
+        .where(OrderedMenus.restaurant_id == restaurant.id)
+    )
+    return _export(
+        statement, col(OrderedMenus.created_at), "ordered-menus", format, start, end
+    )
+
+
+@router.get("/payments")
+def export_payments(
+    admin: CurrentAdmin,
+    restaurant: DefaultRestaurant,
+    format: ExportFormat = ExportFormat.ndjson,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """입금 내역 내보내기 (start 이상 end 미만, 입금 시간 기준)"""
+    statement = (
+        select(
+            Payments.id,
+            Payments.transaction_by,
+            Payments.amount,
+            Payments.balance,
+            Payments.refunded_at,
+            Payments.created_at,
+            col(Orders.id).label("order_id"),
+            col(Orders.no).label("order_no"),
+        )
+        .outerjoin(Orders, col(Orders.payment_id) == Payments.id)
+        .where(Payments.restaurant_id == restaurant.id)
+    )
+    return _export(statement, col(Payments.created_at), "payments", format, start, end)
+
+
+@router.get("/waitings")
+def export_waitings(
+    admin: CurrentAdmin,
+    restaurant: DefaultRestaurant,
+    format: ExportFormat = ExportFormat.ndjson,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """웨이팅 내역 내보내기 (start 이상 end 미만, 등록 시간 기준)"""
+    statement = select(
+        Waitings.id,
+        Waitings.name,
+        Waitings.phone,
+        Waitings.notified_at,
+        Waitings.entered_at,
+        Waitings.rejected_at,
+        Waitings.rejected_reason,
+        Waitings.created_at,
+    ).where(Waitings.restaurant_id == restaurant.id)
+    return _export(statement, col(Waitings.created_at), "waitings", format, start, end)
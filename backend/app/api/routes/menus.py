@@ -1,20 +1,23 @@
-from typing import Sequence
+from typing import Annotated, Optional, Sequence
 
-from fastapi import APIRouter
-from sqlmodel import select
+from fastapi import APIRouter, Header, Response
 
-from app.api.deps import SessionDep, DefaultRestaurant
-from app.models import Menus, MenuPublic
+from app.api.deps import CatalogDep
+from app.models import MenuPublic
 
 router = APIRouter(prefix="/menus", tags=["menus"])
 
 
 @router.get("", response_model=Sequence[MenuPublic])
 def read_menus(
-    session: SessionDep,
-    restaurant: DefaultRestaurant,
+    catalog: CatalogDep,
+    response: Response,
+    if_none_match: Annotated[Optional[str], Header()] = None,
 ):
-    statement = select(Menus).where(Menus.restaurant_id == restaurant.id)
-    menus = session.exec(statement).all()
+    # 카탈로그 버전이 같으면 본문 없이 304 응답
+    if if_none_match == catalog.etag:
+        return Response(status_code=304, headers={"ETag": catalog.etag})
 
-    return menus
+    response.headers["ETag"] = catalog.etag
+    response.headers["Cache-Control"] = "no-cache"
+    return list(catalog.menus.values())
@@ -3,20 +3,36 @@ from typing import Sequence
 import uuid
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
 from sqlmodel import select, func, col
 
-from app.api.deps import SessionDep, DefaultRestaurant
+from app.api.deps import SessionDep, DefaultRestaurant, IdempotencyKey
 from app.api.services.alimtalk import send_waiting_registered
+from app.api.services.idempotency import (
+    claim_idempotency_key,
+    save_idempotency_response,
+)
 from app.core.config import settings
 from app.models import Waitings, WaitingCreate, WaitingFind, Restaurants
 
 router = APIRouter(prefix="/waitings", tags=["waitings"])
 
 
-@router.post("")
+@router.post("", response_model=Waitings)
 def enqueue_waitings(
-    session: SessionDep, restaurant: DefaultRestaurant, waiting_data: WaitingCreate
-) -> Waitings:
+    session: SessionDep,
+    restaurant: DefaultRestaurant,
+    waiting_data: WaitingCreate,
+    idempotency_key: IdempotencyKey = None,
+):
+    if idempotency_key is not None:
+        idempotency_key = f"waitings:{idempotency_key}"
+        replayed = claim_idempotency_key(
+            session, idempotency_key, restaurant, waiting_data
+        )
+        if replayed is not None:
+            return JSONResponse(replayed.response)
+
     exist_waiting = session.exec(
         select(Waitings).where(
             Waitings.restaurant_id == restaurant.id,
@@ -26,13 +42,12 @@ def enqueue_waitings(
         )
     ).first()
     if exist_waiting:
-        raise Exception("Already in the waiting list")
+        raise HTTPException(status_code=400, detail="이미 웨이팅 중입니다.")
     waiting = Waitings.model_validate(
         waiting_data, update={"restaurant_id": restaurant.id}
     )
     session.add(waiting)
-    session.commit()
-    session.refresh(waiting)
+    session.flush()
 
     remaining_waiting_count = session.exec(
         select(func.count(col(Waitings.id))).where(
@@ -43,6 +58,11 @@ def enqueue_waitings(
         )
     ).one()
 
+    if idempotency_key is not None:
+        save_idempotency_response(session, idempotency_key, waiting)
+    session.commit()
+    session.refresh(waiting)
+
     send_waiting_registered(restaurant, waiting, remaining_waiting_count)
 
     return waiting
@@ -0,0 +1,64 @@
+import threading
+import uuid
+
+from sqlmodel import Session, SQLModel, select, update
+
+from app.models import MenuPublic, Menus, Restaurants, TablePublic, Tables
+
+
+class Catalog(SQLModel):
+    """레스토랑의 메뉴/테이블 스냅샷 (catalog_version 단위로 캐시)"""
+
+    restaurant_id: uuid.UUID
+    version: int
+    menus: dict[uuid.UUID, MenuPublic]
+    tables: dict[uuid.UUID, TablePublic]
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.restaurant_id}-{self.version}"'
+
+
+_catalogs: dict[uuid.UUID, Catalog] = {}
+_lock = threading.Lock()
+
+
+def get_catalog(session: Session, restaurant: Restaurants) -> Catalog:
+    """레스토랑의 카탈로그 조회
+
+    버전은 요청마다 조회하는 restaurant에 들어 있으므로 캐시가 최신인지
+    확인하는 데 추가 쿼리가 필요 없고, 다른 프로세스에서 올린 버전도 반영된다.
+    """
+    catalog = _catalogs.get(restaurant.id)
+    if catalog is not None and catalog.version == restaurant.catalog_version:
+        return catalog
+
+    with _lock:
+        catalog = _catalogs.get(restaurant.id)
+        if catalog is not None and catalog.version == restaurant.catalog_version:
+            return catalog
+
+        menus = session.exec(
+            select(Menus).where(Menus.restaurant_id == restaurant.id)
+        ).all()
+        tables = session.exec(
+            select(Tables).where(Tables.restaurant_id == restaurant.id)
+        ).all()
+        catalog = Catalog(
+            restaurant_id=restaurant.id,
+            version=restaurant.catalog_version,
+            menus={menu.id: MenuPublic.model_validate(menu) for menu in menus},
+            tables={table.id: TablePublic.model_validate(table) for table in tables},
+        )
+        _catalogs[restaurant.id] = catalog
+
+    return catalog
+
+
+def bump_catalog_version(session: Session, restaurant: Restaurants) -> None:
+    """메뉴/테이블 변경 시 호출 (같은 트랜잭션에서 커밋되어야 함)"""
+    session.exec(
+        update(Restaurants)  # type: ignore
+        .where(Restaurants.id == restaurant.id)  # type: ignore
+        .values(catalog_version=Restaurants.catalog_version + 1)
+    )
@@ -0,0 +1,77 @@
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select, update
+
+from app.core.config import settings
+from app.models import IdempotencyKeys, Restaurants
+
+
+def get_request_hash(restaurant: Restaurants, request: BaseModel) -> str:
+    """매장과 요청 본문(테이블, 전화번호 등 포함)으로 만든 요청 지문"""
+    canonical = json.dumps(
+        {"restaurant_id": restaurant.id, "request": request},
+        default=jsonable_encoder,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        sort_keys=True,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def claim_idempotency_key(
+    session: Session, key: str, restaurant: Restaurants, request: BaseModel
+) -> Optional[IdempotencyKeys]:
+    """Idempotency-Key 선점
+
+    선점에 성공하면 None, 이미 처리된 키면 저장된 레코드를 반환한다.
+    키는 요청과 같은 트랜잭션에서 기록되므로 동시에 들어온 같은 키의 요청은
+    먼저 들어온 요청이 끝날 때까지 기다렸다가 그 응답을 받는다.
+    요청이 실패해 롤백되면 키도 함께 사라져 다시 시도할 수 있다.
+    같은 키로 다른 매장이나 본문의 요청이 들어오면 처음 응답 대신 422를 반환한다.
+    """
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(minutes=settings.IDEMPOTENCY_KEY_EXPIRE_MINUTES)
+    request_hash = get_request_hash(restaurant, request)
+
+    claimed = session.exec(
+        insert(IdempotencyKeys)
+        .values(key=key, request_hash=request_hash, expires_at=expires_at)
+        .on_conflict_do_update(
+            index_elements=[IdempotencyKeys.key],
+            set_={
+                "request_hash": request_hash,
+                "response": None,
+                "expires_at": expires_at,
+            },
+            where=IdempotencyKeys.expires_at < now,  # type: ignore
+        )
+        .returning(IdempotencyKeys.key)  # type: ignore
+    ).first()
+    if claimed is not None:
+        return None
+
+    replayed = session.exec(
+        select(IdempotencyKeys).where(IdempotencyKeys.key == key)
+    ).one()
+    if replayed.request_hash != request_hash:
+        raise HTTPException(
+            status_code=422,
+            detail="같은 Idempotency-Key로 다른 요청을 보낼 수 없습니다.",
+        )
+    return replayed
+
+
+def save_idempotency_response(session: Session, key: str, response: Any) -> None:
+    """선점한 키에 응답 저장 (요청과 같은 트랜잭션에서 커밋되어야 함)"""
+    session.exec(
+        update(IdempotencyKeys)  # type: ignore
+        .where(IdempotencyKeys.key == key)  # type: ignore
+        .values(response=jsonable_encoder(response))
+    )
@@ -0,0 +1,31 @@
+"""응답 모델 직렬화에 필요한 관계를 미리 불러오는 로딩 프로필
+
+`select(...).options(*ORDER_PUBLIC)`처럼 사용하며, 조회하는 행 수와 관계없이
+프로필마다 정해진 개수의 쿼리만 실행된다.
+"""
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models import OrderedMenus, Orders, Payments, Teams
+
+# 주문 메뉴와 메뉴 정보 (Orders.grouped_ordered_menus)
+ORDER_MENUS = (selectinload(Orders.ordered_menus).joinedload(OrderedMenus.menu),)  # type: ignore
+
+# 주문 목록 응답: 팀과 테이블, 결제 정보
+# (주문 메뉴는 attach_grouped_ordered_menus로 한 번에 집계해 채움)
+ORDER_SUMMARY = (
+    joinedload(Orders.team).joinedload(Teams.table),  # type: ignore
+    joinedload(Orders.payment),  # type: ignore
+)
+
+# 주문 응답 (OrderPublic): 주문 메뉴, 팀과 테이블, 결제 정보
+ORDER_PUBLIC = (*ORDER_MENUS, *ORDER_SUMMARY)
+
+# 테이블 상세 응답 (TeamWithOrders): 팀의 주문들
+TEAM_WITH_ORDERS = (selectinload(Teams.orders).options(*ORDER_SUMMARY),)  # type: ignore
+
+# 서빙 대기 목록 (OrderedMenuForServing): Orders를 함께 조회하는 쿼리에 사용
+ORDERED_MENU_FOR_SERVING = ORDER_SUMMARY
+
+# 결제 목록 (PaymentWithOrder)
+PAYMENT_WITH_ORDER = (selectinload(Payments.order),)  # type: ignore
@@ -0,0 +1,324 @@
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Mapping, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import case, insert, update
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, col, func, select
+
+from app.api.services.catalog import Catalog
+from app.core.config import settings
+from app.models import (
+    MenuPublic,
+    OrderedMenuCreate,
+    OrderedMenuGrouped,
+    OrderedMenuPublic,
+    OrderedMenus,
+    OrderedMenuStatus,
+    Orders,
+    OrderStatus,
+    OrderWithPaymentInfo,
+    PaymentInfo,
+    Restaurants,
+    Tables,
+    TableStatus,
+    Teams,
+    TeamWithTable,
+    group_ordered_menus,
+)
+from app.scheduler.polling import BANK_SYNC_CHANNEL
+
+
+def get_payment_info() -> PaymentInfo:
+    return PaymentInfo(bank_name="KB국민은행", bank_account_no=settings.BANK_ACCOUNT_NO)
+
+
+def get_or_create_active_team(
+    session: Session, restaurant: Restaurants, table_id: uuid.UUID, now: datetime
+) -> Teams:
+    """테이블의 활성 팀 조회 (없으면 생성)
+
+    활성 팀은 부분 유니크 인덱스로 테이블당 하나만 존재할 수 있으므로
+    동시에 첫 주문이 들어와도 한 요청만 팀을 만들고 나머지는 그 팀을 사용한다.
+    팀은 FOR SHARE로 잠가 같은 팀의 주문끼리는 기다리지 않고,
+    주문이 끝나기 전에 팀이 종료되는 것만 막는다.
+    """
+    statement = (
+        select(Teams)
+        .where(
+            Teams.restaurant_id == restaurant.id,
+            Teams.table_id == table_id,
+            Teams.ended_at == None,
+            Teams.phone == None,
+        )
+        .with_for_update(read=True)
+    )
+    team = session.exec(statement).first()
+    if team is not None:
+        return team
+
+    team = Teams(
+        id=uuid.uuid4(), restaurant_id=restaurant.id, table_id=table_id, created_at=now
+    )
+    team_id = session.exec(
+        pg_insert(Teams)
+        .values(team.model_dump(include=set(Teams.model_fields)))
+        .on_conflict_do_nothing(
+            index_elements=[Teams.table_id],
+            index_where=(Teams.ended_at == None) & (Teams.phone == None),
+        )
+        .returning(Teams.id)  # type: ignore
+    ).first()
+    if team_id is None:
+        # 다른 요청이 먼저 팀을 만든 경우 (그 요청이 커밋된 뒤에 충돌로 판정됨)
+        return session.exec(statement).one()
+
+    return team
+
+
+def create_order(
+    session: Session,
+    restaurant: Restaurants,
+    catalog: Catalog,
+    table_id: uuid.UUID,
+    ordered_menus_data: list[OrderedMenuCreate],
+    phone: Optional[str] = None,
+) -> OrderWithPaymentInfo:
+    """주문 생성 (팀, 주문, 주문 메뉴, 테이블 상태를 하나의 쿼리로 기록)
+
+    phone이 있으면 키오스크 주문으로 보고 항상 새로운 팀을 생성하며,
+    없으면 테이블의 활성 팀을 사용한다 (get_or_create_active_team 참고).
+    id와 생성 시간은 미리 만들어 두고 주문번호만 RETURNING으로 받으므로
+    refresh 없이 응답을 만들 수 있다. 커밋은 호출하는 쪽에서 수행한다.
+    """
+    now = datetime.now(timezone.utc)
+
+    # 메뉴/테이블 검증은 카탈로그 캐시로 처리 (DB 조회 없음)
+    table = catalog.tables.get(table_id)
+    if table is None:
+        raise HTTPException(status_code=404, detail="테이블을 찾을 수 없습니다.")
+    if any(
+        ordered_menu_data.menu_id not in catalog.menus
+        for ordered_menu_data in ordered_menus_data
+    ):
+        raise HTTPException(
+            status_code=400, detail="존재하지 않는 메뉴가 포함되어 있습니다."
+        )
+
+    # 1. 팀 결정 (키오스크 주문이면 새 팀을 함께 생성)
+    statements = []
+    if phone is None:
+        team = get_or_create_active_team(session, restaurant, table_id, now)
+    else:
+        team = Teams(
+            id=uuid.uuid4(),
+            restaurant_id=restaurant.id,
+            table_id=table_id,
+            phone=phone,
+            created_at=now,
+        )
+        statements.append(
+            insert(Teams)
+            .values(team.model_dump(include=set(Teams.model_fields)))
+            .cte("new_team")
+        )
+
+    # 2. 주문 메뉴 (메뉴별로 수량을 가진 주문 항목 하나씩)
+    order_id = uuid.uuid4()
+    menu_amounts: dict[uuid.UUID, int] = {}
+    for ordered_menu_data in ordered_menus_data:
+        menu_amounts[ordered_menu_data.menu_id] = (
+            menu_amounts.get(ordered_menu_data.menu_id, 0) + ordered_menu_data.amount
+        )
+
+    ordered_menus = [
+        OrderedMenus(
+            id=uuid.uuid4(),
+            order_id=order_id,
+            restaurant_id=restaurant.id,
+            menu_id=menu_id,
+            amount=amount,
+            price=catalog.menus[menu_id].price,
+            # 즉시 조리 메뉴는 주문과 동시에 조리 완료 처리
+            cooked_count=amount if catalog.menus[menu_id].is_instant_cook else 0,
+            created_at=now,
+        )
+        for menu_id, amount in menu_amounts.items()
+    ]
+    statements.append(
+        insert(OrderedMenus)
+        .values(
+            [
+                ordered_menu.model_dump(include=set(OrderedMenus.model_fields))
+                for ordered_menu in ordered_menus
+            ]
+        )
+        .cte("new_ordered_menus")
+    )
+
+    # 3. 테이블 상태 업데이트 (idle -> in_use)
+    statements.append(
+        update(Tables)
+        .where(Tables.id == table_id, Tables.status == TableStatus.idle)  # type: ignore
+        .values(status=TableStatus.in_use)
+        .cte("updated_table")
+    )
+
+    # 4. 주문 생성 (주문번호는 시퀀스에서 받아오고 최종 금액은 DB에서 계산)
+    total_price = sum(om.price * om.amount for om in ordered_menus)
+    new_order = (
+        insert(Orders)
+        .values(
+            id=order_id,
+            restaurant_id=restaurant.id,
+            team_id=team.id,
+            total_price=total_price,
+            created_at=now,
+        )
+        .returning(Orders.no, Orders.final_price)  # type: ignore
+        .cte("new_order")
+    )
+    # 커밋되면 입금 내역 조회를 바로 깨우도록 같은 쿼리에서 알림 (app.scheduler.polling)
+    order_no, final_price, _ = session.exec(
+        select(
+            new_order.c.no,
+            new_order.c.final_price,
+            func.pg_notify(BANK_SYNC_CHANNEL, ""),
+        ).add_cte(*statements)  # type: ignore
+    ).one()
+
+    table_public = table.model_copy()
+    if table_public.status == TableStatus.idle:
+        table_public.status = TableStatus.in_use
+
+    return OrderWithPaymentInfo(
+        id=order_id,
+        no=order_no,
+        status=OrderStatus.ordered,
+        total_price=total_price,
+        final_price=final_price,
+        created_at=now,
+        grouped_ordered_menus=group_ordered_menus(ordered_menus, catalog.menus),
+        payment=None,
+        payment_info=get_payment_info(),
+        team=TeamWithTable(**team.model_dump(), table=table_public),
+    )
+
+
+def attach_grouped_ordered_menus(
+    session: Session,
+    orders: Sequence[Orders],
+    menus: Mapping[uuid.UUID, MenuPublic],
+) -> None:
+    """여러 주문의 grouped_ordered_menus를 한 번의 GROUP BY 쿼리로 계산해 채워 넣음
+
+    수량과 상태는 DB에서 집계하므로 주문 메뉴 객체를 불러오지 않으며,
+    상태 기준은 group_ordered_menus, OrderedMenus.status와 같다.
+    """
+    if not orders:
+        return
+
+    amount = func.sum(OrderedMenus.amount)
+    cooked_count = func.sum(OrderedMenus.cooked_count)
+    served_count = func.sum(OrderedMenus.served_count)
+    rejected_count = func.sum(OrderedMenus.rejected_count)
+    group_status = case(
+        (served_count == amount, OrderedMenuStatus.served.value),
+        (rejected_count > 0, OrderedMenuStatus.rejected.value),
+        (cooked_count > 0, OrderedMenuStatus.cooked.value),
+        else_=OrderedMenuStatus.ordered.value,
+    )
+
+    pending_count = (
+        col(OrderedMenus.amount)
+        - col(OrderedMenus.cooked_count)
+        - col(OrderedMenus.rejected_count)
+    )
+    line_status = case(
+        (
+            (col(OrderedMenus.served_count) > 0)
+            & (
+                col(OrderedMenus.served_count)
+                == col(OrderedMenus.amount) - col(OrderedMenus.rejected_count)
+            ),
+            OrderedMenuStatus.served.value,
+        ),
+        (
+            col(OrderedMenus.rejected_count) == col(OrderedMenus.amount),
+            OrderedMenuStatus.rejected.value,
+        ),
+        (pending_count > 0, OrderedMenuStatus.ordered.value),
+        else_=OrderedMenuStatus.cooked.value,
+    )
+    line = func.json_build_object(
+        "id",
+        OrderedMenus.id,
+        "amount",
+        OrderedMenus.amount,
+        "cooked_count",
+        OrderedMenus.cooked_count,
+        "served_count",
+        OrderedMenus.served_count,
+        "rejected_count",
+        OrderedMenus.rejected_count,
+        "cooked",
+        (col(OrderedMenus.cooked_count) > 0) & (pending_count == 0),
+        "reject_reason",
+        OrderedMenus.reject_reason,
+        "served_at",
+        OrderedMenus.served_at,
+        "status",
+        line_status,
+    )
+
+    rows = session.exec(
+        select(  # type: ignore
+            OrderedMenus.order_id,
+            OrderedMenus.menu_id,
+            amount.label("amount"),
+            cooked_count.label("cooked_count"),
+            served_count.label("served_count"),
+            rejected_count.label("rejected_count"),
+            group_status.label("status"),
+            func.array_agg(
+                aggregate_order_by(OrderedMenus.id, col(OrderedMenus.created_at))
+            ).label("ordered_menu_ids"),
+            func.json_agg(
+                aggregate_order_by(line, col(OrderedMenus.created_at)),
+                type_=JSON,
+            ).label("ordered_menus"),
+        )
+        .where(col(OrderedMenus.order_id).in_([order.id for order in orders]))
+        .group_by(OrderedMenus.order_id, OrderedMenus.menu_id)
+        .order_by(
+            OrderedMenus.order_id,
+            func.min(OrderedMenus.created_at),
+            OrderedMenus.menu_id,
+        )
+    ).all()
+
+    grouped_menus: defaultdict[uuid.UUID, list[OrderedMenuGrouped]] = defaultdict(list)
+    for row in rows:
+        menu = menus[row.menu_id]
+        grouped_menus[row.order_id].append(
+            OrderedMenuGrouped(
+                menu=menu,
+                amount=row.amount,
+                cooked_count=row.cooked_count,
+                served_count=row.served_count,
+                rejected_count=row.rejected_count,
+                status=row.status,
+                ordered_menu_ids=row.ordered_menu_ids,
+                ordered_menus=[
+                    OrderedMenuPublic(**ordered_menu, menu=menu)
+                    for ordered_menu in row.ordered_menus
+                ],
+            )
+        )
+
+    for order in orders:
+        # cached_property 값을 미리 채워 직렬화 시 주문 메뉴를 불러오지 않도록 함
+        order.__dict__["grouped_ordered_menus"] = grouped_menus[order.id]
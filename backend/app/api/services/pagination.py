@@ -0,0 +1,70 @@
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from typing import Any, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+from sqlmodel import col
+from sqlmodel.sql.expression import SelectOfScalar
+
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        created_at, id = base64.urlsafe_b64decode(cursor).decode().split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+
+def paginate_statement(
+    statement: SelectOfScalar[T],
+    model: Any,
+    cursor: Optional[str],
+    limit: Optional[int],
+    descending: bool = True,
+) -> SelectOfScalar[T]:
+    """(created_at, id) 기준 커서 페이지네이션 적용
+
+    limit이 없으면 전체를 반환하고, 있으면 다음 페이지 확인을 위해 한 개 더 조회한다.
+    """
+    key = tuple_(col(model.created_at), col(model.id))
+    if cursor is not None:
+        created_at, id = decode_cursor(cursor)
+        if descending:
+            statement = statement.where(key < tuple_(created_at, id))
+        else:
+            statement = statement.where(key > tuple_(created_at, id))
+
+    if descending:
+        statement = statement.order_by(
+            col(model.created_at).desc(), col(model.id).desc()
+        )
+    else:
+        statement = statement.order_by(col(model.created_at).asc(), col(model.id).asc())
+
+    if limit is not None:
+        statement = statement.limit(limit + 1)
+    return statement
+
+
+def paginate_result(
+    response: Response, rows: Sequence[T], limit: Optional[int]
+) -> Sequence[T]:
+    """limit을 넘는 행을 잘라내고 다음 페이지 커서를 응답 헤더에 설정"""
+    if limit is None or len(rows) <= limit:
+        return rows
+
+    rows = rows[:limit]
+    last = rows[-1]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)  # type: ignore
+    return rows
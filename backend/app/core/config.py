@@ -52,6 +52,7 @@ class Settings(BaseSettings):
 
     # 60 minutes * 24 hours * 8 days = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    IDEMPOTENCY_KEY_EXPIRE_MINUTES: int = 60
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -63,7 +64,16 @@ class Settings(BaseSettings):
     BANK_ACCOUNT_NO: str = ""
     BANK_ACCOUNT_BIRTHDAY: str = ""
     BANK_ACCOUNT_PASSWORD: str = ""
-    BANK_SYNC_INTERVAL_SECOND: int = 10
+    BANK_SYNC_INTERVAL_SECOND: int = 10  # 미결제 주문이 있을 때 조회 주기
+    BANK_SYNC_IDLE_INTERVAL_SECOND: int = 300  # 미결제 주문이 없을 때 조회 주기
+    BANK_SYNC_MAX_BACKOFF_SECOND: int = 300  # 조회 실패 시 최대 대기 시간
+    BANK_SYNC_CIRCUIT_BREAKER_FAILURES: int = 5  # 조회를 멈출 연속 실패 횟수
+    BANK_SYNC_CIRCUIT_BREAKER_SECOND: int = 900  # 연속 실패 후 조회를 멈추는 시간
+    BANK_FULL_SYNC_INTERVAL_MINUTE: int = 30  # 전체 기간(30일) 재동기화 주기
+    BANK_KEYPAD_CACHE_TTL_MINUTE: int = 30  # 가상 키패드 정보 재사용 시간
+    BANK_BACKFILL_MAX_WORKERS: int = 4  # 과거 내역 복구 시 동시에 조회할 기간 수
+    BANK_SCRAPER_TIMEOUT_SECOND: int = 120  # 넘으면 조회 프로세스를 종료하고 다시 띄움
+    SCHEDULER_LEADER_RETRY_SECOND: int = 30  # 스케줄러 실행 권한 확인 주기
 
     KAKAO_ACCESS_KEY: str = ""
     KAKAO_SECRET_KEY: str = ""
@@ -3,8 +3,9 @@ import tempfile
 import platform
 from PIL import Image
 from PIL import ImageChops
+from PIL import ImageMath
 import requests
-from bs4 import BeautifulSoup as bs
+from html.parser import HTMLParser
 import platform
 import tempfile
 import datetime
@@ -12,10 +13,12 @@ from dateutil import parser
 import os
 import json
 from pathlib import Path
-import math, operator
-from functools import reduce
+import math
+from functools import cache
 import re
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import Error as PlaywrightError, sync_playwright
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import time
 
 
@@ -23,58 +26,211 @@ TMP_DIR = Path("/tmp" if platform.system() == "Darwin" else tempfile.gettempdir(
 CURRENT_PACKAGE_DIR = Path(__file__).parent.absolute()
 os.chdir(CURRENT_PACKAGE_DIR)
 
+# 은행 주소 (로컬 테스트 서버를 쓸 때 바꿈, fixtures.FixtureBank 참고)
+BASE_URL = os.environ.get("KB_FASTLOOKUP_BASE_URL", "https://obank.kbstar.com")
+# 설정하면 키패드 화면과 조회 결과 페이지를 이 디렉터리에 저장 (FixtureBank.load로 재생)
+RECORD_DIR = os.environ.get("KB_FASTLOOKUP_RECORD_DIR")
+KEYPAD_PAGE_PATH = "/quics?page=C025255&cc=b028364:b028702&QSL=F"
+# 키패드 이미지 페이지에서 키패드가 그려지는 영역
+KEYPAD_CLIP = {"x": 875 - 17, "y": 414 - 42, "width": 205, "height": 336}
+
+
+def _record(name, data):
+    """RECORD_DIR이 설정돼 있으면 응답을 파일로 저장"""
+    if RECORD_DIR is None:
+        return
+    os.makedirs(RECORD_DIR, exist_ok=True)
+    mode = "wb" if isinstance(data, bytes) else "w"
+    with open(os.path.join(RECORD_DIR, name), mode) as fp:
+        fp.write(data)
+
+
+class SessionExpired(Exception):
+    """가상 키패드 정보(세션)가 만료되어 거래 내역을 조회할 수 없음"""
+
+
+class KeypadCache:
+    """계좌별 가상 키패드 정보를 메모리에 보관하는 캐시
+
+    get_keypad_img는 브라우저를 띄워 키패드를 인식하므로 비싸다.
+    TTL이 지났거나 세션 만료가 감지됐을 때만 새로 가져온다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # bank_num -> (가져온 시간, 키패드 정보)
+        self.hits = 0
+        self.misses = 0  # 캐시가 없거나 TTL이 지나 새로 가져온 횟수
+        self.refreshes = 0  # 세션 만료로 새로 가져온 횟수
+
+    def get(self, bank_num, ttl):
+        with self._lock:
+            entry = self._entries.get(bank_num)
+            if entry is not None and time.monotonic() - entry[0] < ttl:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return self._fetch(bank_num)
+
+    def refresh(self, bank_num, expired_info):
+        with self._lock:
+            entry = self._entries.get(bank_num)
+            # 기다리는 동안 다른 스레드가 이미 갱신했다면 그 정보를 사용
+            if entry is not None and entry[1] is not expired_info:
+                return entry[1]
+            self.refreshes += 1
+            return self._fetch(bank_num)
+
+    def _fetch(self, bank_num):
+        info = get_keypad_img()
+        self._entries[bank_num] = (time.monotonic(), info)
+        print("Fetched virtual keypad:", self.stats())
+        return info
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+        }
 
-# from repository 'simple_bank_korea' by Beomi at Github
-def get_keypad_img():
+
+keypad_cache = KeypadCache()
+
+
+class BrowserPool:
+    """프로세스가 살아 있는 동안 유지되는 Playwright 브라우저
+
+    Playwright sync API는 시작한 스레드에서만 사용할 수 있으므로 전용 스레드
+    하나에서 브라우저와 컨텍스트를 띄워 두고, 작업마다 새 페이지를 열어 실행한다.
+    max_uses번 사용했거나 브라우저에 문제가 생기면 새로 띄운다.
+    """
+
+    def __init__(self, max_uses=50):
+        self.max_uses = max_uses
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="kb-browser"
+        )
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._uses = 0
+
+    def run(self, func):
+        """새 페이지로 func(page)를 브라우저 스레드에서 실행하고 결과를 반환"""
+        return self._executor.submit(self._run, func).result()
+
+    def close(self):
+        self._executor.submit(self._close).result()
+
+    def _run(self, func):
+        if self._browser is not None and (
+            self._uses >= self.max_uses or not self._browser.is_connected()
+        ):
+            self._close()
+        if self._browser is None:
+            self._launch()
+        self._uses += 1
+
+        # 새 세션을 받아야 하므로 이전 페이지의 쿠키는 지움
+        self._context.clear_cookies()
+        page = self._context.new_page()
+        try:
+            return func(page)
+        except PlaywrightError:
+            # 브라우저가 죽었을 수 있으므로 다음 사용 때 새로 띄움
+            self._close()
+            raise
+        finally:
+            if self._browser is not None:
+                try:
+                    page.close()
+                except PlaywrightError:
+                    self._close()
+
+    def _launch(self):
+        self._playwright = sync_playwright().start()
+        # self._browser = self._playwright.chromium.launch(channel="chrome")
+        self._browser = self._playwright.firefox.launch(channel="firefox")
+        self._context = self._browser.new_context(
+            viewport={"width": 1920, "height": 1080}
+        )
+        self._uses = 0
+
+    def _close(self):
+        try:
+            if self._browser is not None:
+                self._browser.close()
+        except PlaywrightError as e:
+            print(e)
+        finally:
+            if self._playwright is not None:
+                self._playwright.stop()
+            self._playwright = None
+            self._browser = None
+            self._context = None
+
+
+browser_pool = BrowserPool()
+
+
+def _read_keypad_page(page):
     retries = 1
     area_hash_list = []
     area_pattern = re.compile("'(\w+)'")
-    with sync_playwright() as playwright:
-        # browser = playwright.chromium.launch(channel="chrome")
-        browser = playwright.firefox.launch(channel="firefox")
-        context = browser.new_context(viewport={"width": 1920, "height": 1080})
-        page = context.new_page()
-        page.goto(
-            "https://obank.kbstar.com/quics?page=C025255&cc=b028364:b028702&QSL=F"
-        )
-        while retries <= 3:
+    page.goto(BASE_URL + KEYPAD_PAGE_PATH)
+    while retries <= 3:
+        try:
+            page.wait_for_selector(
+                'xpath=//*[@id="loading_img"]', state="attached", timeout=1000
+            )
+        finally:
             try:
                 page.wait_for_selector(
-                    'xpath=//*[@id="loading_img"]', state="attached", timeout=1000
+                    'xpath=//*[@id="loading_img"]', state="detached", timeout=10000
                 )
-            finally:
-                try:
-                    page.wait_for_selector(
-                        'xpath=//*[@id="loading_img"]', state="detached", timeout=10000
-                    )
-                    break
-                except:
-                    page.goto(
-                        "https://obank.kbstar.com/quics?page=C025255&cc=b028364:b028702&QSL=F"
-                    )
-                    retries += 1
-        cookies = context.cookies()
-        KEYPAD_USEYN = page.get_attribute('input[id*="KEYPAD_USEYN"]', "value")
-        keymap = page.get_attribute('img[src*="quics"]', "usemap").replace(
-            "#divKeypad", ""
-        )[:-3]
-        area_list = page.locator("map > area")
-        area_list_count = area_list.count()
-        for i in range(area_list_count):
-            element = area_list.nth(i)
-            re_matched = area_pattern.findall(element.get_attribute("onmousedown"))
-            if re_matched:
-                area_hash_list.append(re_matched[0])
-        img_url = page.get_attribute('img[src*="quics"]', "src")
-        page.goto("https://obank.kbstar.com" + img_url)
-        buffer = page.screenshot()
-        screenshot = Image.open(BytesIO(buffer))
-        left = 875 - 17
-        top = 414 - 42
-        right = left + 205
-        bottom = top + 336
-        real = screenshot.crop((left, top, right, bottom))
-        browser.close()
+                break
+            except:
+                page.goto(BASE_URL + KEYPAD_PAGE_PATH)
+                retries += 1
+    cookies = page.context.cookies()
+    KEYPAD_USEYN = page.get_attribute('input[id*="KEYPAD_USEYN"]', "value")
+    keymap = page.get_attribute('img[src*="quics"]', "usemap").replace(
+        "#divKeypad", ""
+    )[:-3]
+    area_list = page.locator("map > area")
+    area_list_count = area_list.count()
+    for i in range(area_list_count):
+        element = area_list.nth(i)
+        re_matched = area_pattern.findall(element.get_attribute("onmousedown"))
+        if re_matched:
+            area_hash_list.append(re_matched[0])
+    img_url = page.get_attribute('img[src*="quics"]', "src")
+    page.goto(BASE_URL + img_url)
+    # 전체 화면 대신 키패드 영역만 캡처
+    buffer = page.screenshot(clip=KEYPAD_CLIP)
+    _record("keypad.png", buffer)
+    _record(
+        "keypad.json",
+        json.dumps(
+            {
+                "KEYPAD_USEYN": KEYPAD_USEYN,
+                "KEYMAP": keymap,
+                "AREA_HASHES": area_hash_list,
+            }
+        ),
+    )
+    real = Image.open(BytesIO(buffer))
+    return cookies, KEYPAD_USEYN, keymap, area_hash_list, real
+
+
+# from repository 'simple_bank_korea' by Beomi at Github
+def get_keypad_img():
+    return keypad_info_from_page(*browser_pool.run(_read_keypad_page))
+
+
+def keypad_info_from_page(cookies, KEYPAD_USEYN, keymap, area_hash_list, real):
+    """키패드 화면에서 읽은 값과 키패드 이미지로 가상 키패드 정보를 만듦"""
     JSESSIONID = ""
     QSID = ""
     for c in cookies:
@@ -120,92 +276,349 @@ def get_keypad_img():
     }
 
 
-def rmsdiff(im1, im2):
-    h = ImageChops.difference(im1, im2).histogram()
-    return math.sqrt(
-        reduce(operator.add, map(lambda h, i: h * (i**2), h, range(256)))
-        / (float(im1.size[0]) * im1.size[1])
+# 숫자 칸 크기 (57x57 box)
+KEYPAD_BOX_SIZE = 57
+# 숫자가 바뀌는 칸(5, 7, 8, 9, 0번째)의 왼쪽 위 좌표
+KEYPAD_CROP_POSITIONS = [(74, 99), (16, 157), (74, 157), (132, 157), (74, 215)]
+KEYPAD_TEMPLATE_NAMES = {
+    "5": "box_5th.png",
+    "7": "box_7th.png",
+    "8": "box_8th.png",
+    "9": "box_9th.png",
+    "0": "box_0th.png",
+}
+
+
+@cache
+def _get_keypad_template_strip():
+    """숫자 템플릿을 칸 수만큼 반복해 가로로 이어 붙인 이미지 (처음 사용할 때 한 번만 만듦)
+
+    [칸1-템플릿1, 칸1-템플릿2, ..., 칸5-템플릿5] 순서로 칸 x 템플릿 쌍을 한 번에 비교한다.
+    """
+    templates = [
+        Image.open(Path.joinpath(CURRENT_PACKAGE_DIR, "assets", name)).convert("RGBA")
+        for name in KEYPAD_TEMPLATE_NAMES.values()
+    ]
+    strip = Image.new(
+        "RGBA",
+        (
+            KEYPAD_BOX_SIZE * len(KEYPAD_CROP_POSITIONS) * len(templates),
+            KEYPAD_BOX_SIZE,
+        ),
     )
+    for i in range(len(KEYPAD_CROP_POSITIONS)):
+        for j, template in enumerate(templates):
+            strip.paste(template, ((i * len(templates) + j) * KEYPAD_BOX_SIZE, 0))
+    return strip
 
 
 def _get_keypad_num_list(img):
     img = img.convert("RGBA")
-    # 57x57 box
-    box_5th = Image.open(
-        Path.joinpath(CURRENT_PACKAGE_DIR, "assets", "box_5th.png")
-    ).convert("RGBA")
-    box_7th = Image.open(
-        Path.joinpath(CURRENT_PACKAGE_DIR, "assets", "box_7th.png")
-    ).convert("RGBA")
-    box_8th = Image.open(
-        Path.joinpath(CURRENT_PACKAGE_DIR, "assets", "box_8th.png")
-    ).convert("RGBA")
-    box_9th = Image.open(
-        Path.joinpath(CURRENT_PACKAGE_DIR, "assets", "box_9th.png")
-    ).convert("RGBA")
-    box_0th = Image.open(
-        Path.joinpath(CURRENT_PACKAGE_DIR, "assets", "box_0th.png")
-    ).convert("RGBA")
-
-    box_dict = {
-        "5": box_5th,
-        "7": box_7th,
-        "8": box_8th,
-        "9": box_9th,
-        "0": box_0th,
-    }
-
-    # 57x57 box
-    crop_5th = img.crop(box=(74, 99, 131, 156))
-    crop_7th = img.crop(box=(16, 157, 73, 214))
-    crop_8th = img.crop(box=(74, 157, 131, 214))
-    crop_9th = img.crop(box=(132, 157, 189, 214))
-    crop_0th = img.crop(box=(74, 215, 131, 272))
     # img.save(Path.joinpath(CURRENT_PACKAGE_DIR, "assets", "keypad.png"))
-    # crop_5th.save(Path.joinpath(CURRENT_PACKAGE_DIR, "assets", "crop_5th.png"))
-    # crop_7th.save(Path.joinpath(CURRENT_PACKAGE_DIR, "assets", "crop_7th.png"))
-    # crop_8th.save(Path.joinpath(CURRENT_PACKAGE_DIR, "assets", "crop_8th.png"))
-    # crop_9th.save(Path.joinpath(CURRENT_PACKAGE_DIR, "assets", "crop_9th.png"))
-    # crop_0th.save(Path.joinpath(CURRENT_PACKAGE_DIR, "assets", "crop_0th.png"))
-
-    crop_list = [crop_5th, crop_7th, crop_8th, crop_9th, crop_0th]
+    keys = list(KEYPAD_TEMPLATE_NAMES)
+    template_strip = _get_keypad_template_strip()
+
+    # 각 칸을 템플릿 수만큼 반복해 템플릿 이미지와 같은 배치로 이어 붙임
+    crop_strip = Image.new("RGBA", template_strip.size)
+    for i, (left, top) in enumerate(KEYPAD_CROP_POSITIONS):
+        crop = img.crop(box=(left, top, left + KEYPAD_BOX_SIZE, top + KEYPAD_BOX_SIZE))
+        for j in range(len(keys)):
+            crop_strip.paste(crop, ((i * len(keys) + j) * KEYPAD_BOX_SIZE, 0))
+
+    # 칸-템플릿 쌍마다 첫 번째 채널(R) 차이의 제곱 평균을 한 번에 계산
+    diff = ImageChops.difference(crop_strip, template_strip).getchannel(0)
+    squared = ImageMath.lambda_eval(
+        lambda args: args["diff"] * args["diff"], diff=diff.convert("F")
+    )
+    mean_squared = squared.reduce(KEYPAD_BOX_SIZE).load()
 
     keypad_num_list = []
+    for idx in range(len(KEYPAD_CROP_POSITIONS) * len(keys)):
+        if math.sqrt(mean_squared[idx, 0]) < 5:
+            keypad_num_list += [keys[idx % len(keys)]]
+    return keypad_num_list
+
+
+class TransactionTableParser(HTMLParser):
+    """조회 결과 표(#pop_contents > table.tType01 > tbody > tr)의 셀(td) 텍스트만 읽는 파서
+
+    문서 트리를 만들지 않고 태그를 순서대로 읽으며 필요한 셀만 모은다.
+    """
+
+    VOID_TAGS = {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "source",
+        "track",
+        "wbr",
+    }
 
-    for idx, crop in enumerate(crop_list):
-        for key, box in box_dict.items():
+    def __init__(self):
+        super().__init__()
+        self.has_table = False
+        self.rows = []  # 행마다 셀 텍스트 목록
+        self._stack = []  # 열린 태그: (태그, 역할)
+        self._row = None
+        self._cell = None
+
+    # max_rows가 있을 때 한 번에 읽는 글자 수
+    CHUNK_SIZE = 8192
+
+    @classmethod
+    def parse(cls, html, max_rows=None):
+        """조회 결과 표를 읽음. 표가 없으면 None
+
+        max_rows를 주면 그만큼 행을 읽은 뒤 나머지 문서는 읽지 않는다.
+        """
+        table_parser = cls()
+        if max_rows is None:
+            table_parser.feed(html)
+        else:
+            for start in range(0, len(html), cls.CHUNK_SIZE):
+                table_parser.feed(html[start : start + cls.CHUNK_SIZE])
+                if len(table_parser.rows) >= max_rows:
+                    del table_parser.rows[max_rows:]
+                    return table_parser
+        table_parser.close()
+        return table_parser if table_parser.has_table else None
+
+    def handle_starttag(self, tag, attrs):
+        # 닫지 않은 셀/행은 다음 셀/행이 시작될 때 닫음
+        if tag == "td" and self._cell is not None:
+            self.handle_endtag("td")
+        if tag == "tr" and self._row is not None:
+            self.handle_endtag("tr")
+
+        parent_role = self._stack[-1][1] if self._stack else None
+        attrs = dict(attrs)
+        role = None
+        if attrs.get("id") == "pop_contents":
+            role = "contents"
+        elif (
+            tag == "table"
+            and parent_role == "contents"
+            and "tType01" in (attrs.get("class") or "").split()
+        ):
+            role = "table"
+            self.has_table = True
+        elif tag == "tbody" and parent_role == "table":
+            role = "tbody"
+        elif tag == "tr" and parent_role == "tbody":
+            role = "row"
+            self._row = []
+        elif tag == "td" and parent_role == "row":
+            role = "cell"
+            self._cell = []
+
+        if tag not in self.VOID_TAGS:
+            self._stack.append((tag, role))
+
+    def handle_endtag(self, tag):
+        if not any(open_tag == tag for open_tag, _ in self._stack):
+            return
+        while self._stack:
+            open_tag, role = self._stack.pop()
+            if role == "cell":
+                self._row.append("".join(self._cell))
+                self._cell = None
+            elif role == "row":
+                self.rows.append(self._row)
+                self._row = None
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+
+def _parse_transaction_rows(rows):
+    """표의 행을 거래 내역으로 변환 (거래 하나가 날짜/금액/잔고 행, 거래자 행 두 줄)"""
+    transaction_list = []
+    detail = None
+    for idx, tds in enumerate(rows):
+        if not idx % 2:
+            _date = tds[0]
+            _date = _date[:10] + " " + _date[10:]
             try:
-                diff = rmsdiff(crop, box)
-                if diff < 5:
-                    keypad_num_list += [key]
-            except Exception as e:
-                print(e)
-    return keypad_num_list
+                # 대부분 "YYYY.MM.DD HH:MM:SS" 형식이므로 먼저 시도
+                date = datetime.datetime.strptime(_date, "%Y.%m.%d %H:%M:%S")
+            except ValueError:
+                try:
+                    date = parser.parse(_date)  # 날짜: datetime
+                except:
+                    continue
+            amount = -int(tds[3].replace(",", "")) or int(
+                tds[4].replace(",", "")
+            )  # 입금 / 출금액: int
+            balance = int(tds[5].replace(",", ""))  # 잔고: int
+            detail = dict(date=date, amount=amount, balance=balance)
+        elif detail is not None:
+            transaction_by = tds[0].strip()  # 거래자(입금자 등): str
+            transaction_list.append({**detail, "transaction_by": transaction_by})
+    return transaction_list
+
+
+def _dedup_transactions(transaction_list):
+    """중복 거래 제거 (처음 나온 순서 유지)"""
+    seen = set()
+    newlist = []
+    for x in transaction_list:
+        key = (x["date"], x["amount"], x["balance"], x["transaction_by"])
+        if key not in seen:
+            seen.add(key)
+            newlist.append(x)
+    return newlist
+
+
+TRANSACTION_HEADERS = {
+    "Pragma": "no-cache",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Accept-Language": "ko-KR,ko;q=0.8,en-US;q=0.6,en;q=0.4,la;q=0.2,da;q=0.2",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.82 Safari/537.36",
+    "Content-Type": "application/x-www-form-urlencoded;  charset=UTF-8",
+    "Accept": "text/html, */*; q=0.01",
+    "Cache-Control": "no-cache",
+    "X-Requested-With": "XMLHttpRequest",
+    "Connection": "keep-alive",
+    "DNT": "1",
+}
+
+TRANSACTION_PARAMS = (
+    ("chgCompId", "b028770"),
+    ("baseCompId", "b028702"),
+    ("page", "C025255"),
+    ("cc", "b028702:b028770"),
+)
+
+
+def _transaction_headers():
+    """은행 주소(BASE_URL)를 포함한 요청 헤더"""
+    return {
+        **TRANSACTION_HEADERS,
+        "Origin": BASE_URL,
+        "Referer": BASE_URL + KEYPAD_PAGE_PATH,
+    }
+
+
+def _transaction_cookies(VIRTUAL_KEYPAD_INFO):
+    """거래 내역 조회에 필요한 세션 쿠키"""
+    return {
+        "_KB_N_TIKER": "N",
+        "JSESSIONID": VIRTUAL_KEYPAD_INFO["JSESSIONID"],
+        "QSID": VIRTUAL_KEYPAD_INFO["QSID"],
+        "delfino.recentModule": "G3",
+    }
+
+
+def _transaction_form_data(
+    VIRTUAL_KEYPAD_INFO, bank_num, birthday, password, month_before, today
+):
+    """month_before부터 today까지의 거래 내역 조회 요청 데이터"""
+    PW_DIGITS = VIRTUAL_KEYPAD_INFO["PW_DIGITS"]
+    KEYMAP = VIRTUAL_KEYPAD_INFO["KEYMAP"]
+    KEYPAD_USEYN = VIRTUAL_KEYPAD_INFO["KEYPAD_USEYN"]
+
+    bank_num = str(bank_num)
+    password = str(password)
+    hexed_pw = ""
+    for p in password:
+        hexed_pw += PW_DIGITS[str(p)]
+
+    return [
+        ("KEYPAD_TYPE_{}".format(KEYMAP), "3"),
+        ("KEYPAD_HASH_{}".format(KEYMAP), hexed_pw),
+        ("KEYPAD_USEYN_{}".format(KEYMAP), KEYPAD_USEYN),
+        ("KEYPAD_INPUT_{}".format(KEYMAP), "\ube44\ubc00\ubc88\ud638"),
+        ("signed_msg", ""),
+        ("\uc694\uccad\ud0a4", ""),
+        ("\uacc4\uc88c\ubc88\ud638", bank_num),
+        ("\uc870\ud68c\uc2dc\uc791\uc77c\uc790", month_before.strftime("%Y%m%d")),
+        ("\uc870\ud68c\uc885\ub8cc\uc77c", today.strftime("%Y%m%d")),
+        ("\uace0\uac1d\uc2dd\ubcc4\ubc88\ud638", ""),
+        ("\ube60\ub978\uc870\ud68c", "Y"),
+        ("\uc870\ud68c\uacc4\uc88c", bank_num),
+        ("\ube44\ubc00\ubc88\ud638", password),
+        ("USEYN_CHECK_NAME_{}".format(KEYMAP), "Y"),
+        ("\uac80\uc0c9\uad6c\ubd84", "2"),
+        ("\uc8fc\ubbfc\uc0ac\uc5c5\uc790\ubc88\ud638", str(birthday)),
+        ("\uc870\ud68c\uc2dc\uc791\ub144", month_before.strftime("%Y")),
+        ("\uc870\ud68c\uc2dc\uc791\uc6d4", month_before.strftime("%m")),
+        ("\uc870\ud68c\uc2dc\uc791\uc77c", month_before.strftime("%d")),
+        ("\uc870\ud68c\ub05d\ub144", today.strftime("%Y")),
+        ("\uc870\ud68c\ub05d\uc6d4", today.strftime("%m")),
+        ("\uc870\ud68c\ub05d\uc77c", today.strftime("%d")),
+        ("\uc870\ud68c\uad6c\ubd84", "2"),
+        ("\uc751\ub2f5\ubc29\ubc95", "2"),
+    ]
+
+
+def _with_keypad_info(bank_num, cache, keypad_ttl, func):
+    """가상 키패드 정보로 func를 실행하고, 세션이 만료됐으면 새 정보로 한 번 더 실행"""
+    VIRTUAL_KEYPAD_INFO_JSON = os.path.join(TMP_DIR, "kb_{}.json".format(bank_num))
+    if keypad_ttl is not None:
+        VIRTUAL_KEYPAD_INFO = keypad_cache.get(bank_num, keypad_ttl)
+    elif cache:
+        if os.path.exists(VIRTUAL_KEYPAD_INFO_JSON):
+            fp = open(VIRTUAL_KEYPAD_INFO_JSON)
+            VIRTUAL_KEYPAD_INFO = json.load(fp)
+            fp.close()
+        else:
+            VIRTUAL_KEYPAD_INFO = get_keypad_img()
+            fp = open(VIRTUAL_KEYPAD_INFO_JSON, "w+")
+            json.dump(VIRTUAL_KEYPAD_INFO, fp)
+            fp.close()
+    else:
+        VIRTUAL_KEYPAD_INFO = get_keypad_img()
+
+    try:
+        return func(VIRTUAL_KEYPAD_INFO)
+    except SessionExpired:
+        print("Session Expired! Get new touch keys..")
+        if keypad_ttl is not None:
+            NEW_VIRTUAL_KEYPAD_INFO = keypad_cache.refresh(
+                bank_num, VIRTUAL_KEYPAD_INFO
+            )
+        else:
+            NEW_VIRTUAL_KEYPAD_INFO = get_keypad_img()
+            if cache:
+                fp = open(VIRTUAL_KEYPAD_INFO_JSON, "w+")
+                json.dump(NEW_VIRTUAL_KEYPAD_INFO, fp)
+                fp.close()
+        return func(NEW_VIRTUAL_KEYPAD_INFO)
 
 
 def get_transactions(
-    bank_num, birthday, password, days=30, start_date=None, cache=False
+    bank_num,
+    birthday,
+    password,
+    days=30,
+    start_date=None,
+    cache=False,
+    keypad_ttl=None,
+    max_workers=1,
 ):
-    def _get_transactions(
-        VIRTUAL_KEYPAD_INFO, bank_num, birthday, password, days, start_date
-    ):
-        PW_DIGITS = VIRTUAL_KEYPAD_INFO["PW_DIGITS"]
-        KEYMAP = VIRTUAL_KEYPAD_INFO["KEYMAP"]
-        JSESSIONID = VIRTUAL_KEYPAD_INFO["JSESSIONID"]
-        QSID = VIRTUAL_KEYPAD_INFO["QSID"]
-        KEYPAD_USEYN = VIRTUAL_KEYPAD_INFO["KEYPAD_USEYN"]
+    """거래 내역 조회
+
+    keypad_ttl(초)을 주면 가상 키패드 정보를 메모리(keypad_cache)에 보관해
+    재사용하고, TTL이 지났거나 세션 만료가 감지됐을 때만 새로 가져온다.
+    start_date부터 조회하면 180일 단위로 나눈 조회 기간을 max_workers개까지
+    동시에 조회한다.
+    """
 
+    def _get_transactions(VIRTUAL_KEYPAD_INFO, days, start_date):
         today_list = []
         month_before_list = []
 
-        bank_num = str(bank_num)
-        birthday = str(birthday)
-        password = str(password)
-        hexed_pw = ""
         days = int(days)
-        for p in password:
-            hexed_pw += PW_DIGITS[str(p)]
-
         today = datetime.datetime.today()
         today_list.append(today)
         if start_date == None:
@@ -234,152 +647,107 @@ def get_transactions(
                 month_before_list.append(month_before)
 
         # basic data when crawling
-        cookies = {
-            "_KB_N_TIKER": "N",
-            "JSESSIONID": JSESSIONID,
-            "QSID": QSID,
-            "delfino.recentModule": "G3",
-        }
-
-        headers = {
-            "Pragma": "no-cache",
-            "Origin": "https://obank.kbstar.com",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Accept-Language": "ko-KR,ko;q=0.8,en-US;q=0.6,en;q=0.4,la;q=0.2,da;q=0.2",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.82 Safari/537.36",
-            "Content-Type": "application/x-www-form-urlencoded;  charset=UTF-8",
-            "Accept": "text/html, */*; q=0.01",
-            "Cache-Control": "no-cache",
-            "X-Requested-With": "XMLHttpRequest",
-            "Connection": "keep-alive",
-            "Referer": "https://obank.kbstar.com/quics?page=C025255&cc=b028364:b028702&QSL=F",
-            "DNT": "1",
-        }
+        cookies = _transaction_cookies(VIRTUAL_KEYPAD_INFO)
 
-        params = (
-            ("chgCompId", "b028770"),
-            ("baseCompId", "b028702"),
-            ("page", "C025255"),
-            ("cc", "b028702:b028770"),
-        )
+        def _get_window_transactions(window):
+            """한 조회 기간(최대 180일)의 거래 내역 (200행씩 이어서 조회)
 
-        transaction_list = []
-
-        for today, month_before in zip(today_list, month_before_list):
-            this_year = today.strftime("%Y")
-            this_month = today.strftime("%m")
-            this_day = today.strftime("%d")
-            this_all = today.strftime("%Y%m%d")
-            month_before_year = month_before.strftime("%Y")
-            month_before_month = month_before.strftime("%m")
-            month_before_day = month_before.strftime("%d")
-            month_before_all = month_before.strftime("%Y%m%d")
+            requests.Session은 스레드 사이에 공유할 수 없으므로 조회 기간마다
+            따로 만들고, 같은 기간의 다음 페이지 조회는 연결을 재사용한다.
+            """
+            today, month_before = window
+            transaction_list = []
             breakthrough = True
-            while breakthrough == True:
-                data = [
-                    ("KEYPAD_TYPE_{}".format(KEYMAP), "3"),
-                    ("KEYPAD_HASH_{}".format(KEYMAP), hexed_pw),
-                    ("KEYPAD_USEYN_{}".format(KEYMAP), KEYPAD_USEYN),
-                    ("KEYPAD_INPUT_{}".format(KEYMAP), "\ube44\ubc00\ubc88\ud638"),
-                    ("signed_msg", ""),
-                    ("\uc694\uccad\ud0a4", ""),
-                    ("\uacc4\uc88c\ubc88\ud638", bank_num),
-                    ("\uc870\ud68c\uc2dc\uc791\uc77c\uc790", month_before_all),
-                    ("\uc870\ud68c\uc885\ub8cc\uc77c", this_all),
-                    ("\uace0\uac1d\uc2dd\ubcc4\ubc88\ud638", ""),
-                    ("\ube60\ub978\uc870\ud68c", "Y"),
-                    ("\uc870\ud68c\uacc4\uc88c", bank_num),
-                    ("\ube44\ubc00\ubc88\ud638", password),
-                    ("USEYN_CHECK_NAME_{}".format(KEYMAP), "Y"),
-                    ("\uac80\uc0c9\uad6c\ubd84", "2"),
-                    ("\uc8fc\ubbfc\uc0ac\uc5c5\uc790\ubc88\ud638", birthday),
-                    ("\uc870\ud68c\uc2dc\uc791\ub144", month_before_year),
-                    ("\uc870\ud68c\uc2dc\uc791\uc6d4", month_before_month),
-                    ("\uc870\ud68c\uc2dc\uc791\uc77c", month_before_day),
-                    ("\uc870\ud68c\ub05d\ub144", this_year),
-                    ("\uc870\ud68c\ub05d\uc6d4", this_month),
-                    ("\uc870\ud68c\ub05d\uc77c", this_day),
-                    ("\uc870\ud68c\uad6c\ubd84", "2"),
-                    ("\uc751\ub2f5\ubc29\ubc95", "2"),
-                ]
-
-                r = requests.post(
-                    "https://obank.kbstar.com/quics",
-                    headers=headers,
-                    params=params,
-                    cookies=cookies,
-                    data=data,
-                )
-                soup = bs(r.text, "html.parser")
-                assert soup.select("#pop_contents > table.tType01 > tbody > tr")
-
-                transactions = soup.select("#pop_contents > table.tType01 > tbody > tr")
-                if len(transactions) >= 200:
-                    tdn = transactions[-2].select("td")
-                    yes = tdn[0].text
-                    yes = yes[:10] + " " + yes[10:]
-                    _yse = parser.parse(yes)
-                    this_year = _yse.strftime("%Y")
-                    this_month = _yse.strftime("%m")
-                    this_day = _yse.strftime("%d")
-                    this_all = _yse.strftime("%Y%m%d")
-                    breakthrough = True
-                else:
-                    breakthrough = False
-
-                for idx, value in enumerate(transactions):
-                    tds = value.select("td")
-                    if not idx % 2:
-                        _date = tds[0].text
-                        _date = _date[:10] + " " + _date[10:]
-                        try:
-                            date = parser.parse(_date)  # 날짜: datetime
-                        except:
-                            continue
-                        amount = -int(tds[3].text.replace(",", "")) or int(
-                            tds[4].text.replace(",", "")
-                        )  # 입금 / 출금액: int
-                        balance = int(tds[5].text.replace(",", ""))  # 잔고: int
-                        detail = dict(date=date, amount=amount, balance=balance)
+            with requests.Session() as http:
+                while breakthrough == True:
+                    data = _transaction_form_data(
+                        VIRTUAL_KEYPAD_INFO,
+                        bank_num,
+                        birthday,
+                        password,
+                        month_before,
+                        today,
+                    )
+
+                    r = http.post(
+                        BASE_URL + "/quics",
+                        headers=_transaction_headers(),
+                        params=TRANSACTION_PARAMS,
+                        cookies=cookies,
+                        data=data,
+                    )
+                    _record(
+                        f"transactions_{month_before:%Y%m%d}_{today:%Y%m%d%H%M%S}.html",
+                        r.text,
+                    )
+                    transaction_table = TransactionTableParser.parse(r.text)
+                    # 조회 결과 표가 없으면 세션이 만료된 것 (거래가 없으면 표만 비어 있음)
+                    if transaction_table is None:
+                        raise SessionExpired()
+
+                    transactions = transaction_table.rows
+                    if len(transactions) >= 200:
+                        tdn = transactions[-2]
+                        yes = tdn[0]
+                        yes = yes[:10] + " " + yes[10:]
+                        today = parser.parse(yes)
+                        breakthrough = True
                     else:
-                        transaction_by = tds[0].text.strip()  # 거래자(입금자 등): str
-                        tmp = dict(transaction_by=transaction_by)
-                        transaction_list.append({**detail, **tmp})
-
-        # eliminate duplicates
-        newlist = []
-        for x in transaction_list:
-            if x not in newlist:
-                newlist.append(x)
-        return newlist
-
-    # Caching
-    VIRTUAL_KEYPAD_INFO_JSON = os.path.join(TMP_DIR, "kb_{}.json".format(bank_num))
-    if cache:
-        if os.path.exists(VIRTUAL_KEYPAD_INFO_JSON):
-            fp = open(VIRTUAL_KEYPAD_INFO_JSON)
-            VIRTUAL_KEYPAD_INFO = json.load(fp)
-            fp.close()
+                        breakthrough = False
+
+                    transaction_list += _parse_transaction_rows(transactions)
+            return transaction_list
+
+        windows = list(zip(today_list, month_before_list))
+        if max_workers > 1 and len(windows) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_get_window_transactions, windows))
         else:
-            VIRTUAL_KEYPAD_INFO = get_keypad_img()
-            fp = open(VIRTUAL_KEYPAD_INFO_JSON, "w+")
-            json.dump(VIRTUAL_KEYPAD_INFO, fp)
-            fp.close()
-    else:
-        VIRTUAL_KEYPAD_INFO = get_keypad_img()
+            results = [_get_window_transactions(window) for window in windows]
+
+        return _dedup_transactions(
+            [transaction for result in results for transaction in result]
+        )
 
-    result = _get_transactions(
-        VIRTUAL_KEYPAD_INFO, bank_num, birthday, password, days, start_date
+    return _with_keypad_info(
+        bank_num,
+        cache,
+        keypad_ttl,
+        lambda VIRTUAL_KEYPAD_INFO: _get_transactions(
+            VIRTUAL_KEYPAD_INFO, days, start_date
+        ),
     )
-    if result:
-        return result
-    else:
-        print("Session Expired! Get new touch keys..")
-        NEW_VIRTUAL_KEYPAD_INFO = get_keypad_img()
-        if cache:
-            fp = open(VIRTUAL_KEYPAD_INFO_JSON, "w+")
-            json.dump(NEW_VIRTUAL_KEYPAD_INFO, fp)
-            fp.close()
-        return _get_transactions(
-            NEW_VIRTUAL_KEYPAD_INFO, bank_num, birthday, password, days, start_date
+
+
+def get_latest_transaction(bank_num, birthday, password, cache=False, keypad_ttl=None):
+    """가장 최근 거래 하나만 조회 (새 거래가 있는지 확인하는 용도)
+
+    어제부터 오늘까지만 조회하고 표의 첫 거래(가장 최근 거래)까지만 읽는다.
+    거래마다 잔고가 있으므로 가장 최근 거래의 시간과 잔고가 마지막으로 확인한
+    값과 같으면 새 거래가 없는 것이다. 조회 기간에 거래가 없으면 None.
+    """
+
+    def _get_latest_transaction(VIRTUAL_KEYPAD_INFO):
+        today = datetime.datetime.today()
+        r = requests.post(
+            BASE_URL + "/quics",
+            headers=_transaction_headers(),
+            params=TRANSACTION_PARAMS,
+            cookies=_transaction_cookies(VIRTUAL_KEYPAD_INFO),
+            data=_transaction_form_data(
+                VIRTUAL_KEYPAD_INFO,
+                bank_num,
+                birthday,
+                password,
+                today - datetime.timedelta(days=1),
+                today,
+            ),
         )
+        # 거래 하나가 두 행이므로 두 행까지만 읽음
+        transaction_table = TransactionTableParser.parse(r.text, max_rows=2)
+        if transaction_table is None:
+            raise SessionExpired()
+        transaction_list = _parse_transaction_rows(transaction_table.rows)
+        return transaction_list[0] if transaction_list else None
+
+    return _with_keypad_info(bank_num, cache, keypad_ttl, _get_latest_transaction)
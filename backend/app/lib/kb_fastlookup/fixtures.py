@@ -0,0 +1,342 @@
+"""은행 대신 기록해 둔 화면으로 응답하는 로컬 서버 (오프라인 테스트/벤치마크용)
+
+kb_fastlookup.BASE_URL(또는 KB_FASTLOOKUP_BASE_URL 환경 변수)을 FixtureBank.url로
+바꾸면 키패드 화면과 거래 내역 조회를 이 서버가 처리한다.
+KB_FASTLOOKUP_RECORD_DIR을 설정하고 실제 은행을 조회하면 키패드 화면과 조회 결과
+페이지가 저장되고, FixtureBank.load로 그 디렉터리를 다시 재생할 수 있다.
+
+    with FixtureBank.synthetic(transactions, password="1234") as bank:
+        kb_fastlookup.BASE_URL = bank.url
+        kb_fastlookup.get_transactions(...)
+"""
+
+import datetime
+import json
+import random
+import secrets
+import threading
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from PIL import Image
+
+from . import (
+    CURRENT_PACKAGE_DIR,
+    KEYPAD_CLIP,
+    KEYPAD_CROP_POSITIONS,
+    KEYPAD_TEMPLATE_NAMES,
+    TransactionTableParser,
+    _dedup_transactions,
+    _get_keypad_num_list,
+    _parse_transaction_rows,
+)
+
+# 키패드 영역 순서는 get_keypad_img와 같음 (숫자 1, 2, 3, 4, 6은 고정, 나머지 5칸은 매번 바뀜)
+FIXED_AREA_DIGITS = {0: "1", 1: "2", 2: "3", 3: "4", 5: "6"}
+FLOATING_AREAS = [4, 6, 7, 8, 9]
+# 한 번에 응답하는 거래 수 (거래 하나가 두 행이므로 200행)
+PAGE_TRANSACTIONS = 100
+
+
+def make_keypad_image(order):
+    """order 순서로 숫자 템플릿을 배치한 키패드 이미지"""
+    keypad = Image.new("RGBA", (KEYPAD_CLIP["width"], KEYPAD_CLIP["height"]), "white")
+    for key, position in zip(order, KEYPAD_CROP_POSITIONS, strict=True):
+        template = Image.open(
+            Path.joinpath(CURRENT_PACKAGE_DIR, "assets", KEYPAD_TEMPLATE_NAMES[key])
+        ).convert("RGBA")
+        keypad.paste(template, position)
+    return keypad
+
+
+def render_transaction_page(transactions):
+    """조회 결과 페이지와 같은 구조의 HTML (거래 하나가 두 행)"""
+    rows = []
+    for transaction in transactions:
+        date = transaction["date"]
+        amount = transaction["amount"]
+        rows.append(
+            "<tr>"
+            f'<td class="tCenter">{date:%Y.%m.%d}<br>{date:%H:%M:%S}</td>'
+            "<td>전자금융</td><td>&nbsp;</td>"
+            f'<td class="tRight">{max(-amount, 0):,}</td>'
+            f'<td class="tRight">{max(amount, 0):,}</td>'
+            f'<td class="tRight">{transaction["balance"]:,}</td>'
+            "<td>국민은행</td><td>&nbsp;</td>"
+            "</tr>"
+            f'<tr><td colspan="8"> {transaction["transaction_by"]} </td></tr>'
+        )
+    return (
+        '<html><body><div id="pop_contents">'
+        '<table class="tType01"><thead><tr><th>거래일시</th></tr></thead>'
+        f"<tbody>{''.join(rows)}</tbody></table></div></body></html>"
+    )
+
+
+class FixtureBank:
+    """kb_fastlookup이 사용하는 은행 화면과 조회 API를 흉내 내는 로컬 HTTP 서버
+
+    - 키패드 화면: 키패드 이미지와 영역 해시를 보여 주고 새 세션 쿠키를 발급
+    - 거래 내역 조회: 세션과 (password가 있으면) 키패드로 입력한 비밀번호를 확인하고,
+      조회 기간의 거래를 최신순으로 PAGE_TRANSACTIONS건씩 응답
+      (확인에 실패하면 은행처럼 조회 결과 표가 없는 페이지를 응답)
+
+    keypad_order는 이미지의 바뀌는 5칸에 있는 숫자 순서이고, 없으면 이미지에서 인식한다.
+    """
+
+    def __init__(
+        self,
+        keypad_image,
+        area_hashes,
+        keymap,
+        keypad_useyn="Y",
+        transactions=(),
+        password=None,
+        keypad_order=None,
+    ):
+        self.keypad_image = keypad_image.convert("RGBA")
+        self.area_hashes = list(area_hashes)
+        self.keymap = keymap
+        self.keypad_useyn = keypad_useyn
+        self.transactions = sorted(
+            transactions, key=lambda transaction: transaction["date"], reverse=True
+        )
+        self.password = password
+        if keypad_order is None:
+            keypad_order = _get_keypad_num_list(self.keypad_image)
+        self.digits_by_hash = {
+            self.area_hashes[area]: digit for area, digit in FIXED_AREA_DIGITS.items()
+        }
+        for area, digit in zip(FLOATING_AREAS, keypad_order, strict=True):
+            self.digits_by_hash[self.area_hashes[area]] = digit
+
+        self.session_id = None
+        self.keypad_loads = 0
+        self.transaction_requests = 0
+        self.rejected_requests = 0  # 세션이나 비밀번호가 맞지 않았던 조회
+        self._server = None
+        self._thread = None
+
+    @classmethod
+    def synthetic(cls, transactions=(), password=None, seed=None):
+        """숫자 템플릿을 무작위로 배치한 키패드로 만듦"""
+        rng = random.Random(seed)
+        keypad_order = list(KEYPAD_TEMPLATE_NAMES)
+        rng.shuffle(keypad_order)
+        return cls(
+            make_keypad_image(keypad_order),
+            [f"{rng.getrandbits(32):08x}" for _ in range(10)],
+            keymap=f"{rng.getrandbits(32):08x}",
+            transactions=transactions,
+            password=password,
+            keypad_order=keypad_order,
+        )
+
+    @classmethod
+    def load(cls, fixture_dir, password=None):
+        """기록해 둔 키패드 화면(keypad.png, keypad.json)과 조회 결과 페이지로 만듦"""
+        fixture_dir = Path(fixture_dir)
+        keypad = json.loads((fixture_dir / "keypad.json").read_text())
+        transactions = []
+        for path in sorted(fixture_dir.glob("transactions_*.html")):
+            transaction_table = TransactionTableParser.parse(path.read_text())
+            if transaction_table is not None:
+                transactions += _parse_transaction_rows(transaction_table.rows)
+        return cls(
+            Image.open(fixture_dir / "keypad.png"),
+            keypad["AREA_HASHES"],
+            keypad["KEYMAP"],
+            keypad["KEYPAD_USEYN"],
+            _dedup_transactions(transactions),
+            password,
+            keypad.get("KEYPAD_ORDER"),
+        )
+
+    def save(self, fixture_dir):
+        """load로 다시 읽을 수 있는 형식으로 저장"""
+        fixture_dir = Path(fixture_dir)
+        fixture_dir.mkdir(parents=True, exist_ok=True)
+        self.keypad_image.save(fixture_dir / "keypad.png")
+        keypad_order = [
+            self.digits_by_hash[self.area_hashes[area]] for area in FLOATING_AREAS
+        ]
+        (fixture_dir / "keypad.json").write_text(
+            json.dumps(
+                {
+                    "KEYPAD_USEYN": self.keypad_useyn,
+                    "KEYMAP": self.keymap,
+                    "AREA_HASHES": self.area_hashes,
+                    "KEYPAD_ORDER": keypad_order,
+                }
+            )
+        )
+        (fixture_dir / "transactions_fixture.html").write_text(
+            render_transaction_page(self.transactions)
+        )
+
+    def add_transactions(self, transactions):
+        """새 거래 추가 (실행 중에도 다음 조회부터 반영)"""
+        self.transactions = sorted(
+            [*self.transactions, *transactions],
+            key=lambda transaction: transaction["date"],
+            reverse=True,
+        )
+
+    @property
+    def url(self):
+        assert self._server is not None, "FixtureBank is not started"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fixture-bank", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def keypad_page(self):
+        """브라우저 없이 키패드 화면을 연 결과 (_read_keypad_page와 같은 형식)
+
+        keypad_info_from_page(*bank.keypad_page())로 키패드 인식까지 실행할 수 있다.
+        """
+        self._new_session()
+        cookies = [
+            {"name": "JSESSIONID", "value": self.session_id},
+            {"name": "QSID", "value": self.session_id[:8]},
+        ]
+        return (
+            cookies,
+            self.keypad_useyn,
+            self.keymap,
+            list(self.area_hashes),
+            self.keypad_image.copy(),
+        )
+
+    def _new_session(self):
+        self.keypad_loads += 1
+        self.session_id = secrets.token_hex(16)
+
+    def _keypad_html(self):
+        areas = "".join(
+            f'<area shape="rect" onmousedown="inputKey(\'{area_hash}\')">'
+            for area_hash in self.area_hashes
+        )
+        return (
+            '<html><body style="margin:0"><div id="loading_img"></div>'
+            "<script>setTimeout(function () {"
+            " document.getElementById('loading_img').remove(); }, 50);</script>"
+            f'<input type="hidden" id="KEYPAD_USEYN_{self.keymap}"'
+            f' value="{self.keypad_useyn}">'
+            f'<img src="/quics?keypad={self.session_id}"'
+            f' usemap="#divKeypad{self.keymap}_kp">'
+            f'<map name="divKeypad{self.keymap}_kp">{areas}</map>'
+            "</body></html>"
+        )
+
+    def _keypad_image_html(self):
+        # _read_keypad_page가 KEYPAD_CLIP 영역을 캡처하므로 그 위치에 이미지를 그림
+        return (
+            '<html><body style="margin:0">'
+            '<img src="/keypad.png" style="position:absolute;'
+            f'left:{KEYPAD_CLIP["x"]}px;top:{KEYPAD_CLIP["y"]}px"></body></html>'
+        )
+
+    def _is_valid_request(self, form, cookies):
+        if self.session_id is None or cookies.get("JSESSIONID") != self.session_id:
+            return False
+        if self.password is None:
+            return True
+        hexed_pw = form.get(f"KEYPAD_HASH_{self.keymap}", "")
+        size = len(self.area_hashes[0])
+        digits = [
+            self.digits_by_hash.get(hexed_pw[i : i + size], "?")
+            for i in range(0, len(hexed_pw), size)
+        ]
+        return "".join(digits) == str(self.password)
+
+    def _transaction_page(self, form, cookies):
+        self.transaction_requests += 1
+        if not self._is_valid_request(form, cookies):
+            self.rejected_requests += 1
+            return "<html><body><p>세션이 만료되었습니다.</p></body></html>"
+
+        start = datetime.datetime.strptime(form["조회시작일자"], "%Y%m%d").date()
+        end = datetime.datetime.strptime(form["조회종료일"], "%Y%m%d").date()
+        transactions = [
+            transaction
+            for transaction in self.transactions
+            if start <= transaction["date"].date() <= end
+        ]
+        return render_transaction_page(transactions[:PAGE_TRANSACTIONS])
+
+    def _make_handler(self):
+        bank = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                if url.path == "/keypad.png":
+                    buffer = BytesIO()
+                    bank.keypad_image.save(buffer, "PNG")
+                    self._send(buffer.getvalue(), "image/png")
+                elif "keypad" in query:
+                    self._send(bank._keypad_image_html())
+                elif query.get("page") == ["C025255"]:
+                    bank._new_session()
+                    self._send(
+                        bank._keypad_html(),
+                        cookies={
+                            "JSESSIONID": bank.session_id,
+                            "QSID": bank.session_id[:8],
+                        },
+                    )
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                form = {
+                    key: values[0]
+                    for key, values in parse_qs(
+                        self.rfile.read(length).decode(), keep_blank_values=True
+                    ).items()
+                }
+                cookie = SimpleCookie(self.headers.get("Cookie", ""))
+                cookies = {key: morsel.value for key, morsel in cookie.items()}
+                self._send(bank._transaction_page(form, cookies))
+
+            def _send(self, body, content_type="text/html", cookies=None):
+                if isinstance(body, str):
+                    body = body.encode()
+                    content_type += "; charset=utf-8"
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (cookies or {}).items():
+                    self.send_header("Set-Cookie", f"{key}={value}; Path=/")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -6,8 +6,10 @@ from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
+from app.api.services.pagination import NEXT_CURSOR_HEADER
 from app.core.config import settings
-from app.scheduler import scheduler
+from app.scheduler import scheduler_leader
+from app.scheduler.scraper import bank_scraper
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -20,9 +22,10 @@ if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    scheduler.start()
+    scheduler_leader.start()
     yield
-    scheduler.shutdown()
+    scheduler_leader.stop()
+    bank_scraper.close()
 
 
 app = FastAPI(
@@ -40,6 +43,7 @@ if settings.all_cors_origins:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 import enum
-from typing import Optional, ClassVar
+from typing import Optional, ClassVar, Iterable, Mapping
 import uuid
 from functools import cached_property
 
@@ -12,7 +12,11 @@ from sqlmodel import (
     Relationship,
     Sequence,
     Computed,
+    UniqueConstraint,
+    Index,
+    text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from pydantic import computed_field
 
 
@@ -43,6 +47,11 @@ class Restaurants(SQLModel, table=True):
     close_time: str = Field()
     break_start_time: Optional[str] = Field()
     break_end_time: Optional[str] = Field()
+    catalog_version: int = Field(
+        default=0,
+        description="메뉴/테이블 변경 시 증가하는 버전 (카탈로그 캐시 무효화용)",
+        sa_column_kwargs={"server_default": "0"},
+    )
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     menus: list["Menus"] = Relationship(back_populates="restaurant")
@@ -165,6 +174,16 @@ class WaitingStatus(str, enum.Enum):
 
 
 class Waitings(SQLModel, table=True):
+    # 목록 커서 페이지네이션용 (created_at, id)
+    __table_args__ = (
+        Index(
+            "ix_waitings_restaurant_id_created_at_id",
+            "restaurant_id",
+            "created_at",
+            "id",
+        ),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     restaurant_id: uuid.UUID = Field(
         foreign_key="restaurants.id", index=True, ondelete="CASCADE"
@@ -247,6 +266,16 @@ class Teams(SQLModel, table=True):
     # waiting: Optional["Waitings"] = Relationship(back_populates="team")
     orders: list["Orders"] = Relationship(back_populates="team")
 
+    # 테이블당 활성 팀은 하나 (키오스크 팀은 전화번호가 있고 주문마다 새로 생성됨)
+    __table_args__ = (
+        Index(
+            "uq_teams_active_table_id",
+            "table_id",
+            unique=True,
+            postgresql_where=text("ended_at IS NULL AND phone IS NULL"),
+        ),
+    )
+
 
 class TeamCreate(SQLModel):
     table_id: uuid.UUID
@@ -285,6 +314,19 @@ class OrderBase(SQLModel):
 
 
 class Orders(OrderBase, table=True):
+    __table_args__ = (
+        # 목록 커서 페이지네이션용 (created_at, id)
+        Index(
+            "ix_orders_restaurant_id_created_at_id", "restaurant_id", "created_at", "id"
+        ),
+        # 미결제 주문 조회 (입금 매칭, 자동 거절)용
+        Index(
+            "ix_orders_unpaid_created_at",
+            "created_at",
+            postgresql_where=text("payment_id IS NULL AND reject_reason IS NULL"),
+        ),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     restaurant_id: uuid.UUID = Field(
         foreign_key="restaurants.id", index=True, ondelete="CASCADE"
@@ -302,6 +344,16 @@ class Orders(OrderBase, table=True):
         sa_column_args=[orders_no_seq],
         sa_column_kwargs={"server_default": orders_no_seq.next_value()},
     )
+    # 주문 시점의 메뉴 가격으로 계산한 총액
+    # - 결제 전에는 메뉴나 주문이 거절되어도 바뀌지 않음
+    #   (최종 금액이 총액으로 계산되므로, 안내받은 금액으로 입금해야 주문과 연결됨)
+    # - 결제된 뒤에 거절된 메뉴만 그 수량만큼 차감
+    total_price: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    # 총 결제 금액 (총액 - 주문번호 뒷 2자리)
+    final_price: Optional[int] = Field(
+        default=None,
+        sa_column_args=[Computed("total_price - no % 100", persisted=True)],
+    )
 
     restaurant: "Restaurants" = Relationship(back_populates="orders")
     team: "Teams" = Relationship(back_populates="orders")
@@ -320,70 +372,65 @@ class Orders(OrderBase, table=True):
         else:
             return OrderStatus.ordered
 
-    @computed_field  # type: ignore[misc]
-    @cached_property
-    def total_price(self) -> int:
-        return sum(menu_order.menu.price for menu_order in self.ordered_menus)
-
-    @computed_field  # type: ignore[misc]
-    @property
-    def final_price(self) -> Optional[int]:
-        """총 결제 금액 (총액 + 주문번호 뒷 2자리)"""
-        if self.no is None:
-            return None
-        return self.total_price - (self.no % 100)
-
     @computed_field  # type: ignore[misc]
     @cached_property
     def grouped_ordered_menus(self) -> list["OrderedMenuGrouped"]:
         """메뉴별로 그룹화된 주문 메뉴 정보"""
-        from collections import defaultdict
-
-        # 메뉴별로 그룹화
-        menu_groups = defaultdict(list)
-        for ordered_menu in self.ordered_menus:
-            menu_groups[ordered_menu.menu_id].append(ordered_menu)
-
-        grouped_menus = []
-        for menu_id, ordered_menu_list in menu_groups.items():
-            # 첫 번째 주문 메뉴에서 메뉴 정보 가져오기
-            first_ordered_menu = ordered_menu_list[0]
-
-            # 수량 및 조리 상태 계산
-            total_amount = len(ordered_menu_list)
-            cooked_count = sum(1 for om in ordered_menu_list if om.cooked)
-
-            # 상태 결정 (전체 상태의 우선순위에 따라)
-            if all(om.served_at for om in ordered_menu_list):
-                status = OrderedMenuStatus.served
-            elif any(om.reject_reason for om in ordered_menu_list):
-                status = OrderedMenuStatus.rejected
-            elif cooked_count > 0:
-                status = OrderedMenuStatus.cooked
-            else:
-                status = OrderedMenuStatus.ordered
-
-            grouped_menu = OrderedMenuGrouped(
-                menu=first_ordered_menu.menu,
-                amount=total_amount,
-                cooked_count=cooked_count,
-                status=status,
-                ordered_menu_ids=[om.id for om in ordered_menu_list],
-                ordered_menus=[
-                    OrderedMenuPublic(
-                        id=om.id,
-                        cooked=om.cooked,
-                        reject_reason=om.reject_reason,
-                        served_at=om.served_at,
-                        status=om.status,
-                        menu=om.menu,
-                    )
-                    for om in ordered_menu_list
-                ],
-            )
-            grouped_menus.append(grouped_menu)
-
-        return grouped_menus
+        return group_ordered_menus(self.ordered_menus)
+
+
+def group_ordered_menus(
+    ordered_menus: Iterable["OrderedMenus"],
+    menus: Optional[Mapping[uuid.UUID, MenuPublic]] = None,
+) -> list["OrderedMenuGrouped"]:
+    """주문 메뉴들을 메뉴별로 그룹화
+
+    menus가 주어지면 relationship 대신 해당 메뉴 정보를 사용한다.
+    """
+    from collections import defaultdict
+
+    # 메뉴별로 그룹화
+    menu_groups = defaultdict(list)
+    for ordered_menu in ordered_menus:
+        menu_groups[ordered_menu.menu_id].append(ordered_menu)
+
+    grouped_menus = []
+    for menu_id, ordered_menu_list in menu_groups.items():
+        # 첫 번째 주문 메뉴에서 메뉴 정보 가져오기
+        menu = menus[menu_id] if menus else ordered_menu_list[0].menu
+
+        # 수량 및 조리 상태 계산
+        total_amount = sum(om.amount for om in ordered_menu_list)
+        cooked_count = sum(om.cooked_count for om in ordered_menu_list)
+        served_count = sum(om.served_count for om in ordered_menu_list)
+        rejected_count = sum(om.rejected_count for om in ordered_menu_list)
+
+        # 상태 결정 (전체 상태의 우선순위에 따라)
+        if served_count == total_amount:
+            status = OrderedMenuStatus.served
+        elif rejected_count > 0:
+            status = OrderedMenuStatus.rejected
+        elif cooked_count > 0:
+            status = OrderedMenuStatus.cooked
+        else:
+            status = OrderedMenuStatus.ordered
+
+        grouped_menu = OrderedMenuGrouped(
+            menu=menu,
+            amount=total_amount,
+            cooked_count=cooked_count,
+            served_count=served_count,
+            rejected_count=rejected_count,
+            status=status,
+            ordered_menu_ids=[om.id for om in ordered_menu_list],
+            ordered_menus=[
+                OrderedMenuPublic.model_validate(om, update={"menu": menu})
+                for om in ordered_menu_list
+            ],
+        )
+        grouped_menus.append(grouped_menu)
+
+    return grouped_menus
 
 
 class OrderCreate(SQLModel):
@@ -437,35 +484,74 @@ class OrderedMenuStatus(str, enum.Enum):
 
 
 class OrderedMenuBase(SQLModel):
-    cooked: bool = Field(default=False)  # 조리 완료 여부
+    amount: int = Field(
+        default=1, sa_column_kwargs={"server_default": "1"}
+    )  # 주문 수량
+    cooked_count: int = Field(
+        default=0, sa_column_kwargs={"server_default": "0"}
+    )  # 조리 완료 수량 (서빙된 수량 포함)
+    served_count: int = Field(
+        default=0, sa_column_kwargs={"server_default": "0"}
+    )  # 서빙 완료 수량
+    rejected_count: int = Field(
+        default=0, sa_column_kwargs={"server_default": "0"}
+    )  # 거절 수량
     reject_reason: Optional[str] = Field(default=None)
-    served_at: Optional[datetime] = Field(default=None)
+    served_at: Optional[datetime] = Field(default=None)  # 마지막 서빙 시간
 
 
 class OrderedMenus(OrderedMenuBase, table=True):
+    """주문 메뉴 (메뉴별 수량과 상태별 수량을 가진 주문 항목)"""
+
+    __table_args__ = (
+        UniqueConstraint(
+            "order_id", "menu_id", name="uq_orderedmenus_order_id_menu_id"
+        ),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     restaurant_id: uuid.UUID = Field(
         foreign_key="restaurants.id", index=True, ondelete="CASCADE"
     )
     order_id: uuid.UUID = Field(foreign_key="orders.id", index=True, ondelete="CASCADE")
     menu_id: uuid.UUID = Field(foreign_key="menus.id", index=True)
+    price: int  # 주문 시점의 메뉴 단가
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     restaurant: "Restaurants" = Relationship()
     order: "Orders" = Relationship(back_populates="ordered_menus")
     menu: "Menus" = Relationship()
 
+    @property
+    def pending_count(self) -> int:
+        """조리 대기 수량"""
+        return self.amount - self.cooked_count - self.rejected_count
+
+    @property
+    def serving_count(self) -> int:
+        """서빙 대기 수량 (조리 완료 후 서빙되지 않은 수량)"""
+        return self.cooked_count - self.served_count
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def cooked(self) -> bool:
+        """조리 완료 여부 (거절되지 않은 수량이 모두 조리 완료)"""
+        return self.cooked_count > 0 and self.pending_count == 0
+
     @computed_field  # type: ignore[misc]
     @property
     def status(self) -> OrderedMenuStatus:
-        if self.served_at is not None:
+        if (
+            self.served_count > 0
+            and self.served_count == self.amount - self.rejected_count
+        ):
             return OrderedMenuStatus.served
-        elif self.cooked:  # 조리 완료 상태
-            return OrderedMenuStatus.cooked
-        elif self.reject_reason is not None:
+        elif self.rejected_count == self.amount:
             return OrderedMenuStatus.rejected
-        else:
+        elif self.pending_count > 0:
             return OrderedMenuStatus.ordered
+        else:  # 조리 완료 상태 (서빙 대기)
+            return OrderedMenuStatus.cooked
 
 
 class OrderedMenuCreate(SQLModel):
@@ -476,10 +562,19 @@ class OrderedMenuCreate(SQLModel):
 class OrderedMenuUpdate(SQLModel):
     reject_reason: Optional[str] = None
     status: Optional[str] = None  # "cooking", "served" 등의 상태
+    amount: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="처리할 수량 (미지정 시 처리 가능한 전체 수량)",
+    )
 
 
 class OrderedMenuPublic(SQLModel):
     id: uuid.UUID
+    amount: int = Field(default=1)
+    cooked_count: int = Field(default=0)
+    served_count: int = Field(default=0)
+    rejected_count: int = Field(default=0)
     cooked: bool = Field(default=False)
     reject_reason: Optional[str] = Field(default=None)
     served_at: Optional[datetime] = Field(default=None)
@@ -492,6 +587,11 @@ class OrderedMenuPublic(SQLModel):
 
 class OrderedMenuForServing(SQLModel):
     id: uuid.UUID
+    amount: int = Field(default=1)
+    cooked_count: int = Field(default=0)
+    served_count: int = Field(default=0)
+    rejected_count: int = Field(default=0)
+    serving_count: int = Field(default=0, description="서빙 대기 수량")
     cooked: bool = Field(default=False)
     reject_reason: Optional[str] = Field(default=None)
     served_at: Optional[datetime] = Field(default=None)
@@ -511,22 +611,46 @@ class OrderedMenuGrouped(SQLModel):
     menu: MenuPublic
     amount: int
     cooked_count: int = Field(default=0)
+    served_count: int = Field(default=0)
+    rejected_count: int = Field(default=0)
     status: OrderedMenuStatus
-    ordered_menu_ids: list[uuid.UUID] = Field(description="해당 메뉴의 개별 주문 ID들")
+    ordered_menu_ids: list[uuid.UUID] = Field(description="해당 메뉴의 주문 항목 ID들")
     ordered_menus: list["OrderedMenuPublic"] = Field(
-        description="해당 메뉴의 개별 주문 상세 정보들"
+        description="해당 메뉴의 주문 항목 상세 정보들"
     )
 
     model_config = {"from_attributes": True}
 
 
 class Payments(SQLModel, table=True):
+    # 목록 커서 페이지네이션용 (created_at, id)
+    __table_args__ = (
+        Index(
+            "ix_payments_restaurant_id_created_at_id",
+            "restaurant_id",
+            "created_at",
+            "id",
+        ),
+        # 같은 은행 거래가 두 번 저장되지 않도록 (거래 시간, 금액, 잔고, 거래자)
+        Index(
+            "uq_payments_natural_key",
+            "restaurant_id",
+            "created_at",
+            "amount",
+            "balance",
+            "transaction_by",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     restaurant_id: uuid.UUID = Field(
         foreign_key="restaurants.id", index=True, ondelete="CASCADE"
     )
     transaction_by: Optional[str] = Field(default=None)
     amount: int = Field()
+    balance: Optional[int] = Field(default=None, description="거래 후 잔고")
     refunded_at: Optional[datetime] = Field(default=None)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
@@ -552,6 +676,20 @@ class PaymentWithOrder(SQLModel):
         from_attributes = True
 
 
+class BankSyncStates(SQLModel, table=True):
+    """입금 내역 동기화 상태 (마지막으로 확인한 거래)"""
+
+    restaurant_id: uuid.UUID = Field(
+        foreign_key="restaurants.id", primary_key=True, ondelete="CASCADE"
+    )
+    last_transaction_at: datetime = Field(description="마지막으로 확인한 거래 시간")
+    last_balance: int = Field(description="마지막으로 확인한 거래 후 잔액")
+    full_synced_at: Optional[datetime] = Field(
+        default=None, description="마지막 전체 기간 동기화 시간"
+    )
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
 class BankTransaction(SQLModel):
     transaction_by: str
     date: datetime
@@ -567,6 +705,7 @@ class BankTransaction(SQLModel):
         )
         return {
             "amount": self.amount,
+            "balance": self.balance,
             "created_at": created_at,
             "transaction_by": self.transaction_by,
         }
@@ -616,3 +755,44 @@ class MenuSalesStats(SQLModel):
 
     class Config:
         from_attributes = True
+
+
+class IdempotencyKeys(SQLModel, table=True):
+    """Idempotency-Key로 처리한 요청의 응답 (만료 시간이 지나면 재사용 가능)"""
+
+    key: str = Field(primary_key=True, max_length=300, description="범위:키")
+    request_hash: str = Field(
+        max_length=64, description="매장과 요청 본문의 SHA-256 (다른 요청 재사용 방지)"
+    )
+    response: Optional[dict] = Field(default=None, sa_column=Column(JSONB))
+    expires_at: datetime = Field(index=True)
+
+
+class SchedulerJobStats(SQLModel, table=True):
+    """스케줄러 작업별 실행 통계 (실행 주기 조정용)"""
+
+    job_id: str = Field(primary_key=True, max_length=100)
+    runs: int = Field(default=0, description="실행 횟수 (실패 포함)")
+    failures: int = Field(default=0, description="실패 횟수")
+    skipped: int = Field(
+        default=0, description="이전 실행이 끝나지 않았거나 할 일이 없어 건너뛴 횟수"
+    )
+    missed: int = Field(default=0, description="실행 시간을 놓친 횟수")
+    rows_processed: int = Field(default=0, description="처리한 행 수 합계")
+    total_duration_ms: int = Field(default=0)
+    max_duration_ms: int = Field(default=0)
+    last_duration_ms: Optional[int] = Field(default=None)
+    last_rows_processed: Optional[int] = Field(default=None)
+    last_outcome: Optional[str] = Field(
+        default=None, max_length=20, description="success, failure, skipped"
+    )
+    last_error: Optional[str] = Field(default=None)
+    last_run_at: Optional[datetime] = Field(default=None)
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def avg_duration_ms(self) -> Optional[float]:
+        if self.runs == 0:
+            return None
+        return self.total_duration_ms / self.runs
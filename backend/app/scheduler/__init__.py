@@ -1,19 +1,108 @@
+from datetime import datetime, timezone
+
 from apscheduler.schedulers.background import BackgroundScheduler  # type: ignore[import-untyped]
 from apscheduler.triggers.cron import CronTrigger  # type: ignore[import-untyped]
+from apscheduler.triggers.interval import IntervalTrigger  # type: ignore[import-untyped]
 
 from app.core.config import settings
+from app.core.db import engine
 
-from .payment import connect_payment_to_order
+from .idempotency import delete_expired_idempotency_keys
+from .leader import SchedulerLeader
+from .metrics import add_job_stats_listener, add_tracked_job
+from .payment import BANK_BACKFILL_CHANNEL, backfill_payments, reject_unpaid_orders
+from .polling import BANK_SYNC_CHANNEL, BankSyncPoller
 from .waitiing import send_waiting_expired_notification
 
-scheduler = BackgroundScheduler()
+# 실행이 밀려도 한 번만 실행(coalesce)하고, 이전 실행이 끝나지 않았으면 건너뜀(max_instances)
+scheduler = BackgroundScheduler(job_defaults={"coalesce": True, "max_instances": 1})
+add_job_stats_listener(scheduler)
+
+# 입금 내역 조회 주기는 미결제 주문 여부와 조회 실패에 따라 BankSyncPoller가 정함
+# (트리거는 다음 조회 시간을 정하지 못했을 때를 위한 기본 주기)
+bank_sync_poller = BankSyncPoller(
+    scheduler,
+    "bank_sync",
+    active_seconds=settings.BANK_SYNC_INTERVAL_SECOND,
+    idle_seconds=settings.BANK_SYNC_IDLE_INTERVAL_SECOND,
+    max_backoff_seconds=settings.BANK_SYNC_MAX_BACKOFF_SECOND,
+    failure_threshold=settings.BANK_SYNC_CIRCUIT_BREAKER_FAILURES,
+    circuit_open_seconds=settings.BANK_SYNC_CIRCUIT_BREAKER_SECOND,
+)
+add_tracked_job(
+    scheduler,
+    "bank_sync",
+    bank_sync_poller.run,
+    IntervalTrigger(seconds=settings.BANK_SYNC_IDLE_INTERVAL_SECOND),
+    # 리더가 되면 바로 한 번 조회
+    next_run_time=datetime.now(timezone.utc),
+    misfire_grace_time=None,
+)
+
+# 증분 동기화에서 놓친 거래(늦게 반영된 거래 등)를 찾기 위한 전체 기간 동기화
+add_tracked_job(
+    scheduler,
+    "bank_full_sync",
+    bank_sync_poller.run,
+    CronTrigger(minute=f"*/{settings.BANK_FULL_SYNC_INTERVAL_MINUTE}"),
+    kwargs={"full": True},
+    misfire_grace_time=settings.BANK_FULL_SYNC_INTERVAL_MINUTE * 60,
+)
 
-scheduler.add_job(
-    connect_payment_to_order,
-    CronTrigger(second=f"*/{settings.BANK_SYNC_INTERVAL_SECOND}"),
+add_tracked_job(
+    scheduler,
+    "reject_unpaid_orders",
+    reject_unpaid_orders,
+    CronTrigger(second="*/30"),
+    misfire_grace_time=30,
 )
 
-scheduler.add_job(
+add_tracked_job(
+    scheduler,
+    "waiting_expired_notification",
     send_waiting_expired_notification,
-    CronTrigger(minute=f"*/1"),
+    CronTrigger(minute="*/1"),
+    misfire_grace_time=60,
+)
+
+add_tracked_job(
+    scheduler,
+    "delete_expired_idempotency_keys",
+    delete_expired_idempotency_keys,
+    CronTrigger(minute="*/10"),
+    misfire_grace_time=600,
+)
+
+
+def wake_bank_sync(_payload: str) -> None:
+    """새 미결제 주문 알림을 받으면 입금 내역 조회를 바로 실행"""
+    bank_sync_poller.wake()
+
+
+def schedule_backfill(payload: str) -> None:
+    """입금 내역 복구 요청(payload는 시작 날짜)을 받으면 스케줄러에서 한 번 실행
+
+    리더의 알림 처리 스레드를 막지 않도록 작업으로 등록한다.
+    """
+    add_tracked_job(
+        scheduler,
+        "bank_backfill",
+        backfill_payments,
+        "date",
+        args=[datetime.fromisoformat(payload)],
+        replace_existing=True,
+        misfire_grace_time=None,
+    )
+
+
+# 여러 프로세스(워커)로 실행해도 작업은 한 곳에서만 실행되도록 리더 선출
+# 새 미결제 주문과 입금 내역 복구 요청(NOTIFY)은 리더의 DB 연결로 받아 처리
+scheduler_leader = SchedulerLeader(
+    scheduler,
+    engine,
+    settings.SCHEDULER_LEADER_RETRY_SECOND,
+    listeners={
+        BANK_SYNC_CHANNEL: wake_bank_sync,
+        BANK_BACKFILL_CHANNEL: schedule_backfill,
+    },
 )
@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+
+from sqlmodel import Session, delete
+
+from app.core.db import engine, session_decor
+from app.models import IdempotencyKeys
+
+
+@session_decor(engine)
+def delete_expired_idempotency_keys(session: Session) -> int:
+    now = datetime.now(timezone.utc)
+
+    result = session.exec(
+        delete(IdempotencyKeys).where(IdempotencyKeys.expires_at < now)  # type: ignore
+    )
+    session.commit()
+    print(f"Deleted expired idempotency keys: {result.rowcount}")
+    return result.rowcount
@@ -0,0 +1,138 @@
+import threading
+import time
+from collections.abc import Callable
+from typing import Optional
+
+from apscheduler.schedulers.base import BaseScheduler  # type: ignore[import-untyped]
+from sqlalchemy import Connection, Engine, text
+
+# 스케줄러 실행 권한을 나타내는 advisory lock 키 (모든 프로세스가 같은 값을 사용)
+SCHEDULER_LOCK_ID = 0x6A756D6F  # "jumo"
+
+
+class SchedulerLeader:
+    """PostgreSQL advisory lock으로 여러 프로세스 중 하나에서만 스케줄러 실행
+
+    모든 프로세스가 스케줄러를 일시정지 상태로 시작하고, 락을 얻은 프로세스(리더)만
+    작업을 실행한다. 락은 리더의 DB 연결에 묶여 있어 리더 프로세스가 죽으면
+    자동으로 풀리고, 다른 프로세스가 다음 시도에서 리더가 된다.
+
+    listeners의 채널은 리더의 연결에서 LISTEN하므로, 어느 프로세스에서
+    NOTIFY해도 리더 프로세스에서 해당 함수가 알림의 payload를 인자로 실행된다.
+    """
+
+    def __init__(
+        self,
+        scheduler: BaseScheduler,
+        engine: Engine,
+        retry_seconds: int,
+        listeners: Optional[dict[str, Callable[[str], None]]] = None,
+    ) -> None:
+        self.scheduler = scheduler
+        self.engine = engine
+        self.retry_seconds = retry_seconds
+        self.listeners = listeners or {}
+        self._connection: Optional[Connection] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="scheduler-leader", daemon=True
+        )
+
+    @property
+    def is_leader(self) -> bool:
+        return self._connection is not None
+
+    def start(self) -> None:
+        self.scheduler.start(paused=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.scheduler.shutdown()
+        self._release()
+
+    def _run(self) -> None:
+        while True:
+            if self.is_leader:
+                self._check_connection()
+            else:
+                self._try_acquire()
+            if self.is_leader and self.listeners:
+                self._wait_for_notifies()
+            else:
+                self._stop.wait(self.retry_seconds)
+            if self._stop.is_set():
+                return
+
+    def _try_acquire(self) -> None:
+        connection = None
+        try:
+            connection = self.engine.connect()
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:lock_id)"),
+                {"lock_id": SCHEDULER_LOCK_ID},
+            ).scalar_one()
+            if acquired:
+                for channel in self.listeners:
+                    connection.execute(text(f'LISTEN "{channel}"'))
+            # 트랜잭션을 열어 둔 채로 두지 않음 (락은 연결 단위로 유지됨)
+            connection.commit()
+        except Exception as e:
+            print("Failed to acquire scheduler lock:", e)
+            acquired = False
+
+        if not acquired:
+            if connection is not None:
+                connection.close()
+            return
+
+        self._connection = connection
+        self.scheduler.resume()
+        print("Acquired scheduler lock, running scheduled jobs")
+
+    def _check_connection(self) -> None:
+        assert self._connection is not None
+        try:
+            self._connection.execute(text("SELECT 1"))
+            self._connection.commit()
+        except Exception as e:
+            # 연결이 끊기면 락도 풀리므로 작업을 멈추고 다시 락을 얻을 때까지 대기
+            print("Lost scheduler lock:", e)
+            self.scheduler.pause()
+            self._connection.invalidate()
+            self._connection = None
+
+    def _wait_for_notifies(self) -> None:
+        """다음 확인 시간까지 알림을 받아 처리 (종료 요청은 1초 안에 반영)"""
+        assert self._connection is not None
+        driver_connection = self._connection.connection.driver_connection
+        deadline = time.monotonic() + self.retry_seconds
+        while time.monotonic() < deadline and not self._stop.is_set():
+            try:
+                notifies = driver_connection.notifies(timeout=1)  # type: ignore[union-attr]
+                for notify in notifies:
+                    self._handle_notify(notify.channel, notify.payload)
+            except Exception as e:
+                # 연결 문제는 다음 _check_connection에서 처리
+                print("Failed to receive scheduler notifications:", e)
+                return
+
+    def _handle_notify(self, channel: str, payload: str) -> None:
+        try:
+            self.listeners[channel](payload)
+        except Exception as e:
+            print(f"Failed to handle {channel} notification:", e)
+
+    def _release(self) -> None:
+        if self._connection is None:
+            return
+        try:
+            self._connection.execute(
+                text("SELECT pg_advisory_unlock(:lock_id)"),
+                {"lock_id": SCHEDULER_LOCK_ID},
+            )
+            self._connection.commit()
+        finally:
+            self._connection.close()
+            self._connection = None
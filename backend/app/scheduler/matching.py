@@ -0,0 +1,62 @@
+from collections import defaultdict
+from typing import Iterable
+
+from sqlmodel import SQLModel
+
+from app.models import Orders, Payments
+
+
+class PaymentMatch(SQLModel):
+    payment: Payments
+    order: Orders
+    candidates_count: int  # 입금 시점에 조건이 맞았던 주문 수 (2 이상이면 모호한 매칭)
+
+
+class PaymentMatchResult(SQLModel):
+    matched: list[PaymentMatch] = []
+    ambiguous: list[PaymentMatch] = []  # matched 중 후보가 여러 개였던 매칭
+    unmatched: list[Payments] = []
+
+
+def get_expected_order_no(amount: int) -> int:
+    """입금액으로 예상되는 주문번호 뒷 2자리 (최종 금액 = 총액 - 주문번호 뒷 2자리)"""
+    return 100 - amount % 100
+
+
+def match_payments_to_orders(
+    orders: Iterable[Orders], payments: Iterable[Payments]
+) -> PaymentMatchResult:
+    """입금 내역과 미결제 주문 매칭
+
+    주문을 (최종 금액, 주문번호 뒷 2자리)로 색인해 입금마다 바로 후보를 찾는다.
+    입금은 오래된 순으로 처리하고, 입금 전에 생성된 주문 중 가장 오래된 주문에
+    연결한다. 후보가 여러 개면 연결은 하되 ambiguous에도 담아 확인할 수 있게 한다.
+    """
+    orders_by_key: defaultdict[tuple[int, int], list[Orders]] = defaultdict(list)
+    for order in sorted(orders, key=lambda order: order.created_at):
+        if order.no is None or order.final_price is None:
+            continue
+        orders_by_key[(order.final_price, order.no % 100)].append(order)
+
+    result = PaymentMatchResult()
+    for payment in sorted(payments, key=lambda payment: payment.created_at):
+        candidates = orders_by_key.get(
+            (payment.amount, get_expected_order_no(payment.amount))
+        )
+        eligible = [
+            order for order in candidates or [] if order.created_at < payment.created_at
+        ]
+        if not eligible:
+            result.unmatched.append(payment)
+            continue
+
+        order = eligible[0]
+        candidates.remove(order)  # type: ignore[union-attr]
+        match = PaymentMatch(
+            payment=payment, order=order, candidates_count=len(eligible)
+        )
+        result.matched.append(match)
+        if len(eligible) > 1:
+            result.ambiguous.append(match)
+
+    return result
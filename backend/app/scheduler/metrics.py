@@ -0,0 +1,148 @@
+import functools
+import time
+from collections.abc import Callable, Sized
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from apscheduler.events import (  # type: ignore[import-untyped]
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    JobEvent,
+)
+from apscheduler.schedulers.base import BaseScheduler  # type: ignore[import-untyped]
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.models import SchedulerJobStats
+
+# 실행마다 더해지는 값
+COUNTER_FIELDS = [
+    "runs",
+    "failures",
+    "skipped",
+    "missed",
+    "rows_processed",
+    "total_duration_ms",
+]
+
+
+def count_rows(retval: Any) -> int:
+    """작업 반환값으로 처리한 행 수 계산 (정수 또는 처리한 항목 목록)"""
+    if isinstance(retval, int):
+        return retval
+    if isinstance(retval, Sized):
+        return len(retval)
+    return 0
+
+
+def record_job_stats(job_id: str, **values: Any) -> None:
+    """작업 통계에 이번 실행 결과를 더함 (횟수는 누적, last_*는 덮어씀)"""
+    now = datetime.now(timezone.utc)
+    statement = insert(SchedulerJobStats).values(
+        {
+            "job_id": job_id,
+            **dict.fromkeys(COUNTER_FIELDS, 0),
+            "max_duration_ms": values.get("last_duration_ms", 0),
+            "updated_at": now,
+            **values,
+        }
+    )
+    set_ = {
+        field: getattr(SchedulerJobStats, field) + getattr(statement.excluded, field)
+        for field in COUNTER_FIELDS
+    }
+    set_["max_duration_ms"] = func.greatest(
+        SchedulerJobStats.max_duration_ms, statement.excluded.max_duration_ms
+    )
+    for field in values:
+        if field not in COUNTER_FIELDS:
+            set_[field] = getattr(statement.excluded, field)
+    set_["updated_at"] = statement.excluded.updated_at
+
+    with Session(engine) as session:
+        session.execute(
+            statement.on_conflict_do_update(index_elements=["job_id"], set_=set_)
+        )
+        session.commit()
+
+
+def record_job_run(
+    job_id: str, duration_ms: int, retval: Any, error: Optional[Exception]
+) -> None:
+    values: dict[str, Any] = {
+        "runs": 1,
+        "total_duration_ms": duration_ms,
+        "last_duration_ms": duration_ms,
+        "last_run_at": datetime.now(timezone.utc),
+        "last_error": None,
+    }
+    if error is not None:
+        values |= {
+            "failures": 1,
+            "last_outcome": "failure",
+            "last_error": repr(error),
+            "last_rows_processed": 0,
+        }
+    elif retval is None:
+        # 할 일이 없어 실행하지 않은 경우 (예: 다른 동기화가 진행 중)
+        values |= {"skipped": 1, "last_outcome": "skipped", "last_rows_processed": 0}
+    else:
+        rows = count_rows(retval)
+        values |= {
+            "rows_processed": rows,
+            "last_outcome": "success",
+            "last_rows_processed": rows,
+        }
+    record_job_stats(job_id, **values)
+
+
+def tracked(job_id: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """실행 시간, 결과, 처리한 행 수(반환값)를 기록하도록 작업을 감쌈"""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        retval = None
+        error = None
+        try:
+            retval = func(*args, **kwargs)
+            return retval
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            duration_ms = round((time.perf_counter() - started) * 1000)
+            try:
+                record_job_run(job_id, duration_ms, retval, error)
+            except Exception as e:
+                # 통계 기록 실패로 작업 실행에 영향을 주지 않음
+                print(f"Failed to record job stats for {job_id}:", e)
+
+    return wrapper
+
+
+def on_job_event(event: JobEvent) -> None:
+    """실행되지 못한 작업 기록 (이전 실행이 끝나지 않았거나 실행 시간을 놓친 경우)"""
+    try:
+        if event.code == EVENT_JOB_MAX_INSTANCES:
+            record_job_stats(event.job_id, skipped=1)
+        elif event.code == EVENT_JOB_MISSED:
+            record_job_stats(event.job_id, missed=1)
+    except Exception as e:
+        print(f"Failed to record job stats for {event.job_id}:", e)
+
+
+def add_tracked_job(
+    scheduler: BaseScheduler,
+    job_id: str,
+    func: Callable[..., Any],
+    trigger: Any,
+    **kwargs: Any,
+) -> None:
+    scheduler.add_job(tracked(job_id, func), trigger, id=job_id, **kwargs)
+
+
+def add_job_stats_listener(scheduler: BaseScheduler) -> None:
+    scheduler.add_listener(on_job_event, EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES)
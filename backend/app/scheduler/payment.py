@@ -1,7 +1,12 @@
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
-from typing import Sequence
+from typing import Optional, Sequence
 
-from sqlmodel import Session, select, col
+from sqlalchemy import Integer, String, column, exists, text, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, col, select, update
 
 from app.core.config import settings
 from app.core.db import engine, session_decor
@@ -9,21 +14,80 @@ from app.models import (
     Restaurants,
     Orders,
     Payments,
+    BankSyncStates,
     BankTransaction,
 )
-from app.lib.kb_fastlookup import get_transactions
 
+from .matching import match_payments_to_orders
+from .scraper import bank_scraper
 
-def get_recent_bank_transactions() -> Sequence[BankTransaction]:
-    # get_transactions returns list of dicts
-    # like this:
-    # [{'transaction_by': '', 'date': datetime.datetime(2017, 9, 11, 12, 39, 42), 'amount': 50, 'balance': 394}]
-    transaction_list = get_transactions(
+# 입금 내역 동기화/복구/자동 거절이 동시에 실행되지 않도록 막는 advisory lock 키
+# (API 워커 등 여러 프로세스가 같은 값을 사용)
+BANK_SYNC_LOCK_ID = 0x62616E6B  # "bank"
+
+# 입금 내역 복구 요청을 리더 프로세스로 보내는 NOTIFY 채널 (payload는 시작 날짜)
+BANK_BACKFILL_CHANNEL = "bank_backfill"
+
+
+@contextmanager
+def bank_sync_lock(wait: bool = True) -> Iterator[bool]:
+    """입금 내역 동기화 락을 잡고 성공 여부를 반환 (wait이 False면 기다리지 않음)
+
+    락은 별도 DB 연결에 묶여 있어, 프로세스가 죽어 연결이 끊기면 자동으로 풀린다.
+    """
+    with engine.connect() as connection:
+        if wait:
+            connection.execute(
+                text("SELECT pg_advisory_lock(:lock_id)"),
+                {"lock_id": BANK_SYNC_LOCK_ID},
+            )
+            acquired = True
+        else:
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:lock_id)"),
+                {"lock_id": BANK_SYNC_LOCK_ID},
+            ).scalar_one()
+        # 트랜잭션을 열어 둔 채로 두지 않음 (락은 연결 단위로 유지됨)
+        connection.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:lock_id)"),
+                    {"lock_id": BANK_SYNC_LOCK_ID},
+                )
+                connection.commit()
+
+
+def as_utc(date: datetime) -> datetime:
+    """naive datetime을 UTC로 처리"""
+    return date.replace(tzinfo=timezone.utc) if date.tzinfo is None else date
+
+
+def get_recent_bank_transactions(
+    start_date: Optional[datetime] = None, max_workers: int = 1
+) -> Sequence[BankTransaction]:
+    """은행 거래 내역 조회 (별도 프로세스에서 실행, app.scheduler.scraper 참고)
+
+    start_date가 없으면 최근 30일, 있으면 해당 날짜부터 오늘까지 조회한다.
+    """
+    # 180일 단위 조회 기간이 여러 개면 그만큼 오래 걸릴 수 있음
+    windows = (
+        (datetime.now(timezone.utc) - as_utc(start_date)).days // 180 + 1
+        if start_date
+        else 1
+    )
+    transaction_list = bank_scraper.get_transactions(
+        timeout=settings.BANK_SCRAPER_TIMEOUT_SECOND * windows,
         bank_num=settings.BANK_ACCOUNT_NO,
         birthday=settings.BANK_ACCOUNT_BIRTHDAY,
         password=settings.BANK_ACCOUNT_PASSWORD,
         days=30,
         # start_date = '20220701' #optional, you must use 'yyyymmdd' style.
+        start_date=start_date.strftime("%Y%m%d") if start_date else None,
+        keypad_ttl=settings.BANK_KEYPAD_CACHE_TTL_MINUTE * 60,
+        max_workers=max_workers,
     )
 
     # injected = BankTransaction(
@@ -34,94 +98,307 @@ def get_recent_bank_transactions() -> Sequence[BankTransaction]:
     # )
     return [
         # injected,
-        *[BankTransaction.model_validate(trs) for trs in transaction_list],
+        *transaction_list,
     ]
 
 
-@session_decor(engine)
-def connect_payment_to_order(session: Session) -> None:
-    transaction_list = get_recent_bank_transactions()
-    # print("transaction_list:", transaction_list)
-    now = datetime.now(timezone.utc).replace(tzinfo=None)
-    before_10_minutes = now - timedelta(minutes=10)
+def get_new_bank_transactions(
+    sync_state: Optional[BankSyncStates], full: bool
+) -> Sequence[BankTransaction]:
+    """마지막으로 확인한 거래 이후의 거래 내역 조회
 
-    restaurant = session.exec(select(Restaurants)).first()
-    assert restaurant is not None, "Restaurant not found"
+    동기화 상태가 없거나 전체 동기화일 때는 최근 30일 전체를 조회한다.
+    """
+    if full or sync_state is None:
+        return get_recent_bank_transactions()
 
-    exist_payments = session.exec(
-        select(Payments).where(
-            Payments.restaurant_id == restaurant.id,
-            col(Payments.created_at).in_(
-                [
-                    (
-                        transaction.date.replace(tzinfo=timezone.utc)
-                        if transaction.date.tzinfo is None
-                        else transaction.date
-                    )
-                    for transaction in transaction_list
-                ]
+    last_transaction_at = as_utc(sync_state.last_transaction_at)
+    # 은행과 서버의 날짜 기준이 달라도 빠지는 거래가 없도록 하루 전부터 조회
+    transaction_list = get_recent_bank_transactions(
+        last_transaction_at - timedelta(days=1)
+    )
+    # 같은 시간에 여러 거래가 있을 수 있으므로 마지막 거래 시간도 포함
+    # (이미 저장된 거래는 아래에서 걸러짐)
+    return [
+        transaction
+        for transaction in transaction_list
+        if as_utc(transaction.date) >= last_transaction_at
+    ]
+
+
+def has_new_bank_transactions(sync_state: BankSyncStates) -> bool:
+    """가장 최근 거래만 조회해서 마지막으로 확인한 뒤 새 거래가 있는지 확인
+
+    거래마다 거래 후 잔고가 있으므로 가장 최근 거래의 시간과 잔고가
+    동기화 상태와 같으면 새 거래가 없다.
+    """
+    latest = bank_scraper.get_latest_transaction(
+        timeout=settings.BANK_SCRAPER_TIMEOUT_SECOND,
+        bank_num=settings.BANK_ACCOUNT_NO,
+        birthday=settings.BANK_ACCOUNT_BIRTHDAY,
+        password=settings.BANK_ACCOUNT_PASSWORD,
+        keypad_ttl=settings.BANK_KEYPAD_CACHE_TTL_MINUTE * 60,
+    )
+    # 새 거래는 조회 기간(어제부터 오늘까지)에 있어야 하므로 거래가 없으면 변경 없음
+    if latest is None:
+        return False
+
+    return (
+        as_utc(latest.date) != as_utc(sync_state.last_transaction_at)
+        or latest.balance != sync_state.last_balance
+    )
+
+
+def update_bank_sync_state(
+    session: Session,
+    restaurant: Restaurants,
+    sync_state: Optional[BankSyncStates],
+    transaction_list: Sequence[BankTransaction],
+    full: bool,
+    now: datetime,
+) -> None:
+    """가장 최근 거래 시간과 잔액으로 동기화 상태 갱신 (커밋은 호출하는 쪽에서)"""
+    latest = max(
+        transaction_list,
+        key=lambda transaction: as_utc(transaction.date),
+        default=None,
+    )
+    if sync_state is None:
+        if latest is None:
+            return
+        sync_state = BankSyncStates(
+            restaurant_id=restaurant.id,
+            last_transaction_at=as_utc(latest.date),
+            last_balance=latest.balance,
+        )
+    elif latest is not None and as_utc(latest.date) >= as_utc(
+        sync_state.last_transaction_at
+    ):
+        sync_state.last_transaction_at = as_utc(latest.date)
+        sync_state.last_balance = latest.balance
+
+    if full:
+        sync_state.full_synced_at = now
+    sync_state.updated_at = now
+    session.add(sync_state)
+
+
+def fill_legacy_payment_balances(
+    session: Session, restaurant: Restaurants, payment_rows: list[dict]
+) -> None:
+    """잔고를 저장하기 전에 추가된 입금 내역에 잔고를 채움
+
+    잔고가 없으면 같은 거래도 고유 키가 달라 다시 추가되므로, 시간/금액/거래자가
+    같은 거래의 잔고를 채워 같은 거래로 인식되게 한다.
+    """
+    transactions = values(
+        column("created_at", Payments.__table__.c.created_at.type),  # type: ignore
+        column("amount", Integer),
+        column("balance", Integer),
+        column("transaction_by", String),
+        name="transactions",
+    ).data(
+        [
+            (row["created_at"], row["amount"], row["balance"], row["transaction_by"])
+            for row in payment_rows
+        ]
+    )
+    session.execute(
+        update(Payments)
+        .where(
+            col(Payments.restaurant_id) == restaurant.id,
+            col(Payments.balance) == None,
+            col(Payments.created_at) == transactions.c.created_at,
+            col(Payments.amount) == transactions.c.amount,
+            col(Payments.transaction_by).is_not_distinct_from(
+                transactions.c.transaction_by
             ),
         )
-    ).all()
-    non_exist_payments = [
+        .values(balance=transactions.c.balance)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def insert_new_payments(
+    session: Session,
+    restaurant: Restaurants,
+    transaction_list: Sequence[BankTransaction],
+) -> list[Payments]:
+    """저장되지 않은 거래만 입금 내역으로 추가하고, 추가된 입금 내역을 반환
+
+    (거래 시간, 금액, 잔고, 거래자)가 같은 입금 내역이 이미 있으면 건너뛴다.
+    """
+    if not transaction_list:
+        return []
+
+    payment_rows = [
         Payments.model_validate(
             transaction.to_payment_data_dict(),
             update={"restaurant_id": restaurant.id},
-        )
+        ).model_dump()
         for transaction in transaction_list
-        if not any(
-            payment.amount == transaction.amount
-            and payment.created_at == transaction.date
-            for payment in exist_payments
-        )
     ]
+    fill_legacy_payment_balances(session, restaurant, payment_rows)
+    return list(
+        session.scalars(
+            insert(Payments)
+            .on_conflict_do_nothing(
+                index_elements=[
+                    "restaurant_id",
+                    "created_at",
+                    "amount",
+                    "balance",
+                    "transaction_by",
+                ]
+            )
+            .returning(Payments),
+            payment_rows,
+        )
+    )
+
+
+@session_decor(engine)
+def backfill_payments(session: Session, start_date: datetime) -> int:
+    """start_date부터 오늘까지의 입금 내역을 한 번에 저장하고, 추가한 수를 반환 (장애 후 복구용)
+
+    180일 단위 조회 기간을 동시에 조회하고, 저장되지 않은 거래만
+    한 번에 추가한다. 주문 연결은 하지 않는다.
+    """
+    with bank_sync_lock():
+        restaurant = session.exec(select(Restaurants)).first()
+        assert restaurant is not None, "Restaurant not found"
+
+        transaction_list = get_recent_bank_transactions(
+            start_date, max_workers=settings.BANK_BACKFILL_MAX_WORKERS
+        )
+        new_payments = insert_new_payments(session, restaurant, transaction_list)
+        sync_state = session.get(BankSyncStates, restaurant.id)
+        update_bank_sync_state(
+            session,
+            restaurant,
+            sync_state,
+            transaction_list,
+            True,
+            datetime.now(timezone.utc),
+        )
+        session.commit()
+        print(
+            f"Backfilled {len(new_payments)} payments "
+            f"from {len(transaction_list)} transactions since {start_date:%Y-%m-%d}"
+        )
+        return len(new_payments)
+
+
+@session_decor(engine)
+def connect_payment_to_order(session: Session, full: bool = False) -> Optional[int]:
+    """입금 내역 동기화 후 주문과 연결하고, 새로 추가한 입금 내역 수를 반환
+
+    평소에는 마지막으로 확인한 거래 이후만 조회하고(증분 동기화),
+    full이면 최근 30일 전체를 다시 조회해 늦게 반영된 거래를 찾는다.
+    다른 동기화가 진행 중이라 건너뛰면 None을 반환한다.
+    """
+    # 전체 동기화는 진행 중인 증분 동기화를 기다리고, 증분 동기화는 건너뜀
+    with bank_sync_lock(wait=full) as acquired:
+        if not acquired:
+            return None
+        return sync_payments(session, full)
+
+
+def sync_payments(session: Session, full: bool) -> int:
+    restaurant = session.exec(select(Restaurants)).first()
+    assert restaurant is not None, "Restaurant not found"
 
-    if not non_exist_payments:
-        return
+    sync_state = session.get(BankSyncStates, restaurant.id)
+    # 대부분의 증분 동기화는 새 거래가 없으므로 가장 최근 거래만 먼저 확인
+    if (
+        not full
+        and sync_state is not None
+        and not has_new_bank_transactions(sync_state)
+    ):
+        return 0
 
-    # 전체 결제 내역 동기화
-    session.add_all(non_exist_payments)
+    transaction_list = get_new_bank_transactions(sync_state, full)
+    # print("transaction_list:", transaction_list)
+
+    # 새 입금 내역과 동기화 상태를 함께 저장
+    new_payments = insert_new_payments(session, restaurant, transaction_list)
+    update_bank_sync_state(
+        session,
+        restaurant,
+        sync_state,
+        transaction_list,
+        full,
+        datetime.now(timezone.utc),
+    )
     session.commit()
-    print(f"Inserted {len(non_exist_payments)} new payments")
 
-    orders_without_payment = {
-        order.id: order
-        for order in session.exec(
-            select(Orders).where(
-                Orders.payment_id == None, Orders.reject_reason == None
-            )
-        ).all()
-    }
+    if not new_payments:
+        return 0
+
+    print(f"Inserted {len(new_payments)} new payments")
+
+    orders_without_payment = session.exec(
+        select(Orders).where(Orders.payment_id == None, Orders.reject_reason == None)
+    ).all()
 
+    match_result = match_payments_to_orders(orders_without_payment, new_payments)
     payment_attached_orders = []
-    for payment in non_exist_payments:
-        expected_order_no = 100 - payment.amount % 100
-        for order in orders_without_payment.values():
-            if (
-                order.created_at < payment.created_at
-                and order.no % 100 == expected_order_no  # type: ignore
-                and order.total_price == payment.amount + expected_order_no
-            ):
-                order.payment_id = payment.id
-                payment_attached_orders.append(order)
-                del orders_without_payment[order.id]
-                break
+    for match in match_result.matched:
+        match.order.payment_id = match.payment.id
+        payment_attached_orders.append(match.order)
+    for match in match_result.ambiguous:
+        print(
+            f"Ambiguous payment match: payment {match.payment.id} "
+            f"({match.payment.amount}) -> order {match.order.no} "
+            f"among {match.candidates_count} candidates"
+        )
 
     if len(payment_attached_orders) > 0:
         session.add_all(payment_attached_orders)
         session.commit()
         print(f"Attached payments to orders: {len(payment_attached_orders)}")
 
-    # 10분동안 입금되지 않은 주문은 자동 거절 처리
-    if len(orders_without_payment) > 0:
-        for order in orders_without_payment.values():
-            if order.created_at < before_10_minutes:
-                order.reject_reason = (
-                    "10분동안 입금되지 않아 자동으로 주문이 거절되었습니다."
-                )
-                session.add(order)
+    return len(new_payments)
+
 
+@session_decor(engine)
+def has_unpaid_orders(session: Session) -> bool:
+    """입금을 기다리는 주문이 있는지 확인 (미결제 주문 부분 인덱스 사용)"""
+    return session.exec(
+        select(
+            exists().where(
+                col(Orders.payment_id) == None, col(Orders.reject_reason) == None
+            )
+        )
+    ).one()
+
+
+@session_decor(engine)
+def reject_unpaid_orders(session: Session) -> list[uuid.UUID]:
+    """10분동안 입금되지 않은 주문을 한 번에 자동 거절하고, 거절한 주문 id를 반환"""
+    before_10_minutes = datetime.now(timezone.utc) - timedelta(minutes=10)
+
+    # 입금 동기화 중에 연결될 주문을 거절하지 않도록 동기화가 끝난 뒤 실행
+    with bank_sync_lock():
+        rejected_order_ids = list(
+            session.scalars(
+                update(Orders)
+                .where(
+                    col(Orders.payment_id) == None,
+                    col(Orders.reject_reason) == None,
+                    col(Orders.created_at) < before_10_minutes,
+                )
+                .values(
+                    reject_reason="10분동안 입금되지 않아 자동으로 주문이 거절되었습니다."
+                )
+                .returning(Orders.id)
+            )
+        )
         session.commit()
+
+    if rejected_order_ids:
         print(
-            f"Processed orders without payment after 10 minutes: {len(orders_without_payment)}"
+            f"Rejected {len(rejected_order_ids)} orders without payment "
+            f"after 10 minutes: {', '.join(map(str, rejected_order_ids))}"
         )
+    return rejected_order_ids
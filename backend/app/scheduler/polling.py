@@ -0,0 +1,134 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from apscheduler.schedulers.base import BaseScheduler  # type: ignore[import-untyped]
+
+from .payment import connect_payment_to_order, has_unpaid_orders
+
+# 새 미결제 주문이 생겼을 때 입금 내역 조회를 깨우는 NOTIFY 채널
+BANK_SYNC_CHANNEL = "bank_sync"
+
+
+class BankSyncPoller:
+    """미결제 주문 여부와 조회 실패에 따라 입금 내역 조회 간격 조절
+
+    - 미결제 주문이 있으면 active_seconds, 없으면 idle_seconds 후에 다시 조회
+    - 조회에 실패하면 active_seconds부터 두 배씩 늘려 max_backoff_seconds까지 대기
+    - failure_threshold번 연속으로 실패하면 circuit_open_seconds 동안 조회하지 않음
+      (이후 한 번 조회해서 성공하면 원래 주기로, 실패하면 다시 멈춤)
+    - 새 주문이 생기면 wake()로 바로 조회 (조회가 멈춘 동안에는 무시)
+    - 조회 중에 들어온 wake는 조회가 끝나자마자 한 번 더 조회 (증분 동기화)
+    """
+
+    def __init__(
+        self,
+        scheduler: BaseScheduler,
+        job_id: str,
+        active_seconds: int,
+        idle_seconds: int,
+        max_backoff_seconds: int,
+        failure_threshold: int,
+        circuit_open_seconds: int,
+    ) -> None:
+        self.scheduler = scheduler
+        self.job_id = job_id
+        self.active_seconds = active_seconds
+        self.idle_seconds = idle_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.failure_threshold = failure_threshold
+        self.circuit_open_seconds = circuit_open_seconds
+        self.failures = 0
+        self.circuit_open_until: Optional[datetime] = None
+        self._running = 0  # 실행 중인 조회 수 (증분/전체 동기화 작업)
+        self._pending_wake = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_circuit_open(self) -> bool:
+        return (
+            self.circuit_open_until is not None
+            and datetime.now(timezone.utc) < self.circuit_open_until
+        )
+
+    def run(self, full: bool = False) -> Optional[int]:
+        """입금 내역을 동기화하고 다음 조회 시간을 정함 (반환값은 새 입금 내역 수)"""
+        # 전체 동기화도 은행이 응답하지 않는 동안에는 건너뜀
+        if full and self.is_circuit_open:
+            return None
+
+        with self._lock:
+            self._running += 1
+        try:
+            result = self._sync(full)
+            # 실행 중인 작업은 다시 시작할 수 없으므로(max_instances) 여기서 바로 조회
+            while self._take_pending_wake():
+                inserted = self._sync(False)
+                if inserted is not None:
+                    result = (result or 0) + inserted
+            return result
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def wake(self) -> None:
+        """다음 조회를 지금 바로 실행 (조회 중이면 끝난 뒤에 한 번 더 실행)"""
+        with self._lock:
+            if self.is_circuit_open:
+                return
+            if self._running > 0:
+                self._pending_wake = True
+                return
+        self.scheduler.modify_job(self.job_id, next_run_time=datetime.now(timezone.utc))
+
+    def _sync(self, full: bool) -> Optional[int]:
+        try:
+            result = connect_payment_to_order(full=full)
+        except Exception:
+            self._reschedule(self._record_failure())
+            raise
+
+        with self._lock:
+            self.failures = 0
+            self.circuit_open_until = None
+        self._reschedule(
+            self.active_seconds if has_unpaid_orders() else self.idle_seconds
+        )
+        return result
+
+    def _take_pending_wake(self) -> bool:
+        """마지막으로 끝나는 조회에서만 대기 중인 wake를 가져감
+
+        (다른 조회가 아직 실행 중이면 동기화 락 때문에 증분 동기화가 건너뛰어지므로)
+        """
+        with self._lock:
+            if not self._pending_wake or self._running > 1:
+                return False
+            self._pending_wake = False
+            return True
+
+    def _record_failure(self) -> int:
+        """실패 횟수를 늘리고 다음 조회까지 기다릴 시간을 반환"""
+        with self._lock:
+            # 실패 후에는 대기 시간이 지난 뒤에 다시 조회
+            self._pending_wake = False
+            self.failures += 1
+            if self.failures < self.failure_threshold:
+                return min(
+                    self.active_seconds * 2**self.failures, self.max_backoff_seconds
+                )
+
+            self.circuit_open_until = datetime.now(timezone.utc) + timedelta(
+                seconds=self.circuit_open_seconds
+            )
+        print(
+            f"Bank sync failed {self.failures} times in a row, "
+            f"pausing until {self.circuit_open_until:%H:%M:%S}"
+        )
+        return self.circuit_open_seconds
+
+    def _reschedule(self, delay_seconds: int) -> None:
+        self.scheduler.modify_job(
+            self.job_id,
+            next_run_time=datetime.now(timezone.utc) + timedelta(seconds=delay_seconds),
+        )
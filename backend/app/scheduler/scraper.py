@@ -0,0 +1,60 @@
+import multiprocessing
+import threading
+from collections.abc import Callable
+from multiprocessing.pool import Pool
+from typing import Any, Optional
+
+from app.lib import kb_fastlookup
+from app.models import BankTransaction
+
+
+class BankScraper:
+    """은행 거래 내역 조회를 별도 프로세스에서 실행
+
+    브라우저(Playwright)와 이미지/HTML 처리가 API 프로세스의 GIL과 메모리를
+    쓰지 않도록 작업 프로세스 하나에서 kb_fastlookup을 실행하고, 결과를
+    BankTransaction으로 돌려준다. 작업 프로세스는 계속 살아 있으므로 그 안의
+    키패드 캐시와 브라우저도 계속 재사용된다. 조회가 timeout 안에 끝나지 않으면
+    작업 프로세스를 종료하고(브라우저도 함께 종료됨) 다음 조회 때 새로 띄운다.
+    """
+
+    def __init__(self) -> None:
+        self._pool: Optional[Pool] = None
+        self._lock = threading.Lock()
+
+    def get_transactions(self, timeout: float, **kwargs: Any) -> list[BankTransaction]:
+        transaction_list = self._run(kb_fastlookup.get_transactions, kwargs, timeout)
+        return [BankTransaction.model_validate(trs) for trs in transaction_list]
+
+    def get_latest_transaction(
+        self, timeout: float, **kwargs: Any
+    ) -> Optional[BankTransaction]:
+        latest = self._run(kb_fastlookup.get_latest_transaction, kwargs, timeout)
+        return BankTransaction.model_validate(latest) if latest is not None else None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool.join()
+                self._pool = None
+
+    def _run(self, func: Callable[..., Any], kwargs: dict, timeout: float) -> Any:
+        with self._lock:
+            if self._pool is None:
+                # API 프로세스의 스레드와 DB 연결을 물려받지 않도록 spawn으로 시작
+                self._pool = multiprocessing.get_context("spawn").Pool(processes=1)
+            pool = self._pool
+
+        try:
+            return pool.apply_async(func, kwds=kwargs).get(timeout)
+        except multiprocessing.TimeoutError:
+            print(f"Bank scraper did not respond in {timeout}s, killing worker")
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = None
+            pool.terminate()
+            raise TimeoutError(f"Bank scraper timed out after {timeout}s")
+
+
+bank_scraper = BankScraper()
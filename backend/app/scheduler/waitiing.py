@@ -12,7 +12,7 @@ from app.models import Restaurants, Waitings
 
 
 @session_decor(engine)
-def send_waiting_expired_notification(session: Session):
+def send_waiting_expired_notification(session: Session) -> int:
     now = datetime.now(timezone.utc)
     after_10_minutes = now - timedelta(minutes=10)
 
@@ -39,3 +39,4 @@ def send_waiting_expired_notification(session: Session):
 
     session.commit()
     print(f"Processed expired waitings: {len(expired_waitings)}")
+    return len(expired_waitings)
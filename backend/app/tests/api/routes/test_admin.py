@@ -0,0 +1,166 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlmodel import Session, delete, select
+
+from app.api.routes.admin import _update_ordered_menu
+from app.core.config import settings
+from app.core.db import engine
+from app.models import (
+    OrderedMenus,
+    OrderedMenuStatus,
+    OrderedMenuUpdate,
+    Orders,
+    Payments,
+    Restaurants,
+    Tables,
+)
+from app.tests.utils.utils import (
+    count_queries,
+    create_table_order,
+    pay_order,
+    temporary_table,
+)
+
+# 응답에 필요한 관계를 미리 불러오므로 행 수와 관계없이 쿼리 수가 일정
+# (레스토랑 조회 포함)
+LIST_QUERY_COUNTS = {
+    "/admin/orders": 3,
+    "/admin/tables": 3,
+    "/admin/serving/ordered-menus": 3,
+}
+
+
+def test_reject_ordered_menu_keeps_unpaid_final_price(
+    client: TestClient,
+    admin_token_headers: dict[str, str],
+    db: Session,
+    restaurant: Restaurants,
+) -> None:
+    """입금 전에는 메뉴를 거절해도 안내한 최종 금액이 바뀌지 않고, 입금 후에는 총액 차감"""
+    with temporary_table(db, restaurant) as table:
+        created = create_table_order(db, restaurant, table, amount=3)
+        ordered_menu = db.exec(
+            select(OrderedMenus).where(OrderedMenus.order_id == created.id)
+        ).one()
+
+        r = client.delete(
+            f"{settings.API_V1_STR}/admin/ordered-menus/{ordered_menu.id}",
+            params={"amount": 1},
+            headers=admin_token_headers,
+        )
+        assert r.status_code == 200
+        order = db.get(Orders, created.id)
+        assert order is not None
+        db.refresh(order)
+        assert order.total_price == created.total_price
+        assert order.final_price == created.final_price
+
+        payment = Payments(restaurant_id=restaurant.id, amount=created.final_price)
+        db.add(payment)
+        order.payment_id = payment.id
+        db.add(order)
+        db.commit()
+        try:
+            r = client.delete(
+                f"{settings.API_V1_STR}/admin/ordered-menus/{ordered_menu.id}",
+                params={"amount": 1},
+                headers=admin_token_headers,
+            )
+            assert r.status_code == 200
+            db.refresh(order)
+            assert order.total_price == created.total_price - ordered_menu.price
+        finally:
+            order.payment_id = None
+            db.add(order)
+            db.exec(delete(Payments).where(Payments.id == payment.id))  # type: ignore
+            db.commit()
+
+
+def test_concurrent_cooking_does_not_exceed_amount(
+    db: Session, restaurant: Restaurants
+) -> None:
+    """같은 주문 메뉴를 동시에 조리 완료해도 주문 수량만큼만 처리되고 나머지는 400"""
+    amount = 5
+    requests = 12
+    with temporary_table(db, restaurant) as table:
+        created = create_table_order(db, restaurant, table, amount=amount)
+        pay_order(db, restaurant, created.id)
+        ordered_menu_id = db.exec(
+            select(OrderedMenus.id).where(OrderedMenus.order_id == created.id)
+        ).one()
+        start = threading.Event()
+
+        def cook_one() -> int:
+            with Session(engine) as session:
+                ordered_menu = session.get(OrderedMenus, ordered_menu_id)
+                assert ordered_menu is not None
+                session_restaurant = session.get(Restaurants, restaurant.id)
+                assert session_restaurant is not None
+                start.wait()
+                try:
+                    _update_ordered_menu(
+                        session,
+                        session_restaurant,
+                        ordered_menu,
+                        OrderedMenuUpdate(status=OrderedMenuStatus.cooked, amount=1),
+                    )
+                except HTTPException as e:
+                    return e.status_code
+                return 200
+
+        with ThreadPoolExecutor(max_workers=requests) as executor:
+            futures = [executor.submit(cook_one) for _ in range(requests)]
+            start.set()
+            status_codes = [future.result() for future in futures]
+
+        assert status_codes.count(200) == amount
+        assert status_codes.count(400) == requests - amount
+        ordered_menu = db.get(OrderedMenus, ordered_menu_id)
+        assert ordered_menu is not None
+        db.refresh(ordered_menu)
+        assert ordered_menu.cooked_count == amount
+        order = db.get(Orders, created.id)
+        assert order is not None
+        db.refresh(order)
+        assert order.finished_at is not None
+
+
+def add_served_orders(
+    db: Session, restaurant: Restaurants, table: Tables, count: int
+) -> None:
+    """입금되고 조리가 끝나 서빙을 기다리는 주문 추가"""
+    for _ in range(count):
+        order = create_table_order(db, restaurant, table, is_instant_cook=True)
+        pay_order(db, restaurant, order.id)
+
+
+@pytest.mark.parametrize("path", LIST_QUERY_COUNTS)
+def test_admin_list_query_count_is_constant(
+    client: TestClient,
+    admin_token_headers: dict[str, str],
+    db: Session,
+    restaurant: Restaurants,
+    path: str,
+) -> None:
+    def get_query_count() -> int:
+        # 테이블 추가로 바뀐 카탈로그를 먼저 불러온 뒤 측정
+        client.get(f"{settings.API_V1_STR}{path}", headers=admin_token_headers)
+        with count_queries() as statements:
+            r = client.get(f"{settings.API_V1_STR}{path}", headers=admin_token_headers)
+        assert r.status_code == 200
+        return len(statements)
+
+    with temporary_table(db, restaurant) as table:
+        add_served_orders(db, restaurant, table, 2)
+        query_count = get_query_count()
+
+        with temporary_table(db, restaurant) as other_table:
+            add_served_orders(db, restaurant, table, 5)
+            add_served_orders(db, restaurant, other_table, 5)
+            assert get_query_count() == query_count
+
+    assert query_count == LIST_QUERY_COUNTS[path]
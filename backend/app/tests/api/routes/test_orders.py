@@ -0,0 +1,71 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models import Menus, Orders, Restaurants, Teams
+from app.tests.utils.utils import temporary_table
+
+
+def test_create_order_replays_same_idempotency_key(
+    client: TestClient, db: Session, restaurant: Restaurants
+) -> None:
+    """같은 Idempotency-Key로 다시 요청하면 주문을 새로 만들지 않고 처음 응답을 반환"""
+    menu = db.exec(select(Menus).where(Menus.restaurant_id == restaurant.id)).first()
+    assert menu is not None
+
+    with temporary_table(db, restaurant) as table:
+        body = {
+            "table_id": str(table.id),
+            "ordered_menus": [{"menu_id": str(menu.id), "amount": 2}],
+        }
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+        first = client.post(f"{settings.API_V1_STR}/orders", json=body, headers=headers)
+        assert first.status_code == 200
+        replayed = client.post(
+            f"{settings.API_V1_STR}/orders", json=body, headers=headers
+        )
+        assert replayed.status_code == 200
+        assert replayed.json() == first.json()
+
+        orders = db.exec(
+            select(Orders).join(Teams).where(Teams.table_id == table.id)
+        ).all()
+        assert len(orders) == 1
+
+
+def test_create_order_rejects_reused_idempotency_key(
+    client: TestClient, db: Session, restaurant: Restaurants
+) -> None:
+    """같은 Idempotency-Key로 다른 테이블이나 메뉴를 주문하면 처음 응답 대신 422"""
+    menu = db.exec(select(Menus).where(Menus.restaurant_id == restaurant.id)).first()
+    assert menu is not None
+
+    with (
+        temporary_table(db, restaurant) as table,
+        temporary_table(db, restaurant) as other_table,
+    ):
+        body = {
+            "table_id": str(table.id),
+            "ordered_menus": [{"menu_id": str(menu.id), "amount": 2}],
+        }
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+        r = client.post(f"{settings.API_V1_STR}/orders", json=body, headers=headers)
+        assert r.status_code == 200
+
+        for changed in [
+            {**body, "table_id": str(other_table.id)},
+            {**body, "ordered_menus": [{"menu_id": str(menu.id), "amount": 3}]},
+        ]:
+            r = client.post(
+                f"{settings.API_V1_STR}/orders", json=changed, headers=headers
+            )
+            assert r.status_code == 422
+
+        orders = db.exec(
+            select(Orders)
+            .join(Teams)
+            .where(Teams.table_id.in_([table.id, other_table.id]))  # type: ignore
+        ).all()
+        assert len(orders) == 1
@@ -0,0 +1,81 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from sqlmodel import Session, col, select
+
+from app.api.services.catalog import get_catalog
+from app.api.services.orders import create_order
+from app.core.db import engine
+from app.models import Menus, OrderedMenuCreate, Orders, Restaurants, Teams
+from app.tests.utils.utils import temporary_table
+
+TABLES = 4
+ORDERS_PER_TABLE = 100
+WORKERS = 10
+
+
+def test_concurrent_first_orders_create_one_team(
+    db: Session, restaurant: Restaurants
+) -> None:
+    """여러 테이블에 첫 주문이 동시에 들어와도 테이블마다 활성 팀은 하나만 생성"""
+    menu = db.exec(select(Menus).where(Menus.restaurant_id == restaurant.id)).first()
+    assert menu is not None
+
+    with ExitStack() as stack:
+        tables = [
+            stack.enter_context(temporary_table(db, restaurant)) for _ in range(TABLES)
+        ]
+        start = threading.Event()
+
+        def order(table_id: uuid.UUID) -> tuple[uuid.UUID, uuid.UUID]:
+            with Session(engine) as session:
+                restaurant_in_session = session.get(Restaurants, restaurant.id)
+                assert restaurant_in_session is not None
+                catalog = get_catalog(session, restaurant_in_session)
+                start.wait()
+                created = create_order(
+                    session,
+                    restaurant_in_session,
+                    catalog,
+                    table_id,
+                    [OrderedMenuCreate(menu_id=menu.id, amount=1)],
+                )
+                session.commit()
+                return table_id, created.id
+
+        with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+            # 테이블을 번갈아 주문해 여러 테이블의 첫 주문이 동시에 처리되도록 함
+            futures = [
+                executor.submit(order, table.id)
+                for _ in range(ORDERS_PER_TABLE)
+                for table in tables
+            ]
+            start.set()
+            # IntegrityError 등 예외가 있으면 result()에서 다시 발생
+            created_orders = [future.result() for future in futures]
+
+        for table in tables:
+            teams = db.exec(
+                select(Teams).where(Teams.table_id == table.id, Teams.ended_at == None)
+            ).all()
+            assert len(teams) == 1
+
+            orders = db.exec(select(Orders).where(Orders.team_id == teams[0].id)).all()
+            assert len(orders) == ORDERS_PER_TABLE
+
+        # 만들어진 주문은 모두 주문한 테이블의 활성 팀에 속함
+        order_tables = dict(
+            db.exec(
+                select(Orders.id, Teams.table_id)
+                .join(Teams)
+                .where(
+                    col(Orders.id).in_([order_id for _, order_id in created_orders]),
+                    Teams.ended_at == None,
+                )
+            ).all()
+        )
+        assert order_tables == {
+            order_id: table_id for table_id, order_id in created_orders
+        }
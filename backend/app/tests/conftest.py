@@ -0,0 +1,35 @@
+from collections.abc import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.db import engine, init_db
+from app.main import app
+from app.models import Restaurants
+from app.tests.utils.utils import get_admin_token_headers
+
+
+@pytest.fixture(scope="session", autouse=True)
+def db() -> Generator[Session, None, None]:
+    with Session(engine) as session:
+        init_db(session)
+        yield session
+
+
+@pytest.fixture(scope="module")
+def client() -> Generator[TestClient, None, None]:
+    # lifespan(스케줄러 리더, 은행 조회)은 실행하지 않도록 with 없이 사용
+    yield TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def admin_token_headers(client: TestClient) -> dict[str, str]:
+    return get_admin_token_headers(client)
+
+
+@pytest.fixture
+def restaurant(db: Session) -> Restaurants:
+    restaurant = db.exec(select(Restaurants)).first()
+    assert restaurant is not None, "Restaurant not found"
+    return restaurant
@@ -0,0 +1,105 @@
+from collections.abc import Generator
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+import pytest
+from sqlmodel import Session, col, delete, select
+
+from app.core.config import settings
+from app.models import BankSyncStates, BankTransaction, Payments, Restaurants
+from app.scheduler import payment
+
+TRANSACTION_BY = "TEST-SYNC"
+
+
+class StubScraper:
+    """은행 대신 정해진 거래 내역을 돌려주는 조회기"""
+
+    def __init__(self, transactions: list[BankTransaction]) -> None:
+        self.transactions = transactions
+        self.calls: list[dict[str, Any]] = []
+
+    def get_transactions(self, timeout: float, **kwargs: Any) -> list[BankTransaction]:
+        self.calls.append({"timeout": timeout, **kwargs})
+        return self.transactions
+
+    def get_latest_transaction(
+        self, timeout: float, **kwargs: Any
+    ) -> Optional[BankTransaction]:
+        return max(self.transactions, key=lambda t: t.date, default=None)
+
+
+@pytest.fixture
+def sync_state(
+    db: Session, restaurant: Restaurants
+) -> Generator[BankSyncStates, None, None]:
+    """테스트용 동기화 상태 (끝나면 원래 상태와 입금 내역을 되돌림)"""
+    saved = db.get(BankSyncStates, restaurant.id)
+    if saved is not None:
+        saved = BankSyncStates.model_validate(saved)
+        db.exec(
+            delete(BankSyncStates).where(
+                col(BankSyncStates.restaurant_id) == restaurant.id
+            )
+        )
+    state = BankSyncStates(
+        restaurant_id=restaurant.id,
+        last_transaction_at=datetime.now(timezone.utc).replace(microsecond=0)
+        - timedelta(hours=1),
+        last_balance=1_000_000,
+    )
+    db.add(state)
+    db.commit()
+    db.refresh(state)
+    yield state
+
+    db.exec(delete(Payments).where(col(Payments.transaction_by) == TRANSACTION_BY))
+    db.exec(
+        delete(BankSyncStates).where(col(BankSyncStates.restaurant_id) == restaurant.id)
+    )
+    if saved is not None:
+        db.add(saved)
+    db.commit()
+
+
+def test_incremental_sync_stores_new_transactions(
+    db: Session, sync_state: BankSyncStates, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """동기화 상태가 있을 때 새 거래가 있으면 마지막 거래 이후만 저장"""
+    # 은행 거래 시간은 시간대가 없음
+    last_transaction_at = sync_state.last_transaction_at.replace(tzinfo=None)
+    transactions = [
+        BankTransaction(
+            transaction_by=TRANSACTION_BY,
+            date=last_transaction_at + timedelta(minutes=minutes),
+            # 뒷 2자리가 주문번호와 맞지 않는 금액 (실제 주문과 연결되지 않음)
+            amount=7,
+            balance=sync_state.last_balance + 7 * i,
+        )
+        for i, minutes in enumerate([-30, 0, 10, 20])
+    ]
+    scraper = StubScraper(transactions)
+    monkeypatch.setattr(payment, "bank_scraper", scraper)
+
+    assert payment.connect_payment_to_order() == 3
+
+    # 은행과 날짜 기준이 달라도 빠지지 않도록 하루 전부터 조회
+    [call] = scraper.calls
+    start_date = sync_state.last_transaction_at - timedelta(days=1)
+    assert call["start_date"] == start_date.strftime("%Y%m%d")
+    assert call["timeout"] == settings.BANK_SCRAPER_TIMEOUT_SECOND
+
+    stored = db.exec(
+        select(Payments).where(Payments.transaction_by == TRANSACTION_BY)
+    ).all()
+    assert len(stored) == 3
+
+    db.refresh(sync_state)
+    assert sync_state.last_transaction_at == transactions[-1].date.replace(
+        tzinfo=timezone.utc
+    )
+    assert sync_state.last_balance == transactions[-1].balance
+
+    # 새 거래가 없으면 가장 최근 거래만 확인하고 끝냄
+    assert payment.connect_payment_to_order() == 0
+    assert len(scraper.calls) == 1
@@ -0,0 +1,90 @@
+import threading
+from typing import Any
+
+import pytest
+
+from app.scheduler import polling
+from app.scheduler.polling import BankSyncPoller
+
+
+class StubScheduler:
+    """modify_job 호출만 기록하는 스케줄러"""
+
+    def __init__(self) -> None:
+        self.modified: list[dict[str, Any]] = []
+
+    def modify_job(self, job_id: str, **changes: Any) -> None:
+        self.modified.append(changes)
+
+
+def make_poller(scheduler: StubScheduler) -> BankSyncPoller:
+    return BankSyncPoller(
+        scheduler,  # type: ignore[arg-type]
+        job_id="bank_sync",
+        active_seconds=2,
+        idle_seconds=30,
+        max_backoff_seconds=60,
+        failure_threshold=3,
+        circuit_open_seconds=300,
+    )
+
+
+def test_wake_during_sync_runs_again(monkeypatch: pytest.MonkeyPatch) -> None:
+    scheduler = StubScheduler()
+    poller = make_poller(scheduler)
+    started = threading.Event()
+    release = threading.Event()
+    calls: list[bool] = []
+
+    def fake_connect(full: bool = False) -> int:
+        calls.append(full)
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+        return 1
+
+    monkeypatch.setattr(polling, "connect_payment_to_order", fake_connect)
+    monkeypatch.setattr(polling, "has_unpaid_orders", lambda: True)
+
+    results: list[Any] = []
+    worker = threading.Thread(target=lambda: results.append(poller.run(full=True)))
+    worker.start()
+    assert started.wait(5)
+    # 조회 중에 들어온 wake는 작업을 다시 예약하지 않고 끝난 뒤 한 번 더 조회
+    poller.wake()
+    poller.wake()
+    assert scheduler.modified == []
+    release.set()
+    worker.join(5)
+
+    assert calls == [True, False]
+    assert results == [2]
+
+    # 조회가 끝난 뒤의 wake는 바로 다음 조회를 예약
+    scheduler.modified.clear()
+    poller.wake()
+    assert len(scheduler.modified) == 1
+    assert "next_run_time" in scheduler.modified[0]
+
+
+def test_wake_after_failure_retries_until_circuit_opens(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    scheduler = StubScheduler()
+    poller = make_poller(scheduler)
+
+    def failing_connect(full: bool = False) -> int:
+        raise RuntimeError("bank is down")
+
+    monkeypatch.setattr(polling, "connect_payment_to_order", failing_connect)
+
+    for _ in range(poller.failure_threshold):
+        with pytest.raises(RuntimeError):
+            poller.run()
+        scheduler.modified.clear()
+        poller.wake()
+        if poller.is_circuit_open:
+            assert scheduler.modified == []
+        else:
+            assert len(scheduler.modified) == 1
+    assert poller.is_circuit_open
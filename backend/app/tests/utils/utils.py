@@ -0,0 +1,109 @@
+import random
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, col, delete, select
+
+from app.api.services.catalog import bump_catalog_version, get_catalog
+from app.api.services.orders import create_order
+from app.core.config import settings
+from app.core.db import engine
+from app.models import (
+    Menus,
+    OrderedMenuCreate,
+    Orders,
+    OrderWithPaymentInfo,
+    Payments,
+    Restaurants,
+    Tables,
+    Teams,
+)
+
+
+def get_admin_token_headers(client: TestClient) -> dict[str, str]:
+    r = client.post(
+        f"{settings.API_V1_STR}/admin/login",
+        data={"username": "admin", "password": settings.ADMIN_PASSWORD},
+    )
+    tokens = r.json()
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+@contextmanager
+def temporary_table(session: Session, restaurant: Restaurants) -> Iterator[Tables]:
+    """테스트용 테이블 (끝나면 테이블과 팀, 주문을 함께 삭제)"""
+    table = Tables(no=random.randint(10_000, 99_999), restaurant_id=restaurant.id)
+    session.add(table)
+    bump_catalog_version(session, restaurant)
+    session.commit()
+    session.refresh(table)
+    try:
+        yield table
+    finally:
+        # 주문은 테이블과 함께 삭제되지만 연결된 입금 내역은 따로 삭제
+        payment_ids = list(
+            session.exec(
+                select(Orders.payment_id)
+                .join(Teams)
+                .where(Teams.table_id == table.id, Orders.payment_id != None)
+            )
+        )
+        session.exec(delete(Tables).where(Tables.id == table.id))  # type: ignore
+        session.exec(delete(Payments).where(col(Payments.id).in_(payment_ids)))
+        bump_catalog_version(session, restaurant)
+        session.commit()
+
+
+def create_table_order(
+    session: Session,
+    restaurant: Restaurants,
+    table: Tables,
+    amount: int = 1,
+    is_instant_cook: bool = False,
+) -> OrderWithPaymentInfo:
+    """테이블 주문 생성 (조리 방식이 같은 첫 메뉴 amount개)"""
+    menu = session.exec(
+        select(Menus).where(
+            Menus.restaurant_id == restaurant.id,
+            Menus.is_instant_cook == is_instant_cook,
+        )
+    ).first()
+    assert menu is not None
+    order = create_order(
+        session,
+        restaurant,
+        get_catalog(session, restaurant),
+        table.id,
+        [OrderedMenuCreate(menu_id=menu.id, amount=amount)],
+    )
+    session.commit()
+    return order
+
+
+def pay_order(session: Session, restaurant: Restaurants, order_id: uuid.UUID) -> None:
+    """주문 금액만큼 입금된 것으로 처리"""
+    order = session.get(Orders, order_id)
+    assert order is not None and order.final_price is not None
+    payment = Payments(restaurant_id=restaurant.id, amount=order.final_price)
+    session.add(payment)
+    order.payment_id = payment.id
+    session.add(order)
+    session.commit()
+
+
+@contextmanager
+def count_queries() -> Iterator[list[str]]:
+    """블록 안에서 실행된 쿼리 목록"""
+    statements: list[str] = []
+
+    def before_cursor_execute(_conn, _cursor, statement, *_args) -> None:  # type: ignore
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
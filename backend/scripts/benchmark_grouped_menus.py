@@ -0,0 +1,125 @@
+"""주문 메뉴 그룹화 벤치마크
+
+주문당 50개 이상의 수량을 가진 주문을 만들고, 주문 메뉴를 불러와 Python에서
+그룹화하는 방식(group_ordered_menus)과 GROUP BY 한 번으로 집계하는 방식
+(attach_grouped_ordered_menus)의 직렬화 시간을 비교한다.
+생성한 팀/주문은 마지막에 삭제한다.
+
+    $ python scripts/benchmark_grouped_menus.py --orders 200 --amount 10
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+from typing import Callable
+
+from sqlmodel import Session, col, delete, select
+
+from app.api.services.catalog import get_catalog
+from app.api.services.loading import ORDER_PUBLIC, ORDER_SUMMARY
+from app.api.services.orders import (
+    attach_grouped_ordered_menus,
+    create_order,
+    get_payment_info,
+)
+from app.core.db import engine
+from app.models import (
+    OrderedMenuCreate,
+    Orders,
+    OrderWithPaymentInfo,
+    Restaurants,
+    Tables,
+    TableType,
+    Teams,
+)
+
+
+def measure(repeat: int, func: Callable[[], object]) -> list[float]:
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--orders", type=int, default=200)
+    arg_parser.add_argument("--amount", type=int, default=10)
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    with Session(engine) as session:
+        restaurant = session.exec(select(Restaurants)).one()
+        catalog = get_catalog(session, restaurant)
+        table = session.exec(
+            select(Tables).where(Tables.type == TableType.kiosk)
+        ).first()
+        assert table is not None, "Kiosk table not found"
+        table_id, table_status = table.id, table.status
+
+        ordered_menus = [
+            OrderedMenuCreate(menu_id=menu_id, amount=args.amount)
+            for menu_id in catalog.menus
+        ]
+        order_ids = [
+            create_order(
+                session,
+                restaurant,
+                catalog,
+                table_id,
+                ordered_menus,
+                phone=f"bench-{uuid.uuid4().hex[:8]}",
+            ).id
+            for _ in range(args.orders)
+        ]
+        session.commit()
+
+    def serialize(options, attach: bool) -> None:
+        with Session(engine) as session:
+            orders = session.exec(
+                select(Orders).where(col(Orders.id).in_(order_ids)).options(*options)
+            ).all()
+            if attach:
+                attach_grouped_ordered_menus(session, orders, catalog.menus)
+            for order in orders:
+                OrderWithPaymentInfo.model_validate(
+                    order, update={"payment_info": get_payment_info()}
+                ).model_dump_json()
+
+    try:
+        results = {
+            "python grouping": measure(
+                args.repeat, lambda: serialize(ORDER_PUBLIC, attach=False)
+            ),
+            "sql grouping": measure(
+                args.repeat, lambda: serialize(ORDER_SUMMARY, attach=True)
+            ),
+        }
+    finally:
+        with Session(engine) as session:
+            team_ids = session.exec(
+                select(Orders.team_id).where(col(Orders.id).in_(order_ids))
+            ).all()
+            session.exec(delete(Teams).where(col(Teams.id).in_(team_ids)))  # type: ignore
+            table = session.get_one(Tables, table_id)
+            table.status = table_status
+            session.add(table)
+            session.commit()
+
+    print(
+        f"orders: {args.orders} "
+        f"({len(catalog.menus)} menus x {args.amount} = "
+        f"{len(catalog.menus) * args.amount} units each)"
+    )
+    for name, latencies in results.items():
+        print(
+            f"{name}: p50 {statistics.median(latencies):.2f} ms, "
+            f"mean {statistics.mean(latencies):.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""가상 키패드 숫자 인식 벤치마크
+
+숫자 템플릿(assets/box_*.png)을 무작위 순서로 배치한 키패드 이미지를 만들어
+_get_keypad_num_list가 배치한 순서를 그대로 인식하는지 확인하고,
+매번 템플릿을 읽고 칸-템플릿 쌍마다 Python으로 히스토그램을 합산하던
+기존 방식과 시간을 비교한다.
+브라우저와 네트워크는 사용하지 않는다.
+
+    $ python scripts/benchmark_keypad_recognition.py --repeat 200
+"""
+
+import argparse
+import math
+import operator
+import random
+import statistics
+import time
+from functools import reduce
+from pathlib import Path
+from typing import Callable
+
+from PIL import Image, ImageChops
+
+from app.lib.kb_fastlookup import (
+    CURRENT_PACKAGE_DIR,
+    KEYPAD_CROP_POSITIONS,
+    KEYPAD_TEMPLATE_NAMES,
+    _get_keypad_num_list,
+)
+
+
+def make_keypad(order: list[str]) -> Image.Image:
+    """order 순서로 숫자 템플릿을 배치한 205x336 키패드 이미지"""
+    keypad = Image.new("RGBA", (205, 336), "white")
+    for key, position in zip(order, KEYPAD_CROP_POSITIONS):
+        template = Image.open(
+            Path.joinpath(CURRENT_PACKAGE_DIR, "assets", KEYPAD_TEMPLATE_NAMES[key])
+        ).convert("RGBA")
+        keypad.paste(template, position)
+    return keypad
+
+
+def legacy_keypad_num_list(img: Image.Image) -> list[str]:
+    """기존 방식: 호출마다 템플릿을 읽고 Python으로 히스토그램 합산"""
+
+    def rmsdiff(im1: Image.Image, im2: Image.Image) -> float:
+        h = ImageChops.difference(im1, im2).histogram()
+        return math.sqrt(
+            reduce(operator.add, map(lambda h, i: h * (i**2), h, range(256)))
+            / (float(im1.size[0]) * im1.size[1])
+        )
+
+    img = img.convert("RGBA")
+    box_dict = {
+        key: Image.open(Path.joinpath(CURRENT_PACKAGE_DIR, "assets", name)).convert(
+            "RGBA"
+        )
+        for key, name in KEYPAD_TEMPLATE_NAMES.items()
+    }
+    keypad_num_list = []
+    for left, top in KEYPAD_CROP_POSITIONS:
+        crop = img.crop(box=(left, top, left + 57, top + 57))
+        for key, box in box_dict.items():
+            if rmsdiff(crop, box) < 5:
+                keypad_num_list += [key]
+    return keypad_num_list
+
+
+def measure(
+    keypads: list[tuple[list[str], Image.Image]],
+    func: Callable[[Image.Image], list[str]],
+) -> tuple[int, list[float]]:
+    correct = 0
+    latencies = []
+    for order, keypad in keypads:
+        started = time.perf_counter()
+        result = func(keypad)
+        latencies.append((time.perf_counter() - started) * 1000)
+        correct += result == order
+    return correct, latencies
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--repeat", type=int, default=200)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    random.seed(args.seed)
+    keypads = []
+    for _ in range(args.repeat):
+        order = random.sample(list(KEYPAD_TEMPLATE_NAMES), len(KEYPAD_TEMPLATE_NAMES))
+        keypads.append((order, make_keypad(order)))
+
+    _get_keypad_num_list(keypads[0][1])  # 템플릿 미리 읽기
+    for name, func in [
+        ("vectorized", _get_keypad_num_list),
+        ("legacy", legacy_keypad_num_list),
+    ]:
+        correct, latencies = measure(keypads, func)
+        print(
+            f"{name}: accuracy {correct}/{len(keypads)}, "
+            f"p50 {statistics.median(latencies):.3f} ms, "
+            f"mean {statistics.mean(latencies):.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""주문 생성 API 지연시간 벤치마크
+
+설정된 데이터베이스(초기 데이터 포함)에 실제로 주문을 생성하고
+p50/p99 지연시간을 출력한다. 생성한 팀/주문은 마지막에 삭제한다.
+
+    $ python scripts/benchmark_order_create.py --iterations 500
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, col, delete, select
+
+from app.core.config import settings
+from app.core.db import engine
+from app.main import app
+from app.models import Menus, Tables, TableType, Teams
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, round(p / 100 * (len(values) - 1)))]
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--iterations", type=int, default=300)
+    arg_parser.add_argument("--warmup", type=int, default=20)
+    arg_parser.add_argument("--menus-per-order", type=int, default=4)
+    arg_parser.add_argument("--amount", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    with Session(engine) as session:
+        menus = session.exec(select(Menus)).all()[: args.menus_per_order]
+        tables = session.exec(
+            select(Tables).where(Tables.type == TableType.normal)
+        ).all()
+        table_statuses = {table.id: table.status for table in tables}
+
+    client = TestClient(app)
+    team_ids: set[uuid.UUID] = set()
+    latencies: list[float] = []
+    try:
+        for i in range(args.warmup + args.iterations):
+            table = tables[i % len(tables)]
+            started = time.perf_counter()
+            response = client.post(
+                f"{settings.API_V1_STR}/orders",
+                json={
+                    "table_id": str(table.id),
+                    "ordered_menus": [
+                        {"menu_id": str(menu.id), "amount": args.amount}
+                        for menu in menus
+                    ],
+                },
+            )
+            elapsed = time.perf_counter() - started
+            response.raise_for_status()
+            team_ids.add(uuid.UUID(response.json()["team"]["id"]))
+            if i >= args.warmup:
+                latencies.append(elapsed * 1000)
+    finally:
+        with Session(engine) as session:
+            session.exec(delete(Teams).where(col(Teams.id).in_(team_ids)))  # type: ignore
+            for table in tables:
+                table.status = table_statuses[table.id]
+                session.add(session.merge(table))
+            session.commit()
+
+    print(f"orders: {len(latencies)} ({len(menus)} menus x {args.amount} each)")
+    print(f"p50: {percentile(latencies, 50):.2f} ms")
+    print(f"p99: {percentile(latencies, 99):.2f} ms")
+    print(f"mean: {statistics.mean(latencies):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
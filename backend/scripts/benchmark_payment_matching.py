@@ -0,0 +1,92 @@
+"""입금-주문 매칭 벤치마크
+
+메모리에 미결제 주문과 입금 내역을 만들어 색인 기반 매칭
+(match_payments_to_orders)과 기존 방식인 이중 반복문 매칭의 시간을 비교한다.
+데이터베이스는 사용하지 않는다.
+
+    $ python scripts/benchmark_payment_matching.py --orders 10000 --payments 1000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.models import Orders, Payments
+from app.scheduler.matching import get_expected_order_no, match_payments_to_orders
+
+
+def nested_loop_match(orders: list[Orders], payments: list[Payments]) -> int:
+    """기존 connect_payment_to_order의 매칭 방식"""
+    orders_without_payment = {order.id: order for order in orders}
+    matched = 0
+    for payment in payments:
+        expected_order_no = get_expected_order_no(payment.amount)
+        for order in orders_without_payment.values():
+            if (
+                order.created_at < payment.created_at
+                and order.no % 100 == expected_order_no  # type: ignore
+                and order.final_price == payment.amount
+            ):
+                matched += 1
+                del orders_without_payment[order.id]
+                break
+    return matched
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--orders", type=int, default=10000)
+    arg_parser.add_argument("--payments", type=int, default=1000)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    random.seed(args.seed)
+    started_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    orders = []
+    for no in range(args.orders):
+        total_price = random.randrange(10, 200) * 1000
+        orders.append(
+            Orders(
+                no=no,
+                total_price=total_price,
+                final_price=total_price - no % 100,
+                created_at=started_at + timedelta(milliseconds=no * 100),
+            )
+        )
+    # 절반은 주문에 맞는 입금, 나머지는 맞는 주문이 없는 입금
+    payments = []
+    for order in random.sample(orders, args.payments // 2):
+        payments.append(
+            Payments(
+                amount=order.final_price,
+                created_at=order.created_at + timedelta(minutes=1),
+            )
+        )
+    for _ in range(args.payments - len(payments)):
+        payments.append(
+            Payments(
+                amount=random.randrange(10, 200) * 1000 + 1,
+                created_at=started_at + timedelta(hours=2),
+            )
+        )
+
+    started = time.perf_counter()
+    result = match_payments_to_orders(orders, payments)
+    indexed_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    nested_matched = nested_loop_match(orders, payments)
+    nested_ms = (time.perf_counter() - started) * 1000
+
+    print(f"orders: {len(orders)}, payments: {len(payments)}")
+    print(
+        f"indexed: {indexed_ms:.2f} ms "
+        f"(matched {len(result.matched)}, ambiguous {len(result.ambiguous)}, "
+        f"unmatched {len(result.unmatched)})"
+    )
+    print(f"nested loop: {nested_ms:.2f} ms (matched {nested_matched})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""은행 거래 내역 파서 벤치마크
+
+조회 결과 HTML을 TransactionTableParser로 읽고 해시로 중복을 제거하는 방식과
+기존 방식(BeautifulSoup html.parser + 행/셀마다 CSS 선택 + 목록 탐색으로 중복 제거)의
+결과가 같은지 확인하고 시간을 비교한다.
+
+--html로 저장해 둔 조회 결과 페이지를 넘기면 그 페이지들을, 없으면 같은 구조로
+만든 페이지(200행, 거래 100건)를 사용한다. 페이지를 이어서 조회할 때처럼
+인접한 페이지의 거래 일부가 겹치도록 만든다.
+
+    $ python scripts/benchmark_transaction_parser.py --pages 20
+    $ python scripts/benchmark_transaction_parser.py --html page1.html page2.html
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable
+
+from bs4 import BeautifulSoup as bs
+
+from app.lib.kb_fastlookup import (
+    TransactionTableParser,
+    _dedup_transactions,
+    _parse_transaction_rows,
+)
+
+ROWS_SELECTOR = "#pop_contents > table.tType01 > tbody > tr"
+
+
+def make_page(started_at: datetime, count: int) -> str:
+    """조회 결과 페이지와 같은 구조의 HTML (거래 하나가 두 행)"""
+    rows = []
+    for i in range(count):
+        date = started_at - timedelta(minutes=i)
+        # 같은 거래는 어느 페이지에서나 같은 값이 되도록 시간으로 금액/잔고를 정함
+        minutes = int(date.timestamp()) // 60
+        amount = 10_000 + minutes % 1000 * 100 - minutes % 100
+        balance = 1_000_000_000 - minutes % 1_000_000
+        rows.append(
+            "<tr>"
+            f'<td class="tCenter">{date:%Y.%m.%d}<br>{date:%H:%M:%S}</td>'
+            "<td>전자금융</td><td>&nbsp;</td>"
+            '<td class="tRight">0</td>'
+            f'<td class="tRight">{amount:,}</td>'
+            f'<td class="tRight">{balance:,}</td>'
+            "<td>국민은행</td><td>&nbsp;</td>"
+            "</tr>"
+            f'<tr><td colspan="8"> 입금자{minutes % 37} </td></tr>'
+        )
+    return (
+        "<html><body><div id='header'><img src='logo.png'></div>"
+        '<div id="pop_contents"><p>조회 결과</p>'
+        '<table class="tType01"><thead><tr><th>거래일시</th></tr></thead>'
+        f"<tbody>{''.join(rows)}</tbody></table></div></body></html>"
+    )
+
+
+def legacy_parse(pages: list[str]) -> list[dict[str, Any]]:
+    transaction_list: list[dict[str, Any]] = []
+    for page in pages:
+        soup = bs(page, "html.parser")
+        rows = [
+            [td.text for td in value.select("td")]
+            for value in soup.select(ROWS_SELECTOR)
+        ]
+        transaction_list += _parse_transaction_rows(rows)
+    newlist: list[dict[str, Any]] = []
+    for x in transaction_list:
+        if x not in newlist:
+            newlist.append(x)
+    return newlist
+
+
+def streaming_parse(pages: list[str]) -> list[dict[str, Any]]:
+    transaction_list: list[dict[str, Any]] = []
+    for page in pages:
+        transaction_table = TransactionTableParser.parse(page)
+        assert transaction_table is not None
+        transaction_list += _parse_transaction_rows(transaction_table.rows)
+    return _dedup_transactions(transaction_list)
+
+
+def measure(
+    repeat: int, func: Callable[[list[str]], list[dict[str, Any]]], pages: list[str]
+) -> tuple[list[dict[str, Any]], list[float]]:
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(pages)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return result, latencies
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--html", nargs="*", type=Path, default=[])
+    arg_parser.add_argument("--pages", type=int, default=20)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    if args.html:
+        pages = [path.read_text() for path in args.html]
+    else:
+        started_at = datetime(2025, 9, 1, 12, 0, 0)
+        # 이전 페이지의 마지막 10건이 다음 페이지 처음에 다시 나옴
+        pages = [
+            make_page(started_at - timedelta(minutes=90 * page), 100)
+            for page in range(args.pages)
+        ]
+
+    legacy_result, legacy_latencies = measure(args.repeat, legacy_parse, pages)
+    result, latencies = measure(args.repeat, streaming_parse, pages)
+    assert result == legacy_result, "파싱 결과가 기존 방식과 다릅니다"
+
+    print(f"pages: {len(pages)}, transactions: {len(result)}")
+    for name, values in [("streaming", latencies), ("legacy", legacy_latencies)]:
+        print(
+            f"{name}: p50 {statistics.median(values):.2f} ms, "
+            f"mean {statistics.mean(values):.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+"""입금 처리 파이프라인 재생 벤치마크
+
+설정된 데이터베이스에 미결제 주문 수천 건을 만들고, 그중 일부에 맞는 입금과
+관계없는 입금을 로컬 은행(FixtureBank)에 넣어 둔 뒤 connect_payment_to_order를
+실행한다. 세 단계를 실행하고 단계마다 은행 조회(HTTP), 파싱, 매칭, DB 시간과
+매칭 정확도를 출력한다.
+
+1. 동기화 상태가 없을 때의 전체 조회
+2. 바뀐 것이 없는 다음 조회 (가장 최근 거래만 확인)
+3. 새 주문과 입금을 추가한 뒤의 증분 조회 (마지막 거래 이후만 조회)
+
+실제 은행에는 접속하지 않으며, 조회는 작업 프로세스 대신 이 프로세스에서 실행해
+파싱 시간을 따로 잴 수 있게 한다. 키패드 화면은 기본적으로 브라우저 없이 읽고
+(키패드 인식은 실행), --browser를 주면 Playwright로 로컬 은행의 화면을 연다.
+
+생성한 입금은 기존 미결제 주문에 연결될 수 있으므로 ENVIRONMENT가 local일 때만
+실행한다 (--allow-non-local로 무시 가능). 생성한 팀/주문/입금 내역은 마지막에
+삭제하고, 기존 주문에 연결된 입금은 연결을 풀며, 동기화 상태는 되돌린다.
+
+    $ python scripts/replay_payment_pipeline.py --orders 3000 --deposits 2000
+    $ python scripts/replay_payment_pipeline.py --save-fixture /tmp/kb-fixture
+"""
+
+import argparse
+import random
+import time
+import uuid
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import event, insert
+from sqlmodel import Session, col, delete, select, update
+
+from app.core.config import settings
+from app.core.db import engine
+from app.lib import kb_fastlookup
+from app.lib.kb_fastlookup.fixtures import PAGE_TRANSACTIONS, FixtureBank
+from app.models import (
+    BankSyncStates,
+    Orders,
+    Payments,
+    Restaurants,
+    Tables,
+    Teams,
+)
+from app.scheduler import payment
+from app.scheduler.scraper import BankScraper
+
+REPLAY_PREFIX = "REPLAY"
+PASSWORD = "4821"
+
+
+class InProcessScraper(BankScraper):
+    """파싱 시간을 잴 수 있도록 작업 프로세스 대신 이 프로세스에서 조회"""
+
+    def _run(self, func: Callable[..., Any], kwargs: dict, timeout: float) -> Any:
+        return func(**kwargs)
+
+
+class Timings:
+    def __init__(self) -> None:
+        self.seconds: defaultdict[str, float] = defaultdict(float)
+
+    def wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.seconds[name] += time.perf_counter() - started
+
+        return wrapper
+
+    @contextmanager
+    def measure_db(self) -> Iterator[None]:
+        """커서 실행 시간의 합 (쿼리 실행과 결과 수신)"""
+
+        def before(conn: Any, *_: Any) -> None:
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+        def after(conn: Any, *_: Any) -> None:
+            started = conn.info["query_started"].pop()
+            self.seconds["db"] += time.perf_counter() - started
+
+        event.listen(engine, "before_cursor_execute", before)
+        event.listen(engine, "after_cursor_execute", after)
+        try:
+            yield
+        finally:
+            event.remove(engine, "before_cursor_execute", before)
+            event.remove(engine, "after_cursor_execute", after)
+
+
+def create_team(session: Session, restaurant_id: uuid.UUID) -> uuid.UUID:
+    table = session.exec(select(Tables)).first()
+    assert table is not None, "Table not found"
+    team = Teams(
+        restaurant_id=restaurant_id,
+        table_id=table.id,
+        phone=REPLAY_PREFIX,
+        ended_at=datetime.now(timezone.utc),
+    )
+    session.add(team)
+    session.commit()
+    return team.id
+
+
+def seed_orders(
+    session: Session,
+    restaurant_id: uuid.UUID,
+    team_id: uuid.UUID,
+    count: int,
+    started_at: datetime,
+    ended_at: datetime,
+) -> list[Any]:
+    """started_at부터 ended_at까지 고르게 미결제 주문 생성
+
+    주문번호와 최종 금액은 DB에서 정해진다.
+    """
+    step = (ended_at - started_at) / count
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "restaurant_id": restaurant_id,
+            "team_id": team_id,
+            "total_price": random.randrange(10, 200) * 1000,
+            "created_at": started_at + step * i,
+        }
+        for i in range(count)
+    ]
+    orders = session.execute(
+        insert(Orders).returning(
+            Orders.id,  # type: ignore
+            Orders.no,  # type: ignore
+            Orders.final_price,  # type: ignore
+            Orders.created_at,  # type: ignore
+        ),
+        rows,
+    ).all()
+    session.commit()
+    return list(orders)
+
+
+def make_deposits(
+    orders: list[Any], deposits: int, noise: int, name_prefix: str, balance: int
+) -> tuple[list[dict[str, Any]], dict[uuid.UUID, str]]:
+    """주문에 맞는 입금과 관계없는 입금 (은행 화면처럼 시간은 naive)
+
+    거래 후 잔고는 balance부터 시간순으로 쌓는다.
+    """
+    transactions = []
+    expected = {}
+    for i, order in enumerate(random.sample(orders, deposits)):
+        transaction_by = f"{name_prefix}{i}"
+        expected[order.id] = transaction_by
+        transactions.append(
+            {
+                "date": (
+                    order.created_at + timedelta(seconds=random.randrange(10, 300))
+                ).replace(tzinfo=None, microsecond=0),
+                "amount": order.final_price,
+                "transaction_by": transaction_by,
+            }
+        )
+    first, last = orders[0].created_at, orders[-1].created_at
+    for i in range(noise):
+        transactions.append(
+            {
+                "date": (first + (last - first) * random.random()).replace(
+                    tzinfo=None, microsecond=0
+                ),
+                # 금액 뒷 2자리가 00이면 맞는 주문번호가 없음
+                "amount": random.randrange(10, 200) * 1000,
+                "transaction_by": f"{name_prefix}N{i}",
+            }
+        )
+
+    for transaction in sorted(transactions, key=lambda t: t["date"]):
+        balance += transaction["amount"]
+        transaction["balance"] = balance
+    return transactions, expected
+
+
+def get_attached_payments(team_id: uuid.UUID) -> dict[uuid.UUID, str]:
+    """생성한 주문별로 연결된 입금의 거래자"""
+    with Session(engine) as session:
+        return dict(
+            session.execute(
+                select(Orders.id, Payments.transaction_by)  # type: ignore
+                .join(Payments, col(Orders.payment_id) == Payments.id)
+                .where(Orders.team_id == team_id)
+            ).all()
+        )
+
+
+def print_phase(
+    name: str, timings: Timings, total: float, inserted: Any, bank: FixtureBank
+) -> None:
+    bank_seconds = timings.seconds["bank"]
+    parse_seconds = timings.seconds["parse"]
+    print(f"[{name}] total: {total * 1000:.1f} ms, inserted payments: {inserted}")
+    print(
+        f"  bank requests: {bank.transaction_requests} "
+        f"(rejected {bank.rejected_requests}), keypad loads: {bank.keypad_loads}"
+    )
+    print(f"  bank (http + keypad): {(bank_seconds - parse_seconds) * 1000:.1f} ms")
+    print(f"  parse: {parse_seconds * 1000:.1f} ms")
+    print(f"  matching: {timings.seconds['matching'] * 1000:.1f} ms")
+    print(f"  db: {timings.seconds['db'] * 1000:.1f} ms")
+
+
+def print_accuracy(
+    order_ids: set[uuid.UUID],
+    expected: dict[uuid.UUID, str],
+    attached: dict[uuid.UUID, str],
+) -> None:
+    """order_ids 주문의 매칭 정확도"""
+    attached = {
+        order_id: name for order_id, name in attached.items() if order_id in order_ids
+    }
+    correct = sum(
+        1 for order_id, name in expected.items() if attached.get(order_id) == name
+    )
+    missed = sum(1 for order_id in expected if order_id not in attached)
+    wrong = sum(
+        1
+        for order_id, name in attached.items()
+        if expected.get(order_id) not in (None, name)
+    )
+    unexpected = sum(1 for order_id in attached if order_id not in expected)
+    print(
+        f"  accuracy: {correct}/{len(expected)} correct "
+        f"({correct / len(expected):.1%}), wrong order {wrong}, missed {missed}, "
+        f"attached without deposit {unexpected}"
+    )
+
+
+def run_sync(timings: Timings, bank: FixtureBank) -> tuple[Any, float]:
+    """connect_payment_to_order 한 번 실행 (시간과 은행 요청 수는 단계별로 다시 셈)"""
+    timings.seconds.clear()
+    bank.transaction_requests = bank.rejected_requests = bank.keypad_loads = 0
+    with timings.measure_db():
+        started = time.perf_counter()
+        inserted = payment.connect_payment_to_order()
+        return inserted, time.perf_counter() - started
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--orders", type=int, default=3000)
+    arg_parser.add_argument("--deposits", type=int, default=2000)
+    arg_parser.add_argument("--noise", type=int, default=200)
+    arg_parser.add_argument("--new-orders", type=int, default=100)
+    arg_parser.add_argument("--new-deposits", type=int, default=60)
+    arg_parser.add_argument("--days", type=int, default=28)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--browser", action="store_true")
+    arg_parser.add_argument("--save-fixture", help="생성한 은행 화면을 저장할 디렉터리")
+    arg_parser.add_argument(
+        "--allow-non-local",
+        action="store_true",
+        help="ENVIRONMENT가 local이 아니어도 실행 (기존 미결제 주문에 입금이 연결될 수 있음)",
+    )
+    args = arg_parser.parse_args()
+
+    if settings.ENVIRONMENT != "local" and not args.allow_non_local:
+        arg_parser.error(
+            f"refusing to seed orders and deposits in a {settings.ENVIRONMENT} "
+            "database (pass --allow-non-local to run anyway)"
+        )
+    if args.days > 29:
+        arg_parser.error("days must be within the 30-day sync window")
+    # 기존 주문은 그저께까지, 새 주문은 최근 1시간 안에 생성
+    # 조회는 날짜 단위로 이어지므로 하루 거래가 한 페이지를 넘으면 끝나지 않음
+    if (args.deposits + args.noise) / (args.days - 2) >= PAGE_TRANSACTIONS * 0.9:
+        arg_parser.error(
+            f"keep (deposits + noise) / (days - 2) under {PAGE_TRANSACTIONS}"
+        )
+    new_noise = args.new_deposits // 10
+    if args.new_deposits + new_noise >= PAGE_TRANSACTIONS:
+        arg_parser.error(f"keep new deposits under {PAGE_TRANSACTIONS}")
+    random.seed(args.seed)
+
+    settings.BANK_ACCOUNT_NO = "000000000000"
+    settings.BANK_ACCOUNT_BIRTHDAY = "900101"
+    settings.BANK_ACCOUNT_PASSWORD = PASSWORD
+
+    with Session(engine) as session:
+        restaurant = session.exec(select(Restaurants)).first()
+        assert restaurant is not None, "Restaurant not found"
+        restaurant_id = restaurant.id
+        saved_state = session.get(BankSyncStates, restaurant_id)
+        if saved_state is not None:
+            saved_state = BankSyncStates.model_validate(saved_state)
+            session.exec(
+                delete(BankSyncStates).where(
+                    col(BankSyncStates.restaurant_id) == restaurant_id
+                )
+            )
+            session.commit()
+
+    timings = Timings()
+    scraper = InProcessScraper()
+    scraper.get_transactions = timings.wrap("bank", scraper.get_transactions)  # type: ignore[method-assign]
+    scraper.get_latest_transaction = timings.wrap(  # type: ignore[method-assign]
+        "bank", scraper.get_latest_transaction
+    )
+    payment.bank_scraper = scraper
+    payment.match_payments_to_orders = timings.wrap(
+        "matching", payment.match_payments_to_orders
+    )
+    kb_fastlookup.TransactionTableParser.parse = timings.wrap(  # type: ignore[method-assign]
+        "parse", kb_fastlookup.TransactionTableParser.parse
+    )
+    kb_fastlookup._parse_transaction_rows = timings.wrap(
+        "parse", kb_fastlookup._parse_transaction_rows
+    )
+    kb_fastlookup._dedup_transactions = timings.wrap(
+        "parse", kb_fastlookup._dedup_transactions
+    )
+
+    now = datetime.now(timezone.utc)
+    try:
+        with Session(engine) as session:
+            team_id = create_team(session, restaurant_id)
+            orders = seed_orders(
+                session,
+                restaurant_id,
+                team_id,
+                args.orders,
+                now - timedelta(days=args.days),
+                now - timedelta(days=2),
+            )
+            new_orders = seed_orders(
+                session,
+                restaurant_id,
+                team_id,
+                args.new_orders,
+                now - timedelta(hours=1),
+                now - timedelta(minutes=6),
+            )
+
+        transactions, expected = make_deposits(
+            orders, args.deposits, args.noise, REPLAY_PREFIX, 1_000_000
+        )
+        new_transactions, new_expected = make_deposits(
+            new_orders,
+            args.new_deposits,
+            new_noise,
+            f"{REPLAY_PREFIX}-NEW",
+            max(t["balance"] for t in transactions),
+        )
+        busiest_day = max(
+            Counter(t["date"].date() for t in transactions + new_transactions).values()
+        )
+        if busiest_day >= PAGE_TRANSACTIONS:
+            raise SystemExit(
+                f"{busiest_day} deposits on one day, lower deposits or raise days"
+            )
+
+        bank = FixtureBank.synthetic(transactions, password=PASSWORD, seed=args.seed)
+        if args.save_fixture:
+            bank.save(args.save_fixture)
+        if not args.browser:
+            kb_fastlookup.get_keypad_img = lambda: kb_fastlookup.keypad_info_from_page(
+                *bank.keypad_page()
+            )
+
+        with bank:
+            kb_fastlookup.BASE_URL = bank.url
+            print(
+                f"orders: {len(orders)}, deposits: {args.deposits}, "
+                f"noise: {args.noise}, bank rows: {len(transactions)}"
+            )
+
+            inserted, total = run_sync(timings, bank)
+            print_phase("full sync", timings, total, inserted, bank)
+            print_accuracy(
+                {order.id for order in orders}, expected, get_attached_payments(team_id)
+            )
+
+            inserted, total = run_sync(timings, bank)
+            print_phase("unchanged tick", timings, total, inserted, bank)
+
+            # 첫 조회 이후 들어온 주문의 입금
+            bank.add_transactions(new_transactions)
+            inserted, total = run_sync(timings, bank)
+            print_phase("incremental sync", timings, total, inserted, bank)
+            print_accuracy(
+                {order.id for order in new_orders},
+                new_expected,
+                get_attached_payments(team_id),
+            )
+            if inserted != len(new_transactions):
+                print(
+                    f"  expected {len(new_transactions)} new payments, got {inserted}"
+                )
+    finally:
+        with Session(engine) as session:
+            # 생성한 입금이 기존 미결제 주문에 연결됐을 수도 있으므로 먼저 연결을 풀고 삭제
+            replay_payments = select(Payments.id).where(
+                col(Payments.transaction_by).startswith(REPLAY_PREFIX)
+            )
+            session.exec(
+                update(Orders)
+                .where(col(Orders.payment_id).in_(replay_payments))
+                .values(payment_id=None)
+            )
+            session.exec(delete(Teams).where(col(Teams.phone) == REPLAY_PREFIX))
+            session.exec(
+                delete(Payments).where(
+                    col(Payments.transaction_by).startswith(REPLAY_PREFIX)
+                )
+            )
+            session.exec(
+                delete(BankSyncStates).where(
+                    col(BankSyncStates.restaurant_id) == restaurant_id
+                )
+            )
+            if saved_state is not None:
+                session.add(saved_state)
+            session.commit()
+
+
+if __name__ == "__main__":
+    main()